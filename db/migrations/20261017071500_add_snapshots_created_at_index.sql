@@ -0,0 +1,6 @@
+-- migrate:up
+-- Lets MAX(created_at) (part of the dashboard's data-version check) use an index.
+CREATE INDEX IF NOT EXISTS idx_snapshots_created_at ON snapshots(created_at);
+
+-- migrate:down
+DROP INDEX IF EXISTS idx_snapshots_created_at;
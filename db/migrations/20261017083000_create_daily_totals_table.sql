@@ -0,0 +1,29 @@
+-- migrate:up
+-- Per-date asset/liability totals, kept in sync with snapshots by the
+-- application whenever it writes snapshot rows. A total is NULL when there
+-- are no rows of that type on the date.
+CREATE TABLE IF NOT EXISTS daily_totals (
+    date DATE PRIMARY KEY,
+    total_assets DECIMAL(15, 2),
+    total_liabilities DECIMAL(15, 2),
+    net_worth DECIMAL(15, 2) GENERATED ALWAYS AS (
+        COALESCE(total_assets, 0) - COALESCE(total_liabilities, 0)
+    ) STORED,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Lets MAX(updated_at) (part of the dashboard's data-version check) use an index.
+CREATE INDEX IF NOT EXISTS idx_daily_totals_updated_at ON daily_totals(updated_at);
+
+-- Backfill from existing snapshots
+INSERT INTO daily_totals (date, total_assets, total_liabilities)
+SELECT
+    date,
+    SUM(amount) FILTER (WHERE type = 'asset'),
+    SUM(amount) FILTER (WHERE type = 'liability')
+FROM snapshots
+GROUP BY date
+ON CONFLICT (date) DO NOTHING;
+
+-- migrate:down
+DROP TABLE IF EXISTS daily_totals;
@@ -0,0 +1,11 @@
+-- migrate:up
+-- One row per ingest source (e.g. a sheet and range), holding a fingerprint
+-- of the data last ingested from it so unchanged fetches can be skipped.
+CREATE TABLE IF NOT EXISTS ingest_state (
+    source TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    ingested_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- migrate:down
+DROP TABLE IF EXISTS ingest_state;
@@ -0,0 +1,11 @@
+-- migrate:up
+-- How far a historical backfill has got, so an interrupted run can resume
+-- after the last tab it finished.
+CREATE TABLE IF NOT EXISTS backfill_progress (
+    source TEXT PRIMARY KEY,
+    last_tab_date DATE NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- migrate:down
+DROP TABLE IF EXISTS backfill_progress;
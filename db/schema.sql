@@ -19,6 +19,41 @@ SET default_tablespace = '';
 
 SET default_table_access_method = heap;
 
+--
+-- Name: backfill_progress; Type: TABLE; Schema: public; Owner: -
+--
+
+CREATE TABLE public.backfill_progress (
+    source text NOT NULL,
+    last_tab_date date NOT NULL,
+    updated_at timestamp with time zone DEFAULT CURRENT_TIMESTAMP NOT NULL
+);
+
+
+--
+-- Name: daily_totals; Type: TABLE; Schema: public; Owner: -
+--
+
+CREATE TABLE public.daily_totals (
+    date date NOT NULL,
+    total_assets numeric(15,2),
+    total_liabilities numeric(15,2),
+    net_worth numeric(15,2) GENERATED ALWAYS AS ((COALESCE(total_assets, (0)::numeric) - COALESCE(total_liabilities, (0)::numeric))) STORED,
+    updated_at timestamp with time zone DEFAULT CURRENT_TIMESTAMP NOT NULL
+);
+
+
+--
+-- Name: ingest_state; Type: TABLE; Schema: public; Owner: -
+--
+
+CREATE TABLE public.ingest_state (
+    source text NOT NULL,
+    fingerprint text NOT NULL,
+    ingested_at timestamp with time zone DEFAULT CURRENT_TIMESTAMP NOT NULL
+);
+
+
 --
 -- Name: schema_migrations; Type: TABLE; Schema: public; Owner: -
 --
@@ -70,6 +105,30 @@ ALTER SEQUENCE public.snapshots_id_seq OWNED BY public.snapshots.id;
 ALTER TABLE ONLY public.snapshots ALTER COLUMN id SET DEFAULT nextval('public.snapshots_id_seq'::regclass);
 
 
+--
+-- Name: backfill_progress backfill_progress_pkey; Type: CONSTRAINT; Schema: public; Owner: -
+--
+
+ALTER TABLE ONLY public.backfill_progress
+    ADD CONSTRAINT backfill_progress_pkey PRIMARY KEY (source);
+
+
+--
+-- Name: daily_totals daily_totals_pkey; Type: CONSTRAINT; Schema: public; Owner: -
+--
+
+ALTER TABLE ONLY public.daily_totals
+    ADD CONSTRAINT daily_totals_pkey PRIMARY KEY (date);
+
+
+--
+-- Name: ingest_state ingest_state_pkey; Type: CONSTRAINT; Schema: public; Owner: -
+--
+
+ALTER TABLE ONLY public.ingest_state
+    ADD CONSTRAINT ingest_state_pkey PRIMARY KEY (source);
+
+
 --
 -- Name: schema_migrations schema_migrations_pkey; Type: CONSTRAINT; Schema: public; Owner: -
 --
@@ -86,6 +145,20 @@ ALTER TABLE ONLY public.snapshots
     ADD CONSTRAINT snapshots_pkey PRIMARY KEY (id);
 
 
+--
+-- Name: idx_daily_totals_updated_at; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX idx_daily_totals_updated_at ON public.daily_totals USING btree (updated_at);
+
+
+--
+-- Name: idx_snapshots_created_at; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX idx_snapshots_created_at ON public.snapshots USING btree (created_at);
+
+
 --
 -- Name: idx_snapshots_date; Type: INDEX; Schema: public; Owner: -
 --
@@ -119,4 +192,8 @@ CREATE UNIQUE INDEX idx_snapshots_unique ON public.snapshots USING btree (date,
 --
 
 INSERT INTO public.schema_migrations (version) VALUES
-    ('20260123040144');
+    ('20260123040144'),
+    ('20261017071500'),
+    ('20261017083000'),
+    ('20261017093000'),
+    ('20261017100000');
@@ -0,0 +1,185 @@
+"""Async counterparts of the queries in :mod:`asset_manager.repository`.
+
+Each function has the same name, SQL and return value as its sync twin but
+takes a ``psycopg.AsyncConnection``, so it can run on the event loop
+alongside other requests.
+"""
+
+from collections.abc import AsyncIterator
+from datetime import date
+
+from psycopg import AsyncConnection, AsyncCursor
+
+from asset_manager.cache import invalidate_caches
+from asset_manager.frame import RecordFrame
+from asset_manager.metrics import observe_query
+from asset_manager.models import (
+    DailySummary,
+    DailyTotals,
+    DataVersion,
+    Record,
+    UpsertResult,
+)
+from asset_manager.repository import (
+    ALL_RECORDS_SQL,
+    COPY_STAGING_SQL,
+    CREATE_STAGING_SQL,
+    DAILY_TOTALS_SQL,
+    DATA_VERSION_SQL,
+    DEFAULT_ITERSIZE,
+    INSERT_RECORD_SQL,
+    LATEST_SNAPSHOT_RECORDS_SQL,
+    MERGE_STAGING_SQL,
+    PRUNE_DAILY_TOTALS_SQL,
+    RECORD_FRAME_SQL,
+    RECORDS_BY_DATE_RANGE_SQL,
+    REFRESH_DAILY_TOTALS_SQL,
+    SUMMARY_BY_DATE_SQL,
+    _daily_totals_from_row,
+    _data_version_from_row,
+    _insert_params,
+    _record_from_row,
+    _refresh_params,
+    _summary_from_row,
+)
+from asset_manager.timing import timed
+
+
+async def refresh_daily_totals(cur: AsyncCursor, params: dict[str, list[date]]) -> None:
+    """Bring daily_totals up to date for ``params["dates"]``."""
+    await cur.execute(REFRESH_DAILY_TOTALS_SQL, params)
+    await cur.execute(PRUNE_DAILY_TOTALS_SQL, params)
+
+
+async def insert_records(conn: AsyncConnection, records: list[Record]) -> int:
+    """Insert records into the database. Returns the number of records inserted."""
+    if not records:
+        return 0
+
+    async with conn.cursor() as cur:
+        await cur.executemany(INSERT_RECORD_SQL, _insert_params(records))
+        await refresh_daily_totals(cur, _refresh_params(records))
+    await conn.commit()
+    invalidate_caches()
+    return len(records)
+
+
+async def bulk_upsert_records(
+    conn: AsyncConnection, records: list[Record]
+) -> UpsertResult:
+    """Upsert many records with COPY and a single set-based merge."""
+    if not records:
+        return UpsertResult()
+
+    async with conn.cursor() as cur:
+        await cur.execute(CREATE_STAGING_SQL)
+        async with cur.copy(COPY_STAGING_SQL) as copy:
+            for row in _insert_params(records):
+                await copy.write_row(row)
+        await cur.execute(MERGE_STAGING_SQL)
+        counts = await cur.fetchone()
+        if counts is None:
+            # The aggregate over the merge always produces exactly one row
+            raise RuntimeError("Merging staged records returned no counts")
+        inserted, updated = counts
+        await refresh_daily_totals(cur, _refresh_params(records))
+    await conn.commit()
+    invalidate_caches()
+    return UpsertResult(inserted=inserted, updated=updated)
+
+
+@observe_query("get_all_records")
+@timed("db.all_records")
+async def get_all_records(conn: AsyncConnection) -> list[Record]:
+    """Fetch all records from the database."""
+    async with conn.cursor() as cur:
+        await cur.execute(ALL_RECORDS_SQL)
+        rows = await cur.fetchall()
+
+    return [_record_from_row(row) for row in rows]
+
+
+async def iter_records(
+    conn: AsyncConnection, itersize: int = DEFAULT_ITERSIZE
+) -> AsyncIterator[Record]:
+    """Stream all records through a server-side cursor."""
+    async with conn.cursor(name="iter_records") as cur:
+        cur.itersize = itersize
+        await cur.execute(ALL_RECORDS_SQL)
+        async for row in cur:
+            yield _record_from_row(row)
+
+
+@observe_query("get_record_frame")
+@timed("db.record_frame")
+async def get_record_frame(
+    conn: AsyncConnection, itersize: int = DEFAULT_ITERSIZE
+) -> RecordFrame:
+    """Fetch all records as a columnar RecordFrame, skipping model validation."""
+    frame = RecordFrame()
+    async with conn.cursor(name="record_frame") as cur:
+        cur.itersize = itersize
+        await cur.execute(RECORD_FRAME_SQL)
+        async for row in cur:
+            frame.append(*row)
+    return frame
+
+
+@observe_query("get_records_by_date_range")
+@timed("db.records_by_date_range")
+async def get_records_by_date_range(
+    conn: AsyncConnection, start_date: date, end_date: date
+) -> list[Record]:
+    """Fetch records within a date range."""
+    async with conn.cursor() as cur:
+        await cur.execute(RECORDS_BY_DATE_RANGE_SQL, (start_date, end_date))
+        rows = await cur.fetchall()
+
+    return [_record_from_row(row) for row in rows]
+
+
+@observe_query("get_latest_snapshot_records")
+@timed("db.latest_snapshot")
+async def get_latest_snapshot_records(conn: AsyncConnection) -> list[Record]:
+    """Fetch records for the most recent snapshot date."""
+    async with conn.cursor() as cur:
+        await cur.execute(LATEST_SNAPSHOT_RECORDS_SQL)
+        rows = await cur.fetchall()
+
+    return [_record_from_row(row) for row in rows]
+
+
+@observe_query("get_summary_by_date")
+@timed("db.summary_by_date")
+async def get_summary_by_date(conn: AsyncConnection) -> list[DailySummary]:
+    """Get aggregated totals by date and type (from the daily_totals rollup)."""
+    async with conn.cursor() as cur:
+        await cur.execute(SUMMARY_BY_DATE_SQL)
+        rows = await cur.fetchall()
+
+    return [_summary_from_row(row) for row in rows]
+
+
+@observe_query("get_daily_totals")
+@timed("db.daily_totals")
+async def get_daily_totals(conn: AsyncConnection) -> list[DailyTotals]:
+    """Get total assets, liabilities and net worth for every date."""
+    async with conn.cursor() as cur:
+        await cur.execute(DAILY_TOTALS_SQL)
+        rows = await cur.fetchall()
+
+    return [_daily_totals_from_row(row) for row in rows]
+
+
+@observe_query("get_data_version")
+@timed("db.data_version")
+async def get_data_version(conn: AsyncConnection) -> DataVersion:
+    """Get a cheap token that changes whenever snapshot data is written."""
+    async with conn.cursor() as cur:
+        await cur.execute(DATA_VERSION_SQL)
+        row = await cur.fetchone()
+
+    if row is None:
+        # The scalar subqueries always produce exactly one row
+        raise RuntimeError("Data version query returned no row")
+    return _data_version_from_row(row)
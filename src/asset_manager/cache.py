@@ -0,0 +1,84 @@
+"""Small in-process caches for data derived from the snapshots table.
+
+Caches are keyed by a data-version token (see ``repository.get_data_version``)
+so a stale entry simply stops being looked up once the data changes. Writers
+in this process also call :func:`invalidate_caches` so that rewrites which
+don't move the version token are never served from cache.
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Generic, TypeVar
+
+from asset_manager.metrics import RENDER_CACHE_LOOKUPS
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_caches: weakref.WeakSet[RenderCache] = weakref.WeakSet()
+
+
+class RenderCache(Generic[K, V]):
+    """A thread-safe LRU cache holding at most ``maxsize`` entries."""
+
+    def __init__(self, maxsize: int = 4) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[K, V] = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        _caches.add(self)
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped on every clear; pass it back to ``put``."""
+        return self._generation
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                RENDER_CACHE_LOOKUPS.inc(result="miss")
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            RENDER_CACHE_LOOKUPS.inc(result="hit")
+            return value
+
+    def put(self, key: K, value: V, generation: int | None = None) -> None:
+        """Store a value, evicting the least recently used entry if full.
+
+        If ``generation`` is given and the cache has been cleared since it was
+        read, the value was computed from data that may already be outdated and
+        is dropped instead of stored.
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def invalidate_caches() -> None:
+    """Clear every live RenderCache in this process."""
+    for cache in list(_caches):
+        cache.clear()
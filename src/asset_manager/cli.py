@@ -9,11 +9,10 @@ from typing import Annotated
 import typer
 from dotenv import load_dotenv
 
-from . import __version__
-from .db import get_connection_context
-from .report import generate_report
-from .repository import get_all_records
-from .sheets import fetch_and_save, fetch_records
+# Only cheap modules are imported here. Each command imports what it needs
+# (Plotly, googleapiclient, psycopg, settings) when it runs, so `version` and
+# `--help` start quickly (see test_cli.py).
+from . import __version__, timing
 
 app = typer.Typer(
     name="asset-manager",
@@ -30,8 +29,47 @@ def fetch(
             "--dry-run", help="Fetch and display records without saving to the database"
         ),
     ] = False,
+    force: Annotated[
+        bool,
+        typer.Option(
+            "--force",
+            help="Save even if the sheet is unchanged since the last fetch "
+            "(with --backfill: start again from the oldest tab)",
+        ),
+    ] = False,
+    backfill: Annotated[
+        bool,
+        typer.Option(
+            "--backfill",
+            help="Import dated historical tabs, resuming after the last one imported",
+        ),
+    ] = False,
+    verbose: Annotated[
+        bool,
+        typer.Option("--verbose", "-v", help="Show how long each fetch phase took"),
+    ] = False,
 ) -> None:
     """Fetch data from Google Sheets and save to the database."""
+    with timing.collect() as timings:
+        try:
+            with timing.phase("total"):
+                _fetch(dry_run=dry_run, force=force, backfill=backfill)
+        finally:
+            if verbose:
+                typer.echo("\nTiming:", err=True)
+                typer.echo(timings.format(), err=True)
+
+
+def _fetch(dry_run: bool, force: bool, backfill: bool) -> None:
+    from .sheets import fetch_and_save, fetch_records, format_counts
+
+    if backfill:
+        if dry_run:
+            typer.echo("--dry-run can't be combined with --backfill.", err=True)
+            raise typer.Exit(code=2)
+        _backfill(force=force)
+        return
+
     if dry_run:
         try:
             records = fetch_records()
@@ -51,17 +89,41 @@ def fetch(
         return
 
     try:
-        count = fetch_and_save()
+        result = fetch_and_save(force=force)
     except Exception as exc:
         typer.echo(f"Error fetching data: {exc}", err=True)
         raise typer.Exit(code=1)
 
-    if count > 0:
-        typer.echo(f"Successfully saved {count} records.")
+    if result.skipped:
+        typer.echo("No changes since the last fetch (use --force to save anyway).")
+    elif result.records > 0:
+        typer.echo(
+            f"Successfully saved {result.records} records ({format_counts(result)})."
+        )
     else:
         raise typer.Exit(code=1)
 
 
+def _backfill(force: bool) -> None:
+    from .sheets import backfill as run_backfill
+
+    try:
+        result = run_backfill(force=force)
+    except Exception as exc:
+        typer.echo(f"Error backfilling data: {exc}", err=True)
+        raise typer.Exit(code=1)
+
+    if result.resumed_after is not None:
+        typer.echo(f"Resumed after the tab for {result.resumed_after}.")
+    if result.tabs:
+        typer.echo(
+            f"Backfilled {result.tabs} tabs: {result.records} records "
+            f"({result.inserted} new, {result.updated} updated)."
+        )
+    else:
+        typer.echo("No dated tabs left to backfill.")
+
+
 @app.command()
 def report(
     output: Annotated[
@@ -74,9 +136,14 @@ def report(
     ] = False,
 ) -> None:
     """Generate an interactive HTML report of your finances."""
+    from .config import get_settings
+    from .db import get_connection_context
+    from .report import generate_report
+    from .repository import get_record_frame
+
     try:
         with get_connection_context() as conn:
-            records = get_all_records(conn)
+            records = get_record_frame(conn, itersize=get_settings().db_itersize)
     except Exception as exc:
         typer.echo(f"Error connecting to database: {exc}", err=True)
         raise typer.Exit(code=1)
@@ -112,6 +179,43 @@ def serve(
     )
 
 
+@app.command()
+def explain(
+    query: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--query", "-q", help="Only this repository function (repeatable)"
+        ),
+    ] = None,
+    no_analyze: Annotated[
+        bool,
+        typer.Option(
+            "--no-analyze", help="Show estimated plans without running the queries"
+        ),
+    ] = False,
+) -> None:
+    """Show the query plan of every repository query against the database."""
+    from .db import get_connection_context
+    from .explain import QUERIES, explain_queries
+
+    known = {q.name.split()[0] for q in QUERIES}
+    unknown = sorted(set(query or ()) - known)
+    if unknown:
+        typer.echo(f"Unknown query: {', '.join(unknown)}", err=True)
+        typer.echo(f"Choose from: {', '.join(sorted(known))}", err=True)
+        raise typer.Exit(code=2)
+
+    try:
+        with get_connection_context() as conn:
+            for name, plan in explain_queries(
+                conn, analyze=not no_analyze, names=query or ()
+            ):
+                typer.echo(f"-- {name}\n{plan}\n")
+    except Exception as exc:
+        typer.echo(f"Error explaining queries: {exc}", err=True)
+        raise typer.Exit(code=1)
+
+
 @app.command()
 def version() -> None:
     """Show the version and exit."""
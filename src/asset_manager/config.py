@@ -1,5 +1,6 @@
 import os
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -8,6 +9,48 @@ class Settings(BaseSettings):
     database_url: str
     google_application_credentials: str = ""
 
+    # Google Sheets client used by fetch: "google" (googleapiclient) or
+    # "httpx" (a lighter REST reader); sheets_api_url is for the latter
+    sheets_backend: Literal["google", "httpx"] = "google"
+    sheets_api_url: str = "https://sheets.googleapis.com/v4"
+
+    # Async connection pool used by the web dashboard
+    db_pool_min_size: int = 1
+    db_pool_max_size: int = 4
+    db_pool_timeout: float = 10.0  # seconds to wait for a free connection
+    db_pool_max_idle: float = 300.0  # seconds before idle connections are closed
+
+    # Rows fetched per round trip when streaming the full snapshot history
+    db_itersize: int = 2000
+
+    # Number of data versions whose rendered dashboard is kept in memory
+    render_cache_size: int = 4
+
+    # Threads that build Plotly charts, and how many builds may be running or
+    # waiting before the dashboard answers with a "busy" page instead
+    render_workers: int = 2
+    render_queue_limit: int = 8
+
+    # "client" renders dashboard charts in the browser from /api/series;
+    # "server" embeds Plotly HTML built on the server
+    dashboard_charts: Literal["client", "server"] = "client"
+
+    # Warm imports, templates, the pool and the render cache at startup, and
+    # hold /ready at 503 until that is done
+    startup_warm_up: bool = True
+
+    # Time each request's phases into a Server-Timing header and the log
+    server_timing: bool = False
+
+    # Serve Prometheus metrics at /metrics on this port, apart from the app
+    # itself; unset, they aren't served at all
+    metrics_port: int | None = None
+
+    # Log every query's SQL, redacted parameters, duration, rows and caller
+    # at DEBUG, and queries taking at least slow_query_ms at WARNING
+    query_trace: bool = False
+    slow_query_ms: float = 250.0
+
     model_config = SettingsConfigDict(
         env_file=f".env.{os.getenv('ENV', 'dev')}",
         env_file_encoding="utf-8",
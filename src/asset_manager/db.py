@@ -3,13 +3,17 @@ from typing import Iterator
 
 import psycopg
 from psycopg import Connection
+from psycopg_pool import AsyncConnectionPool
 
+from asset_manager import query_trace
 from asset_manager.config import get_settings
 
 
 def get_connection() -> Connection:
     settings = get_settings()
-    return psycopg.connect(settings.database_url)
+    conn = psycopg.connect(settings.database_url)
+    query_trace.install(conn)
+    return conn
 
 
 @contextmanager
@@ -19,3 +23,26 @@ def get_connection_context() -> Iterator[Connection]:
         yield conn
     finally:
         conn.close()
+
+
+def create_async_pool() -> AsyncConnectionPool:
+    """Create an (unopened) async connection pool sized from settings.
+
+    Connections are health-checked before being handed out, and acquiring one
+    fails with ``psycopg_pool.PoolTimeout`` after ``db_pool_timeout`` seconds.
+    With ``query_trace`` on, their queries are traced (see
+    :mod:`asset_manager.query_trace`).
+    The caller is responsible for opening and closing the pool.
+    """
+    settings = get_settings()
+    return AsyncConnectionPool(
+        settings.database_url,
+        min_size=settings.db_pool_min_size,
+        max_size=settings.db_pool_max_size,
+        timeout=settings.db_pool_timeout,
+        max_idle=settings.db_pool_max_idle,
+        check=AsyncConnectionPool.check_connection,
+        configure=query_trace.configure_pool_connection,
+        name="asset-manager",
+        open=False,
+    )
@@ -0,0 +1,126 @@
+"""EXPLAIN every query in :mod:`asset_manager.repository`.
+
+``asset-manager explain`` runs ``EXPLAIN (ANALYZE, BUFFERS)`` for each
+statement against the configured database, with parameters taken from the
+data already there, so plan regressions (a sequential scan creeping into
+``get_latest_snapshot_records``, say) show up before users notice them.
+
+ANALYZE really executes each statement, writes included. Everything runs
+in one transaction that is rolled back, with a savepoint per statement, so
+the database is left as it was and each plan sees the same data. The COPY
+into the staging table can't be explained and is left out; the merge that
+follows it runs against an empty staging table.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator, Sequence
+from datetime import date
+from decimal import Decimal
+from typing import Any, LiteralString, NamedTuple
+
+from psycopg import Connection, sql
+
+from asset_manager import repository as repo
+
+
+class Sample(NamedTuple):
+    """Parameter values for the explained statements."""
+
+    date: date
+    type: str
+    description: str
+    amount: Decimal
+    source: str
+
+
+class ExplainedQuery(NamedTuple):
+    name: str  # the repository function that runs it
+    sql: LiteralString
+    params: Callable[[Sample], Any] = lambda s: None
+    setup: LiteralString | None = None  # run first, e.g. to create a temp table
+
+
+def _key(s: Sample) -> tuple:
+    return (s.date, s.type, s.description)
+
+
+def _dates(s: Sample) -> dict[str, list[date]]:
+    return {"dates": [s.date]}
+
+
+QUERIES: tuple[ExplainedQuery, ...] = (
+    ExplainedQuery(
+        "insert_records", repo.INSERT_RECORD_SQL, lambda s: (*_key(s), s.amount)
+    ),
+    ExplainedQuery(
+        "bulk_upsert_records", repo.MERGE_STAGING_SQL, setup=repo.CREATE_STAGING_SQL
+    ),
+    ExplainedQuery("sync_records", repo.RECORDS_FOR_DATES_SQL, _dates),
+    ExplainedQuery(
+        "sync_records (update)", repo.UPDATE_AMOUNT_SQL, lambda s: (s.amount, *_key(s))
+    ),
+    ExplainedQuery("sync_records (delete)", repo.DELETE_RECORD_SQL, _key),
+    ExplainedQuery("refresh_daily_totals", repo.REFRESH_DAILY_TOTALS_SQL, _dates),
+    ExplainedQuery("refresh_daily_totals (prune)", repo.PRUNE_DAILY_TOTALS_SQL, _dates),
+    ExplainedQuery(
+        "get_ingest_fingerprint", repo.INGEST_FINGERPRINT_SQL, lambda s: (s.source,)
+    ),
+    ExplainedQuery(
+        "save_ingest_fingerprint",
+        repo.SAVE_INGEST_FINGERPRINT_SQL,
+        lambda s: (s.source, "explain"),
+    ),
+    ExplainedQuery(
+        "get_backfill_progress", repo.BACKFILL_PROGRESS_SQL, lambda s: (s.source,)
+    ),
+    ExplainedQuery(
+        "save_backfill_progress",
+        repo.SAVE_BACKFILL_PROGRESS_SQL,
+        lambda s: (s.source, s.date),
+    ),
+    ExplainedQuery("get_all_records", repo.ALL_RECORDS_SQL),
+    ExplainedQuery("get_record_frame", repo.RECORD_FRAME_SQL),
+    ExplainedQuery(
+        "get_records_by_date_range",
+        repo.RECORDS_BY_DATE_RANGE_SQL,
+        lambda s: (s.date.replace(day=1), s.date),
+    ),
+    ExplainedQuery("get_latest_snapshot_records", repo.LATEST_SNAPSHOT_RECORDS_SQL),
+    ExplainedQuery("get_summary_by_date", repo.SUMMARY_BY_DATE_SQL),
+    ExplainedQuery("get_daily_totals", repo.DAILY_TOTALS_SQL),
+    ExplainedQuery("get_data_version", repo.DATA_VERSION_SQL),
+)
+
+
+def sample(conn: Connection) -> Sample:
+    """Parameters matching the latest record, or made up for an empty table."""
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT date, type, description, amount FROM snapshots "
+            "ORDER BY date DESC LIMIT 1"
+        )
+        row = cur.fetchone() or (date.today(), "asset", "explain", Decimal("0.00"))
+        cur.execute("SELECT source FROM ingest_state LIMIT 1")
+        source = cur.fetchone()
+    return Sample(*row, source=source[0] if source else "explain")
+
+
+def explain_queries(
+    conn: Connection, analyze: bool = True, names: Sequence[str] = ()
+) -> Iterator[tuple[str, str]]:
+    """Yield ``(name, plan)`` for each query, or just those in ``names``."""
+    options = "ANALYZE, BUFFERS" if analyze else "COSTS"
+    queries = [q for q in QUERIES if not names or q.name.split()[0] in names]
+    params = sample(conn)
+    with conn.transaction(force_rollback=True):
+        for query in queries:
+            with conn.transaction(force_rollback=True), conn.cursor() as cur:
+                if query.setup:
+                    cur.execute(query.setup)
+                statement = sql.SQL("EXPLAIN ({}) {}").format(
+                    sql.SQL(options), sql.SQL(query.sql)
+                )
+                cur.execute(statement, query.params(params))
+                plan = "\n".join(row[0] for row in cur.fetchall())
+            yield query.name, plan
@@ -0,0 +1,126 @@
+"""Columnar, validation-free container for snapshot rows.
+
+A RecordFrame holds the same information as a ``list[Record]`` in parallel
+typed arrays, which is far smaller and cheaper to build than one pydantic
+model per row. Use it for bulk reads that only feed charts and reports.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator
+from datetime import date
+from decimal import Decimal
+
+from .models import Record, RecordType
+
+# Index into this tuple with a frame's type code
+TYPE_CODES = (RecordType.ASSET, RecordType.LIABILITY)
+_TYPE_CODE = {record_type: code for code, record_type in enumerate(TYPE_CODES)}
+
+
+def to_cents(amount: Decimal) -> int:
+    """Convert a dollar amount with at most two decimal places to cents."""
+    return int(amount.scaleb(2))
+
+
+def from_cents(cents: int) -> Decimal:
+    return Decimal(cents).scaleb(-2)
+
+
+class RecordFrame:
+    """Snapshot rows stored column-wise.
+
+    Attributes:
+        date_ordinals: ``date.toordinal()`` of each row
+        type_codes: index into TYPE_CODES for each row
+        description_ids: index into ``descriptions`` for each row
+        amount_cents: amount of each row in integer cents
+        descriptions: distinct descriptions, each stored once
+    """
+
+    __slots__ = (
+        "date_ordinals",
+        "type_codes",
+        "description_ids",
+        "amount_cents",
+        "descriptions",
+        "_description_index",
+    )
+
+    def __init__(self) -> None:
+        self.date_ordinals = array("i")
+        self.type_codes = array("b")
+        self.description_ids = array("i")
+        self.amount_cents = array("q")
+        self.descriptions: list[str] = []
+        self._description_index: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.amount_cents)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def append(
+        self, date_ordinal: int, type_code: int, description: str, cents: int
+    ) -> None:
+        """Add one row, interning its description."""
+        description_id = self._description_index.get(description)
+        if description_id is None:
+            description_id = len(self.descriptions)
+            self.descriptions.append(description)
+            self._description_index[description] = description_id
+        self.date_ordinals.append(date_ordinal)
+        self.type_codes.append(type_code)
+        self.description_ids.append(description_id)
+        self.amount_cents.append(cents)
+
+    def extend_rows(self, rows: Iterable[tuple[int, int, str, int]]) -> None:
+        """Add ``(date_ordinal, type_code, description, cents)`` rows."""
+        for row in rows:
+            self.append(*row)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple[int, int, str, int]]) -> RecordFrame:
+        frame = cls()
+        frame.extend_rows(rows)
+        return frame
+
+    @classmethod
+    def from_records(cls, records: Iterable[Record]) -> RecordFrame:
+        return cls.from_rows(
+            (
+                r.date.toordinal(),
+                _TYPE_CODE[r.type],
+                r.description,
+                to_cents(r.amount),
+            )
+            for r in records
+        )
+
+    def iter_rows(self) -> Iterator[tuple[date, RecordType, str, Decimal]]:
+        """Yield ``(date, type, description, amount)`` for each row."""
+        dates: dict[int, date] = {}
+        for ordinal, type_code, description_id, cents in zip(
+            self.date_ordinals,
+            self.type_codes,
+            self.description_ids,
+            self.amount_cents,
+        ):
+            row_date = dates.get(ordinal)
+            if row_date is None:
+                row_date = dates[ordinal] = date.fromordinal(ordinal)
+            yield (
+                row_date,
+                TYPE_CODES[type_code],
+                self.descriptions[description_id],
+                from_cents(cents),
+            )
+
+    def to_records(self) -> list[Record]:
+        """Expand into validated Record models (ids and timestamps are not kept)."""
+        return [
+            Record(date=d, type=t, description=desc, amount=amount)
+            for d, t, desc, amount in self.iter_rows()
+        ]
@@ -0,0 +1,299 @@
+"""In-process metrics in the Prometheus text exposition format.
+
+A deliberately small subset of what prometheus_client offers: labelled
+counters and histograms held in a process-wide registry, rendered by
+:func:`exposition` and served by :func:`start_http_server`. Updates are
+thread-safe, since render workers record from their own threads.
+
+The metrics themselves are defined at the bottom of this module so that
+every name the app exports is listed in one place.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import AbstractContextManager, contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter
+from typing import Any, TypeVar
+
+from asset_manager.timing import instrument
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Prometheus client defaults, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs: Sequence[tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class Registry:
+    """The set of metrics rendered together by :meth:`exposition`."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> None:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name!r} is already registered")
+            self._metrics[metric.name] = metric
+
+    def exposition(self) -> str:
+        """Every metric in the Prometheus text format, version 0.0.4."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            help_text = metric.documentation.replace("\\", "\\\\").replace("\n", "\\n")
+            lines.append(f"# HELP {metric.name} {help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class Metric:
+    """Base for labelled metrics; each label combination is its own series."""
+
+    kind = ""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: Registry | None = REGISTRY,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _pairs(self, key: tuple[str, ...]) -> list[tuple[str, str]]:
+        return list(zip(self.labelnames, key))
+
+    def samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """A value that only goes up, such as a number of requests."""
+
+    kind = "counter"
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only be incremented")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{_format_labels(self._pairs(key))} {_format_value(value)}"
+
+
+class _HistogramSeries:
+    def __init__(self, n_buckets: int) -> None:
+        self.counts = [0] * n_buckets  # per bucket, not cumulative
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram(Metric):
+    """Observations counted into cumulative ``le`` buckets, with sum and count."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, *args: Any, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs: Any
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series: dict[tuple[str, ...], _HistogramSeries] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _HistogramSeries(len(self.buckets))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series.counts[i] += 1
+                    break
+            series.sum += value
+            series.count += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe how long the block takes, in seconds."""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return series.count if series else 0
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            snapshot = sorted(
+                (key, list(s.counts), s.sum, s.count) for key, s in self._series.items()
+            )
+        for key, counts, total, count in snapshot:
+            pairs = self._pairs(key)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels([*pairs, ("le", _format_value(bound))])
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(pairs)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(pairs)} {count}"
+
+
+def exposition() -> str:
+    """The default registry in the Prometheus text format."""
+    return REGISTRY.exposition()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = exposition().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass  # scraped every few seconds; not worth an access log line
+
+
+def start_http_server(port: int, addr: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serve ``/metrics`` on its own port from a daemon thread.
+
+    Kept apart from the web app so the metrics can be scraped inside the
+    cluster without being reachable wherever the dashboard is. Port 0
+    picks a free port; see ``server_address``. Stop it with ``shutdown()``.
+    """
+    server = ThreadingHTTPServer((addr, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="metrics-server", daemon=True
+    ).start()
+    return server
+
+
+def _row_count(result: Any) -> int:
+    try:
+        return len(result)
+    except TypeError:
+        return 1 if result is not None else 0
+
+
+def observe_query(function: str) -> Callable[[F], F]:
+    """Decorator recording a repository query's latency and rows returned.
+
+    Rows are ``len(result)`` for collections and 1 for a single value.
+    """
+
+    def around() -> AbstractContextManager[None]:
+        return DB_QUERY_SECONDS.time(function=function)
+
+    def record_rows(result: Any) -> None:
+        DB_QUERY_ROWS.inc(_row_count(result), function=function)
+
+    def decorate(fn: F) -> F:
+        return instrument(fn, around, record_rows)
+
+    return decorate
+
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "asset_manager_http_request_duration_seconds",
+    "Time to handle an HTTP request, by route template.",
+    ["method", "route", "status"],
+)
+DB_QUERY_SECONDS = Histogram(
+    "asset_manager_db_query_duration_seconds",
+    "Time spent in a repository query function.",
+    ["function"],
+)
+DB_QUERY_ROWS = Counter(
+    "asset_manager_db_query_rows_total",
+    "Rows returned by repository query functions.",
+    ["function"],
+)
+DB_CONNECTION_ACQUIRE_SECONDS = Histogram(
+    "asset_manager_db_connection_acquire_duration_seconds",
+    "Time the web app waited for a pooled database connection.",
+    buckets=(0.0005, 0.001, 0.0025, *DEFAULT_BUCKETS),
+)
+RENDER_CACHE_LOOKUPS = Counter(
+    "asset_manager_render_cache_lookups_total",
+    "Render cache lookups, by whether the entry was found.",
+    ["result"],
+)
+CHART_BUILD_SECONDS = Histogram(
+    "asset_manager_chart_build_duration_seconds",
+    "Time to build the dashboard's charts and series from records.",
+    ["mode"],
+)
+INGEST_SECONDS = Histogram(
+    "asset_manager_ingest_duration_seconds",
+    "Duration of fetch_and_save runs, by outcome.",
+    ["outcome"],
+    buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+)
+INGEST_RECORDS = Counter(
+    "asset_manager_ingest_records_total",
+    "Records handled by fetch_and_save, by what happened to them.",
+    ["change"],
+)
@@ -2,7 +2,7 @@ from datetime import date, datetime
 from decimal import Decimal
 from enum import Enum
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class RecordType(str, Enum):
@@ -23,3 +23,57 @@ class DailySummary(BaseModel):
     date: date
     type: RecordType
     total_amount: Decimal
+
+
+class DailyTotals(BaseModel):
+    date: date
+    total_assets: Decimal
+    total_liabilities: Decimal
+    net_worth: Decimal
+
+
+class UpsertResult(BaseModel):
+    """How many snapshot rows a bulk upsert inserted and changed."""
+
+    inserted: int = 0
+    updated: int = 0
+
+
+class RecordDiff(BaseModel):
+    """Incoming records compared with the stored rows for the same dates."""
+
+    new: list[Record] = []
+    changed: list[Record] = []
+    removed: list[Record] = []
+    unchanged: int = 0
+
+
+class IngestResult(UpsertResult):
+    """Outcome of one fetch-and-save run."""
+
+    records: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    # True when the source was unchanged since the last ingest and nothing
+    # was parsed or written
+    skipped: bool = False
+
+
+class BackfillResult(UpsertResult):
+    """Outcome of one historical backfill run."""
+
+    tabs: int = 0
+    records: int = 0
+    # Date of the last tab a previous run completed, if this run resumed
+    resumed_after: date | None = None
+
+
+class DataVersion(BaseModel):
+    """Cheap fingerprint of the snapshots table, used as a cache key."""
+
+    model_config = ConfigDict(frozen=True)
+
+    latest_date: date | None
+    latest_created_at: datetime | None
+    day_count: int  # rows in daily_totals, i.e. dates with snapshots
+    totals_updated_at: datetime | None = None
@@ -0,0 +1,193 @@
+"""Optional tracing of every query the repository layer executes.
+
+With ``QUERY_TRACE`` on, connections from :mod:`asset_manager.db` create
+the cursor classes below. Each ``execute``/``executemany`` is
+then logged to the ``asset_manager.query_trace`` logger with its SQL,
+redacted parameters, duration, row count and the function that issued it:
+at DEBUG normally, and at WARNING once it takes ``SLOW_QUERY_MS`` or
+longer. The same values are attached to the log record as structured
+fields. Parameter values are never logged, only their types, since they
+include balances and account names.
+
+COPY is not traced: its rows stream through a context manager rather than
+one call.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+from collections.abc import Iterable, Mapping, Sequence
+from time import perf_counter
+from typing import Any
+
+from psycopg import (
+    AsyncConnection,
+    AsyncCursor,
+    AsyncServerCursor,
+    Connection,
+    Cursor,
+    ServerCursor,
+    sql,
+)
+
+from asset_manager.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Frames from these modules are skipped when looking for the caller
+_INTERNAL_PREFIXES = ("psycopg", __name__)
+
+
+def redact(params: Any) -> Any:
+    """Replace parameter values with their type names, keeping the shape."""
+    if params is None:
+        return None
+    if isinstance(params, Mapping):
+        return {key: _placeholder(value) for key, value in params.items()}
+    if isinstance(params, Sequence) and not isinstance(params, (str, bytes)):
+        return [_placeholder(value) for value in params]
+    return _placeholder(params)
+
+
+def _placeholder(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return f"<{type(value).__name__}[{len(value)}]>"
+    return f"<{type(value).__name__}>"
+
+
+def _caller() -> str:
+    """``module.function`` of the innermost frame outside psycopg and here."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if not module.startswith(_INTERNAL_PREFIXES):
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "<unknown>"
+
+
+def _sql_text(query: Any, cursor: Any) -> str:
+    if isinstance(query, sql.Composable):
+        query = query.as_string(cursor.connection)
+    elif isinstance(query, bytes):
+        query = query.decode()
+    return " ".join(str(query).split())
+
+
+def _log(
+    cursor: Any, query: Any, params: Any, seconds: float, rows: int | None, caller: str
+) -> None:
+    duration_ms = round(seconds * 1000, 1)
+    slow = duration_ms >= get_settings().slow_query_ms
+    level = logging.WARNING if slow else logging.DEBUG
+    if not logger.isEnabledFor(level):
+        return
+    text = _sql_text(query, cursor)
+    logger.log(
+        level,
+        "%s%.1f ms, %s rows, in %s: %s",
+        "Slow query: " if slow else "",
+        duration_ms,
+        "?" if rows is None else rows,
+        caller,
+        text,
+        extra={
+            "sql": text,
+            "params": params,
+            "duration_ms": duration_ms,
+            "rows": rows,
+            "caller": caller,
+        },
+    )
+
+
+def _rows(cursor: Any) -> int | None:
+    # psycopg reports -1 when the count isn't known (e.g. server cursors)
+    return cursor.rowcount if cursor.rowcount >= 0 else None
+
+
+def _batch(params_seq: Iterable[Any]) -> Sequence[Any]:
+    return params_seq if isinstance(params_seq, Sequence) else list(params_seq)
+
+
+class TracingCursor(Cursor):
+    def execute(self, query, params=None, **kwargs):
+        caller = _caller()
+        start = perf_counter()
+        try:
+            return super().execute(query, params, **kwargs)
+        finally:
+            _log(
+                self, query, redact(params), perf_counter() - start, _rows(self), caller
+            )
+
+    def executemany(self, query, params_seq, **kwargs):
+        caller = _caller()
+        params_seq = _batch(params_seq)
+        start = perf_counter()
+        try:
+            return super().executemany(query, params_seq, **kwargs)
+        finally:
+            params = f"<{len(params_seq)} parameter sets>"
+            _log(self, query, params, perf_counter() - start, _rows(self), caller)
+
+
+class TracingServerCursor(ServerCursor):
+    def execute(self, query, params=None, **kwargs):
+        caller = _caller()
+        start = perf_counter()
+        try:
+            return super().execute(query, params, **kwargs)
+        finally:
+            # Only declares the cursor; rows arrive as they are fetched
+            _log(self, query, redact(params), perf_counter() - start, None, caller)
+
+
+class AsyncTracingCursor(AsyncCursor):
+    async def execute(self, query, params=None, **kwargs):
+        caller = _caller()
+        start = perf_counter()
+        try:
+            return await super().execute(query, params, **kwargs)
+        finally:
+            _log(
+                self, query, redact(params), perf_counter() - start, _rows(self), caller
+            )
+
+    async def executemany(self, query, params_seq, **kwargs):
+        caller = _caller()
+        params_seq = _batch(params_seq)
+        start = perf_counter()
+        try:
+            return await super().executemany(query, params_seq, **kwargs)
+        finally:
+            params = f"<{len(params_seq)} parameter sets>"
+            _log(self, query, params, perf_counter() - start, _rows(self), caller)
+
+
+class AsyncTracingServerCursor(AsyncServerCursor):
+    async def execute(self, query, params=None, **kwargs):
+        caller = _caller()
+        start = perf_counter()
+        try:
+            return await super().execute(query, params, **kwargs)
+        finally:
+            _log(self, query, redact(params), perf_counter() - start, None, caller)
+
+
+def install(conn: Connection | AsyncConnection) -> None:
+    """Make ``conn`` create tracing cursors, if ``QUERY_TRACE`` is on."""
+    if not get_settings().query_trace:
+        return
+    if isinstance(conn, AsyncConnection):
+        conn.cursor_factory = AsyncTracingCursor
+        conn.server_cursor_factory = AsyncTracingServerCursor
+    else:
+        conn.cursor_factory = TracingCursor
+        conn.server_cursor_factory = TracingServerCursor
+
+
+async def configure_pool_connection(conn: AsyncConnection) -> None:
+    """``AsyncConnectionPool(configure=...)`` callback applying :func:`install`."""
+    install(conn)
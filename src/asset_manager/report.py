@@ -4,76 +4,27 @@ from __future__ import annotations
 
 import tempfile
 import webbrowser
-from collections import defaultdict
-from datetime import date
-from decimal import Decimal
+from collections.abc import Iterable
 from pathlib import Path
 
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
-from .models import Record, RecordType
-
-
-def _transform_data(
-    records: list[Record],
-) -> tuple[
-    dict[str, list[tuple[date, Decimal]]],
-    dict[str, list[tuple[date, Decimal]]],
-    list[tuple[date, Decimal, Decimal, Decimal]],
-]:
-    """Transform records into data structures for charting.
-
-    Returns:
-        - assets_by_item: {description: [(date, amount), ...]}
-        - liabilities_by_item: {description: [(date, amount), ...]}
-        - summary: [(date, total_assets, total_liabilities, net_worth), ...]
-    """
-    assets_by_item: dict[str, list[tuple[date, Decimal]]] = defaultdict(list)
-    liabilities_by_item: dict[str, list[tuple[date, Decimal]]] = defaultdict(list)
-
-    # Group records by date for summary calculation
-    by_date: dict[date, dict[str, Decimal]] = defaultdict(
-        lambda: {"assets": Decimal("0"), "liabilities": Decimal("0")}
-    )
-
-    for record in records:
-        if record.type == RecordType.ASSET:
-            assets_by_item[record.description].append((record.date, record.amount))
-            by_date[record.date]["assets"] += record.amount
-        else:
-            liabilities_by_item[record.description].append((record.date, record.amount))
-            by_date[record.date]["liabilities"] += record.amount
-
-    # Sort each series by date
-    for series in assets_by_item.values():
-        series.sort(key=lambda x: x[0])
-    for series in liabilities_by_item.values():
-        series.sort(key=lambda x: x[0])
-
-    # Build summary data
-    summary = [
-        (
-            d,
-            totals["assets"],
-            totals["liabilities"],
-            totals["assets"] - totals["liabilities"],
-        )
-        for d, totals in sorted(by_date.items())
-    ]
-
-    return dict(assets_by_item), dict(liabilities_by_item), summary
+from .frame import RecordFrame
+from .models import Record
+from .transform import _transform_data
 
 
 def generate_report(
-    records: list[Record],
+    records: Iterable[Record] | RecordFrame,
     output_path: Path | None = None,
     open_browser: bool = True,
 ) -> Path:
     """Generate an interactive HTML report and optionally open in browser.
 
     Args:
-        records: List of financial records from the database.
+        records: Financial records from the database, as Record models (any
+            iterable, including a stream) or a RecordFrame.
         output_path: Where to save the HTML. Defaults to temp directory.
         open_browser: Whether to open the report in the default browser.
 
@@ -1,129 +1,498 @@
+from collections.abc import Iterator
 from datetime import date
 from decimal import Decimal
 
-from psycopg import Connection
+from psycopg import Connection, Cursor
 
-from asset_manager.models import DailySummary, Record, RecordType
+from asset_manager.cache import invalidate_caches
+from asset_manager.frame import RecordFrame
+from asset_manager.metrics import observe_query
+from asset_manager.models import (
+    DailySummary,
+    DailyTotals,
+    DataVersion,
+    Record,
+    RecordDiff,
+    RecordType,
+    UpsertResult,
+)
+from asset_manager.timing import timed
 
+# Rows per round trip for server-side cursors that stream the full history
+DEFAULT_ITERSIZE = 2000
 
-def insert_records(conn: Connection, records: list[Record]) -> int:
-    """Insert records into the database. Returns the number of records inserted."""
-    if not records:
-        return 0
+# SQL shared by the sync functions below and their async counterparts in
+# asset_manager.async_repository.
+INSERT_RECORD_SQL = """
+    INSERT INTO snapshots (date, type, description, amount)
+    VALUES (%s, %s, %s, %s)
+    ON CONFLICT (date, type, description) DO UPDATE SET
+        amount = EXCLUDED.amount
+"""
 
-    query = """
+# Bulk upsert: COPY rows into a per-transaction staging table, then merge
+# them into snapshots with one statement. seq preserves input order so the
+# last of several rows for the same key wins, as with INSERT_RECORD_SQL.
+CREATE_STAGING_SQL = """
+    CREATE TEMP TABLE snapshots_staging (
+        seq BIGSERIAL,
+        date DATE NOT NULL,
+        type VARCHAR(10) NOT NULL,
+        description TEXT NOT NULL,
+        amount DECIMAL(15, 2) NOT NULL
+    ) ON COMMIT DROP
+"""
+
+COPY_STAGING_SQL = """
+    COPY snapshots_staging (date, type, description, amount) FROM STDIN
+"""
+
+# Rows whose amount is unchanged are skipped, so "updated" only counts real
+# changes. xmax = 0 on a returned row means it was freshly inserted.
+MERGE_STAGING_SQL = """
+    WITH merged AS (
         INSERT INTO snapshots (date, type, description, amount)
-        VALUES (%s, %s, %s, %s)
+        SELECT DISTINCT ON (date, type, description)
+            date, type, description, amount
+        FROM snapshots_staging
+        ORDER BY date, type, description, seq DESC
         ON CONFLICT (date, type, description) DO UPDATE SET
             amount = EXCLUDED.amount
+        WHERE snapshots.amount IS DISTINCT FROM EXCLUDED.amount
+        RETURNING xmax = 0 AS inserted
+    )
+    SELECT
+        COUNT(*) FILTER (WHERE inserted),
+        COUNT(*) FILTER (WHERE NOT inserted)
+    FROM merged
+"""
+
+INGEST_FINGERPRINT_SQL = """
+    SELECT fingerprint FROM ingest_state WHERE source = %s
+"""
+
+SAVE_INGEST_FINGERPRINT_SQL = """
+    INSERT INTO ingest_state (source, fingerprint)
+    VALUES (%s, %s)
+    ON CONFLICT (source) DO UPDATE SET
+        fingerprint = EXCLUDED.fingerprint,
+        ingested_at = CURRENT_TIMESTAMP
+"""
+
+BACKFILL_PROGRESS_SQL = """
+    SELECT last_tab_date FROM backfill_progress WHERE source = %s
+"""
+
+SAVE_BACKFILL_PROGRESS_SQL = """
+    INSERT INTO backfill_progress (source, last_tab_date)
+    VALUES (%s, %s)
+    ON CONFLICT (source) DO UPDATE SET
+        last_tab_date = EXCLUDED.last_tab_date,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+ALL_RECORDS_SQL = """
+    SELECT id, date, type, description, amount, created_at
+    FROM snapshots
+    ORDER BY date, type, description
+"""
+
+# Same rows as ALL_RECORDS_SQL, pre-shaped for RecordFrame: date as
+# date.toordinal(), type as an index into frame.TYPE_CODES, amount in cents.
+RECORD_FRAME_SQL = """
+    SELECT
+        date - DATE '0001-01-01' + 1,
+        CASE type WHEN 'asset' THEN 0 ELSE 1 END,
+        description,
+        (amount * 100)::bigint
+    FROM snapshots
+    ORDER BY date, type, description
+"""
+
+RECORDS_BY_DATE_RANGE_SQL = """
+    SELECT id, date, type, description, amount, created_at
+    FROM snapshots
+    WHERE date >= %s AND date <= %s
+    ORDER BY date, type, description
+"""
+
+# Locks the rows so a concurrent ingest can't change them mid-diff
+RECORDS_FOR_DATES_SQL = """
+    SELECT id, date, type, description, amount, created_at
+    FROM snapshots
+    WHERE date = ANY(%(dates)s)
+    ORDER BY date, type, description
+    FOR UPDATE
+"""
+
+UPDATE_AMOUNT_SQL = """
+    UPDATE snapshots SET amount = %s
+    WHERE date = %s AND type = %s AND description = %s
+"""
+
+DELETE_RECORD_SQL = """
+    DELETE FROM snapshots
+    WHERE date = %s AND type = %s AND description = %s
+"""
+
+LATEST_SNAPSHOT_RECORDS_SQL = """
+    SELECT id, date, type, description, amount, created_at
+    FROM snapshots
+    WHERE date = (SELECT MAX(date) FROM snapshots)
+    ORDER BY type, description
+"""
+
+# Recompute the daily_totals rollup for the given dates from snapshots, and
+# drop rollup rows for dates that no longer have any snapshots.
+REFRESH_DAILY_TOTALS_SQL = """
+    INSERT INTO daily_totals (date, total_assets, total_liabilities, updated_at)
+    SELECT
+        date,
+        SUM(amount) FILTER (WHERE type = 'asset'),
+        SUM(amount) FILTER (WHERE type = 'liability'),
+        CURRENT_TIMESTAMP
+    FROM snapshots
+    WHERE date = ANY(%(dates)s)
+    GROUP BY date
+    ON CONFLICT (date) DO UPDATE SET
+        total_assets = EXCLUDED.total_assets,
+        total_liabilities = EXCLUDED.total_liabilities,
+        updated_at = EXCLUDED.updated_at
+"""
+
+PRUNE_DAILY_TOTALS_SQL = """
+    DELETE FROM daily_totals d
+    WHERE d.date = ANY(%(dates)s)
+        AND NOT EXISTS (SELECT 1 FROM snapshots s WHERE s.date = d.date)
+"""
+
+# Read from the daily_totals rollup rather than aggregating every snapshot.
+SUMMARY_BY_DATE_SQL = """
+    SELECT date, type, total_amount
+    FROM (
+        SELECT date, 'asset' AS type, total_assets AS total_amount
+        FROM daily_totals
+        UNION ALL
+        SELECT date, 'liability' AS type, total_liabilities AS total_amount
+        FROM daily_totals
+    ) totals
+    WHERE total_amount IS NOT NULL
+    ORDER BY date, type
+"""
+
+DAILY_TOTALS_SQL = """
+    SELECT
+        date,
+        COALESCE(total_assets, 0),
+        COALESCE(total_liabilities, 0),
+        net_worth
+    FROM daily_totals
+    ORDER BY date
+"""
+
+# Runs on every dashboard and API request, so nothing here scans snapshots:
+# each MAX() is answered from its index, and the count is over daily_totals
+# (one row per day), catching a day whose rollup row was pruned.
+DATA_VERSION_SQL = """
+    SELECT
+        (SELECT MAX(date) FROM snapshots),
+        (SELECT MAX(created_at) FROM snapshots),
+        (SELECT COUNT(*) FROM daily_totals),
+        (SELECT MAX(updated_at) FROM daily_totals)
+"""
+
+
+def _record_from_row(row: tuple) -> Record:
+    """Build a Record from a snapshots row in the standard column order."""
+    return Record(
+        id=row[0],
+        date=row[1],
+        type=RecordType(row[2]),
+        description=row[3],
+        amount=Decimal(str(row[4])),
+        created_at=row[5],
+    )
+
+
+def _summary_from_row(row: tuple) -> DailySummary:
+    """Build a DailySummary from a (date, type, total_amount) row."""
+    return DailySummary(
+        date=row[0],
+        type=RecordType(row[1]),
+        total_amount=Decimal(str(row[2])),
+    )
+
+
+def _daily_totals_from_row(row: tuple) -> DailyTotals:
+    """Build DailyTotals from a (date, assets, liabilities, net_worth) row."""
+    return DailyTotals(
+        date=row[0],
+        total_assets=Decimal(str(row[1])),
+        total_liabilities=Decimal(str(row[2])),
+        net_worth=Decimal(str(row[3])),
+    )
+
+
+def _data_version_from_row(row: tuple) -> DataVersion:
+    return DataVersion(
+        latest_date=row[0],
+        latest_created_at=row[1],
+        day_count=row[2],
+        totals_updated_at=row[3],
+    )
+
+
+def _refresh_params(records: list[Record]) -> dict[str, list[date]]:
+    return {"dates": sorted({r.date for r in records})}
+
+
+def _insert_params(records: list[Record]) -> list[tuple]:
+    return [(r.date, r.type.value, r.description, r.amount) for r in records]
+
+
+def refresh_daily_totals(cur: Cursor, params: dict[str, list[date]]) -> None:
+    """Bring daily_totals up to date for ``params["dates"]``.
+
+    Runs on the caller's cursor so it commits atomically with the snapshot
+    writes that made it necessary.
     """
+    cur.execute(REFRESH_DAILY_TOTALS_SQL, params)
+    cur.execute(PRUNE_DAILY_TOTALS_SQL, params)
+
+
+def insert_records(conn: Connection, records: list[Record]) -> int:
+    """Insert records into the database. Returns the number of records inserted."""
+    if not records:
+        return 0
 
     with conn.cursor() as cur:
-        cur.executemany(
-            query,
-            [(r.date, r.type.value, r.description, r.amount) for r in records],
-        )
+        cur.executemany(INSERT_RECORD_SQL, _insert_params(records))
+        refresh_daily_totals(cur, _refresh_params(records))
     conn.commit()
+    invalidate_caches()
     return len(records)
 
 
-def get_all_records(conn: Connection) -> list[Record]:
-    """Fetch all records from the database."""
-    query = """
-        SELECT id, date, type, description, amount, created_at
-        FROM snapshots
-        ORDER BY date, type, description
+def bulk_upsert_records(conn: Connection, records: list[Record]) -> UpsertResult:
+    """Upsert many records with COPY and a single set-based merge.
+
+    Rows are streamed into a temporary staging table and merged into
+    snapshots in one transaction, so large imports cost a few round trips
+    instead of one per row. Returns how many rows were inserted and how many
+    existing rows had their amount changed.
+    """
+    if not records:
+        return UpsertResult()
+
+    with conn.cursor() as cur:
+        cur.execute(CREATE_STAGING_SQL)
+        with cur.copy(COPY_STAGING_SQL) as copy:
+            for row in _insert_params(records):
+                copy.write_row(row)
+        cur.execute(MERGE_STAGING_SQL)
+        counts = cur.fetchone()
+        if counts is None:
+            # The aggregate over the merge always produces exactly one row
+            raise RuntimeError("Merging staged records returned no counts")
+        inserted, updated = counts
+        refresh_daily_totals(cur, _refresh_params(records))
+    conn.commit()
+    invalidate_caches()
+    return UpsertResult(inserted=inserted, updated=updated)
+
+
+def _record_key(record: Record) -> tuple[date, RecordType, str]:
+    return (record.date, record.type, record.description)
+
+
+def diff_records(existing: list[Record], incoming: list[Record]) -> RecordDiff:
+    """Compare incoming records with the stored rows for the same dates.
+
+    Stored rows with no incoming counterpart are reported as removed. If
+    ``incoming`` repeats a key, the last record wins.
+    """
+    stored = {_record_key(r): r for r in existing}
+    diff = RecordDiff()
+    for key, record in {_record_key(r): r for r in incoming}.items():
+        current = stored.pop(key, None)
+        if current is None:
+            diff.new.append(record)
+        elif current.amount != record.amount:
+            diff.changed.append(record)
+        else:
+            diff.unchanged += 1
+    diff.removed = list(stored.values())
+    return diff
+
+
+def sync_records(conn: Connection, records: list[Record]) -> RecordDiff:
+    """Make the stored rows for the records' dates match ``records``.
+
+    Loads the existing rows for those dates with one query and writes only
+    new, changed and removed rows, so unchanged balances cost no writes.
+    daily_totals is refreshed for the dates that were written, in the same
+    transaction. Returns the diff that was applied.
     """
+    if not records:
+        return RecordDiff()
 
     with conn.cursor() as cur:
-        cur.execute(query)
+        cur.execute(RECORDS_FOR_DATES_SQL, _refresh_params(records))
+        diff = diff_records([_record_from_row(row) for row in cur], records)
+        if diff.new:
+            cur.executemany(INSERT_RECORD_SQL, _insert_params(diff.new))
+        if diff.changed:
+            cur.executemany(
+                UPDATE_AMOUNT_SQL,
+                [(r.amount, r.date, r.type.value, r.description) for r in diff.changed],
+            )
+        if diff.removed:
+            cur.executemany(
+                DELETE_RECORD_SQL,
+                [(r.date, r.type.value, r.description) for r in diff.removed],
+            )
+        written = diff.new + diff.changed + diff.removed
+        if written:
+            refresh_daily_totals(cur, _refresh_params(written))
+    conn.commit()
+    if written:
+        invalidate_caches()
+    return diff
+
+
+def get_ingest_fingerprint(conn: Connection, source: str) -> str | None:
+    """Get the fingerprint of the last successful ingest from ``source``."""
+    with conn.cursor() as cur:
+        cur.execute(INGEST_FINGERPRINT_SQL, (source,))
+        row = cur.fetchone()
+
+    return row[0] if row else None
+
+
+def save_ingest_fingerprint(conn: Connection, source: str, fingerprint: str) -> None:
+    """Record ``fingerprint`` as the last successful ingest from ``source``."""
+    with conn.cursor() as cur:
+        cur.execute(SAVE_INGEST_FINGERPRINT_SQL, (source, fingerprint))
+    conn.commit()
+
+
+def get_backfill_progress(conn: Connection, source: str) -> date | None:
+    """Get the date of the last tab a backfill from ``source`` completed."""
+    with conn.cursor() as cur:
+        cur.execute(BACKFILL_PROGRESS_SQL, (source,))
+        row = cur.fetchone()
+
+    return row[0] if row else None
+
+
+def save_backfill_progress(conn: Connection, source: str, tab_date: date) -> None:
+    """Record that a backfill from ``source`` has completed up to ``tab_date``."""
+    with conn.cursor() as cur:
+        cur.execute(SAVE_BACKFILL_PROGRESS_SQL, (source, tab_date))
+    conn.commit()
+
+
+@observe_query("get_all_records")
+@timed("db.all_records")
+def get_all_records(conn: Connection) -> list[Record]:
+    """Fetch all records from the database."""
+    with conn.cursor() as cur:
+        cur.execute(ALL_RECORDS_SQL)
         rows = cur.fetchall()
 
-    return [
-        Record(
-            id=row[0],
-            date=row[1],
-            type=RecordType(row[2]),
-            description=row[3],
-            amount=Decimal(str(row[4])),
-            created_at=row[5],
-        )
-        for row in rows
-    ]
+    return [_record_from_row(row) for row in rows]
+
+
+def iter_records(
+    conn: Connection, itersize: int = DEFAULT_ITERSIZE
+) -> Iterator[Record]:
+    """Stream all records through a server-side cursor.
+
+    Only ``itersize`` rows are held client-side at a time, so memory stays
+    flat however long the history is. The cursor lives in the connection's
+    current transaction; finish iterating before committing.
+    """
+    with conn.cursor(name="iter_records") as cur:
+        cur.itersize = itersize
+        cur.execute(ALL_RECORDS_SQL)
+        for row in cur:
+            yield _record_from_row(row)
 
 
+@observe_query("get_record_frame")
+@timed("db.record_frame")
+def get_record_frame(conn: Connection, itersize: int = DEFAULT_ITERSIZE) -> RecordFrame:
+    """Fetch all records as a columnar RecordFrame, skipping model validation.
+
+    Rows are streamed through a server-side cursor ``itersize`` at a time,
+    so the full result set is never held client-side next to the frame.
+    """
+    with conn.cursor(name="record_frame") as cur:
+        cur.itersize = itersize
+        cur.execute(RECORD_FRAME_SQL)
+        return RecordFrame.from_rows(cur)
+
+
+@observe_query("get_records_by_date_range")
+@timed("db.records_by_date_range")
 def get_records_by_date_range(
     conn: Connection, start_date: date, end_date: date
 ) -> list[Record]:
     """Fetch records within a date range."""
-    query = """
-        SELECT id, date, type, description, amount, created_at
-        FROM snapshots
-        WHERE date >= %s AND date <= %s
-        ORDER BY date, type, description
-    """
-
     with conn.cursor() as cur:
-        cur.execute(query, (start_date, end_date))
+        cur.execute(RECORDS_BY_DATE_RANGE_SQL, (start_date, end_date))
         rows = cur.fetchall()
 
-    return [
-        Record(
-            id=row[0],
-            date=row[1],
-            type=RecordType(row[2]),
-            description=row[3],
-            amount=Decimal(str(row[4])),
-            created_at=row[5],
-        )
-        for row in rows
-    ]
+    return [_record_from_row(row) for row in rows]
 
 
+@observe_query("get_latest_snapshot_records")
+@timed("db.latest_snapshot")
 def get_latest_snapshot_records(conn: Connection) -> list[Record]:
     """Fetch records for the most recent snapshot date."""
-    query = """
-        SELECT id, date, type, description, amount, created_at
-        FROM snapshots
-        WHERE date = (SELECT MAX(date) FROM snapshots)
-        ORDER BY type, description
-    """
-
     with conn.cursor() as cur:
-        cur.execute(query)
+        cur.execute(LATEST_SNAPSHOT_RECORDS_SQL)
         rows = cur.fetchall()
 
-    return [
-        Record(
-            id=row[0],
-            date=row[1],
-            type=RecordType(row[2]),
-            description=row[3],
-            amount=Decimal(str(row[4])),
-            created_at=row[5],
-        )
-        for row in rows
-    ]
+    return [_record_from_row(row) for row in rows]
 
 
+@observe_query("get_summary_by_date")
+@timed("db.summary_by_date")
 def get_summary_by_date(conn: Connection) -> list[DailySummary]:
-    """Get aggregated totals by date and type."""
-    query = """
-        SELECT date, type, SUM(amount) as total_amount
-        FROM snapshots
-        GROUP BY date, type
-        ORDER BY date, type
-    """
+    """Get aggregated totals by date and type (from the daily_totals rollup)."""
+    with conn.cursor() as cur:
+        cur.execute(SUMMARY_BY_DATE_SQL)
+        rows = cur.fetchall()
+
+    return [_summary_from_row(row) for row in rows]
+
 
+@observe_query("get_daily_totals")
+@timed("db.daily_totals")
+def get_daily_totals(conn: Connection) -> list[DailyTotals]:
+    """Get total assets, liabilities and net worth for every date."""
     with conn.cursor() as cur:
-        cur.execute(query)
+        cur.execute(DAILY_TOTALS_SQL)
         rows = cur.fetchall()
 
-    return [
-        DailySummary(
-            date=row[0],
-            type=RecordType(row[1]),
-            total_amount=Decimal(str(row[2])),
-        )
-        for row in rows
-    ]
+    return [_daily_totals_from_row(row) for row in rows]
+
+
+@observe_query("get_data_version")
+@timed("db.data_version")
+def get_data_version(conn: Connection) -> DataVersion:
+    """Get a cheap token that changes whenever snapshot data is written.
+
+    Inserts move the snapshot columns. Every write also refreshes the
+    daily_totals rows of the dates it touched, so updates and deletions move
+    ``totals_updated_at``, and a date left with no rows lowers ``day_count``.
+    """
+    with conn.cursor() as cur:
+        cur.execute(DATA_VERSION_SQL)
+        row = cur.fetchone()
+
+    if row is None:
+        # The scalar subqueries always produce exactly one row
+        raise RuntimeError("Data version query returned no row")
+    return _data_version_from_row(row)
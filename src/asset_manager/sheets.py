@@ -1,44 +1,161 @@
 from __future__ import annotations
 
+import calendar
 import configparser
 import datetime
+import hashlib
+import json
 import os
 import re
+from concurrent.futures import Executor, ProcessPoolExecutor
 from decimal import Decimal
+from functools import lru_cache
 from importlib import resources
-from typing import Any
-
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
+from time import perf_counter
+from typing import Any, NamedTuple
 
+from .config import get_settings
 from .db import get_connection_context
-from .models import Record, RecordType
-from .repository import insert_records
+from .metrics import INGEST_RECORDS, INGEST_SECONDS
+from .models import BackfillResult, IngestResult, Record, RecordType
+from .repository import (
+    bulk_upsert_records,
+    get_backfill_progress,
+    get_ingest_fingerprint,
+    save_backfill_progress,
+    save_ingest_fingerprint,
+    sync_records,
+)
+from .timing import phase
 
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
 
-config_contents = (
-    resources.files("asset_manager").joinpath("data/config.ini").read_text()
-)
-config = configparser.ConfigParser()
-config.read_string(config_contents)
-SHEET_ID = config["DEFAULT"]["SHEET_ID"]
-SHEET_RANGE = config["DEFAULT"]["SHEET_RANGE"]
+
+class SheetRange(NamedTuple):
+    """A range (tab name or A1 notation) to pull, and where its sections are."""
+
+    name: str
+    asset_cols: slice | None
+    liability_cols: slice | None
+
+
+def _parse_columns(value: str) -> slice | None:
+    """Parse a zero-based ``start:stop`` column slice; blank means none."""
+    if not value.strip():
+        return None
+    start, stop = (int(part) for part in value.split(":"))
+    return slice(start, stop)
+
+
+def load_ranges(parser: configparser.ConfigParser) -> list[SheetRange]:
+    """Read one SheetRange per config section, in file order."""
+    return [
+        SheetRange(
+            name=name,
+            asset_cols=_parse_columns(parser[name]["ASSET_COLUMNS"]),
+            liability_cols=_parse_columns(parser[name]["LIABILITY_COLUMNS"]),
+        )
+        for name in parser.sections()
+    ]
+
+
+class SheetConfig(NamedTuple):
+    """The spreadsheet and ranges to pull, from ``data/config.ini``."""
+
+    sheet_id: str
+    ranges: list[SheetRange]
+    # Section layout of tabs not listed in the config (backfilled tabs)
+    default_asset_cols: slice | None
+    default_liability_cols: slice | None
+
+    @property
+    def ingest_source(self) -> str:
+        """Key for this sheet's row in the ingest_state table."""
+        return f"sheets:{self.sheet_id}:{','.join(r.name for r in self.ranges)}"
+
+    @property
+    def backfill_source(self) -> str:
+        """Key for this sheet's row in the backfill_progress table."""
+        return f"sheets:{self.sheet_id}"
+
+
+@lru_cache
+def get_sheet_config() -> SheetConfig:
+    """Read the bundled config.ini on first use rather than at import."""
+    parser = configparser.ConfigParser()
+    parser.read_string(
+        resources.files("asset_manager").joinpath("data/config.ini").read_text()
+    )
+    defaults = parser["DEFAULT"]
+    return SheetConfig(
+        sheet_id=defaults["SHEET_ID"],
+        ranges=load_ranges(parser),
+        default_asset_cols=_parse_columns(defaults["ASSET_COLUMNS"]),
+        default_liability_cols=_parse_columns(defaults["LIABILITY_COLUMNS"]),
+    )
+
+
+# Historical backfill: tabs whose title parses with one of these formats are
+# snapshots for that date. Month-only titles are dated the month's last day.
+TAB_DATE_FORMATS = ("%Y-%m-%d", "%Y-%m", "%b %Y", "%B %Y")
+BACKFILL_CHUNK_SIZE = 12  # tabs per batchGet request
 
 
 def get_service() -> Any:
     """
     From https://developers.google.com/sheets/api/quickstart/python
+
+    Returns a client for the configured ``SHEETS_BACKEND``: googleapiclient
+    ("google", the default) or the lighter httpx reader in
+    :mod:`asset_manager.sheets_http` ("httpx"). Both answer the same
+    ``spreadsheets()`` calls.
+
+    The client is built once per credentials file and reused, so a
+    long-lived process keeps its credentials (and their access token) and
+    HTTP connection across fetches. Like the underlying HTTP session, it
+    should only be used from one thread at a time.
     """
+    settings = get_settings()
     service_account_file = os.environ["GOOGLE_APPLICATION_CREDENTIALS"]
-    creds = Credentials.from_service_account_file(
-        service_account_file,
-        scopes=SCOPES,
-    )
-    service = build("sheets", "v4", credentials=creds)
+    if settings.sheets_backend == "httpx":
+        return _http_service_for(service_account_file, settings.sheets_api_url)
+    return _service_for(service_account_file)
+
+
+@lru_cache(maxsize=1)
+def _service_for(service_account_file: str) -> Any:
+    # Imported here: googleapiclient is slow to import and the httpx backend
+    # doesn't need it
+    from google.oauth2.service_account import Credentials
+    from googleapiclient.discovery import build
+
+    with phase("sheets.credentials"):
+        creds = Credentials.from_service_account_file(
+            service_account_file,
+            scopes=SCOPES,
+        )
+    with phase("sheets.client"):
+        # The discovery document bundled with googleapiclient, so building
+        # the client makes no network request
+        service = build(
+            "sheets",
+            "v4",
+            credentials=creds,
+            static_discovery=True,
+            cache_discovery=False,
+        )
     return service
 
 
+@lru_cache(maxsize=1)
+def _http_service_for(service_account_file: str, api_url: str) -> Any:
+    from .sheets_http import ServiceAccount, SheetsHttpClient
+
+    with phase("sheets.credentials"):
+        account = ServiceAccount.from_file(service_account_file)
+    return SheetsHttpClient(account, SCOPES, api_url=api_url)
+
+
 def dollars_to_decimal(dollar_str: str) -> Decimal:
     """Convert a dollar string like '$1,234.56' to a Decimal."""
     pattern = r"\d+(,\d{3})*(.\d\d)?"
@@ -130,59 +247,316 @@ def parse_records_from_table(
     return records
 
 
-def fetch_records() -> list[Record]:
-    """
-    Fetch data from Google Sheets and parse into records.
+def fetch_raw_tables(
+    ranges: list[SheetRange] | None = None,
+    service: Any = None,
+) -> dict[str, list[list[str]]]:
+    """Pull every range (by default, the configured ones) with one batchGet.
 
-    Returns the parsed records without saving to the database.
+    Returns each range's table of strings keyed by range name, in the order
+    given; a range with no data maps to an empty table.
     """
-    service = get_service()
+    sheet_config = get_sheet_config()
+    if ranges is None:
+        ranges = sheet_config.ranges
+    if service is None:
+        service = get_service()
     sheets = service.spreadsheets()
     print("Pulling spreadsheet...")
-    my_sheet = sheets.values().get(spreadsheetId=SHEET_ID, range=SHEET_RANGE).execute()
-    raw_table: list[list[str]] = my_sheet.get("values", [])
+    with phase("sheets.pull"):
+        response = (
+            sheets.values()
+            .batchGet(
+                spreadsheetId=sheet_config.sheet_id, ranges=[r.name for r in ranges]
+            )
+            .execute()
+        )
+    # valueRanges come back in request order
+    return {
+        sheet_range.name: value_range.get("values", [])
+        for sheet_range, value_range in zip(ranges, response.get("valueRanges", []))
+    }
 
-    if not raw_table:
-        print("No data found in the spreadsheet")
-        return []
 
-    # Some sad hard-coding...
-    asset_cols = slice(0, 4)
-    liability_cols = slice(4, 7)
+def parse_raw_table(
+    raw_table: list[list[str]],
+    record_date: datetime.date,
+    asset_cols: slice | None = slice(0, 4),
+    liability_cols: slice | None = slice(4, 7),
+) -> list[Record]:
+    """Parse the asset and liability sections of a pulled range into records."""
     # The first row is just the headings: "Assets" & "Liabilities"
     raw_table = raw_table[1:]
 
-    today = datetime.date.today()
-
     # Parse records from each section
-    asset_records = parse_records_from_table(
-        raw_table, asset_cols, RecordType.ASSET, today
-    )
-    liability_records = parse_records_from_table(
-        raw_table, liability_cols, RecordType.LIABILITY, today
+    records = []
+    if asset_cols is not None:
+        records += parse_records_from_table(
+            raw_table, asset_cols, RecordType.ASSET, record_date
+        )
+    if liability_cols is not None:
+        records += parse_records_from_table(
+            raw_table, liability_cols, RecordType.LIABILITY, record_date
+        )
+
+    return records
+
+
+def _parse_range(
+    args: tuple[SheetRange, list[list[str]], datetime.date],
+) -> list[Record]:
+    sheet_range, raw_table, record_date = args
+    return parse_raw_table(
+        raw_table, record_date, sheet_range.asset_cols, sheet_range.liability_cols
     )
 
-    return asset_records + liability_records
 
+def parse_raw_tables(
+    tables: dict[str, list[list[str]]],
+    record_date: datetime.date,
+    ranges: list[SheetRange] | None = None,
+    executor: Executor | None = None,
+) -> list[Record]:
+    """Parse every pulled range and concatenate the records in range order.
 
-def fetch_and_save() -> int:
+    Ranges are independent, so they are parsed with ``executor.map`` when an
+    executor is given (a process pool for large tables), else in-process.
     """
-    Fetch data from Google Sheets and save to the database.
+    if ranges is None:
+        ranges = get_sheet_config().ranges
+    jobs = [(r, tables.get(r.name, []), record_date) for r in ranges]
+    mapper = executor.map if executor is not None else map
+    with phase("parse"):
+        return [record for records in mapper(_parse_range, jobs) for record in records]
 
-    Returns the number of records saved.
+
+def normalize_table(raw_table: list[list[str]]) -> list[list[str]]:
+    """Strip whitespace from cells and drop trailing blank cells and rows.
+
+    Edits that don't change what the sheet shows (padding, emptied trailing
+    cells) therefore don't change the table's fingerprint.
     """
-    all_records = fetch_records()
+    rows = []
+    for row in raw_table:
+        cells = [str(cell).strip() for cell in row]
+        while cells and not cells[-1]:
+            cells.pop()
+        rows.append(cells)
+    while rows and not rows[-1]:
+        rows.pop()
+    return rows
+
+
+def tables_fingerprint(tables: dict[str, list[list[str]]]) -> str:
+    """Hash the normalized contents of every pulled range."""
+    normalized = [[name, normalize_table(table)] for name, table in tables.items()]
+    payload = json.dumps(normalized, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def fetch_records() -> list[Record]:
+    """
+    Fetch data from Google Sheets and parse into records.
+
+    Returns the parsed records without saving to the database.
+    """
+    tables = fetch_raw_tables()
+
+    if not any(tables.values()):
+        print("No data found in the spreadsheet")
+        return []
+
+    return parse_raw_tables(tables, datetime.date.today())
+
+
+def fetch_and_save(force: bool = False) -> IngestResult:
+    """
+    Fetch data from Google Sheets and save to the database.
+
+    Only new, changed and removed rows for today's snapshot are written.
+    Parsing and writing are skipped entirely when the sheet's fingerprint
+    matches the last successful ingest, unless ``force`` is set.
 
-    if not all_records:
-        return 0
+    Each run's duration and record counts are recorded in
+    :mod:`asset_manager.metrics`.
+    """
+    start = perf_counter()
+    outcome = "error"
+    try:
+        result = _fetch_and_save(force)
+        if result.skipped:
+            outcome = "skipped"
+        else:
+            outcome = "saved" if result.records else "empty"
+        for change in ("inserted", "updated", "removed", "unchanged"):
+            INGEST_RECORDS.inc(getattr(result, change), change=change)
+        return result
+    finally:
+        INGEST_SECONDS.observe(perf_counter() - start, outcome=outcome)
+
+
+def _fetch_and_save(force: bool) -> IngestResult:
+    ingest_source = get_sheet_config().ingest_source
+    tables = fetch_raw_tables()
+
+    if not any(tables.values()):
+        print("No data found in the spreadsheet")
+        return IngestResult()
 
-    print(f"Parsed {len(all_records)} records:")
-    for record in all_records:
-        print(f"  {record.type.value}: {record.description} = ${record.amount}")
+    with phase("fingerprint"):
+        fingerprint = tables_fingerprint(tables)
 
-    # Save to database
     with get_connection_context() as conn:
-        count = insert_records(conn, all_records)
-        print(f"Saved {count} records to database")
+        with phase("db.check"):
+            unchanged = get_ingest_fingerprint(conn, ingest_source) == fingerprint
+        if unchanged and not force:
+            print("Spreadsheet unchanged since the last ingest, skipping")
+            return IngestResult(skipped=True)
+
+        all_records = parse_raw_tables(tables, datetime.date.today())
+        if not all_records:
+            return IngestResult()
+
+        print(f"Parsed {len(all_records)} records:")
+        for record in all_records:
+            print(f"  {record.type.value}: {record.description} = ${record.amount}")
+
+        # Save every range in one transaction, writing only the rows that differ
+        with phase("db.save"):
+            diff = sync_records(conn, all_records)
+            save_ingest_fingerprint(conn, ingest_source, fingerprint)
+
+    result = IngestResult(
+        records=len(all_records),
+        inserted=len(diff.new),
+        updated=len(diff.changed),
+        removed=len(diff.removed),
+        unchanged=diff.unchanged,
+    )
+    print(f"Saved {result.records} records to database ({format_counts(result)})")
+    return result
+
+
+def format_counts(result: IngestResult) -> str:
+    """Describe an ingest's per-category row counts."""
+    return (
+        f"{result.inserted} new, {result.updated} changed, "
+        f"{result.removed} removed, {result.unchanged} unchanged"
+    )
+
 
-    return count
+class DatedTab(NamedTuple):
+    """A historical snapshot tab and the date its balances are for."""
+
+    date: datetime.date
+    title: str
+
+    @property
+    def range(self) -> SheetRange:
+        """The whole tab as a range, laid out like the default sections."""
+        quoted = "'" + self.title.replace("'", "''") + "'"
+        sheet_config = get_sheet_config()
+        return SheetRange(
+            name=quoted,
+            asset_cols=sheet_config.default_asset_cols,
+            liability_cols=sheet_config.default_liability_cols,
+        )
+
+
+def tab_date(title: str) -> datetime.date | None:
+    """The snapshot date a tab title names, or None for undated tabs."""
+    for fmt in TAB_DATE_FORMATS:
+        try:
+            parsed = datetime.datetime.strptime(title.strip(), fmt).date()
+        except ValueError:
+            continue
+        if "%d" not in fmt:
+            last_day = calendar.monthrange(parsed.year, parsed.month)[1]
+            parsed = parsed.replace(day=last_day)
+        return parsed
+    return None
+
+
+def find_dated_tabs(service: Any, today: datetime.date | None = None) -> list[DatedTab]:
+    """List the spreadsheet's dated tabs up to ``today``, oldest first.
+
+    Tabs dated in the future are left out. A month-only tab for the current
+    month is dated the month's last day, and importing it early would make
+    it the latest snapshot and stop later backfills from resuming past it.
+    It is picked up once its date has passed.
+    """
+    if today is None:
+        today = datetime.date.today()
+    spreadsheet = (
+        service.spreadsheets()
+        .get(
+            spreadsheetId=get_sheet_config().sheet_id, fields="sheets.properties.title"
+        )
+        .execute()
+    )
+    tabs = []
+    for sheet in spreadsheet.get("sheets", []):
+        title = sheet["properties"]["title"]
+        snapshot_date = tab_date(title)
+        if snapshot_date is not None and snapshot_date <= today:
+            tabs.append(DatedTab(snapshot_date, title))
+    return sorted(tabs)
+
+
+def backfill(
+    force: bool = False,
+    chunk_size: int = BACKFILL_CHUNK_SIZE,
+    max_workers: int | None = None,
+) -> BackfillResult:
+    """Import every dated tab not yet backfilled, stamped with its own date.
+
+    Tabs are pulled ``chunk_size`` at a time with batchGet, parsed in a
+    process pool and bulk-loaded with COPY. Progress is saved after each
+    chunk, so an interrupted run resumes after the last completed tab;
+    ``force`` starts again from the oldest tab.
+    """
+    backfill_source = get_sheet_config().backfill_source
+    service = get_service()
+    with phase("sheets.list_tabs"):
+        tabs = find_dated_tabs(service)
+    result = BackfillResult()
+
+    with get_connection_context() as conn:
+        if not force:
+            result.resumed_after = get_backfill_progress(conn, backfill_source)
+        if result.resumed_after is not None:
+            tabs = [tab for tab in tabs if tab.date > result.resumed_after]
+        if not tabs:
+            return result
+
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            for start in range(0, len(tabs), chunk_size):
+                chunk = tabs[start : start + chunk_size]
+                ranges = [tab.range for tab in chunk]
+                print(
+                    f"Pulling {len(chunk)} tabs ({chunk[0].title} to {chunk[-1].title})"
+                )
+                tables = fetch_raw_tables(ranges, service=service)
+                jobs = [
+                    (r, tables.get(r.name, []), tab.date)
+                    for r, tab in zip(ranges, chunk)
+                ]
+                with phase("parse"):
+                    records = [
+                        record
+                        for tab_records in pool.map(_parse_range, jobs)
+                        for record in tab_records
+                    ]
+
+                with phase("db.save"):
+                    upserted = bulk_upsert_records(conn, records)
+                    # Saved after the data commits; a crash in between only
+                    # means the chunk is upserted again on the next run.
+                    save_backfill_progress(conn, backfill_source, chunk[-1].date)
+
+                result.tabs += len(chunk)
+                result.records += len(records)
+                result.inserted += upserted.inserted
+                result.updated += upserted.updated
+
+    return result
@@ -0,0 +1,228 @@
+"""Google Sheets reader built on httpx instead of googleapiclient.
+
+Authenticates as a service account with a signed JWT (the OAuth 2.0 JWT
+bearer grant) and reads cells through the REST ``values`` endpoints. It
+imports far less than googleapiclient and google-auth, and has an async
+twin for use on an event loop.
+
+SheetsHttpClient also answers the small part of the googleapiclient
+service interface that :mod:`asset_manager.sheets` uses
+(``spreadsheets().values().batchGet(...).execute()`` and
+``spreadsheets().get(...).execute()``), so either can be passed wherever a
+service is expected.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import time
+from typing import Any, NamedTuple
+
+import httpx
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+
+SHEETS_API_URL = "https://sheets.googleapis.com/v4"
+DEFAULT_TOKEN_URI = "https://oauth2.googleapis.com/token"
+JWT_BEARER_GRANT = "urn:ietf:params:oauth:grant-type:jwt-bearer"
+ASSERTION_LIFETIME = 3600  # seconds; the maximum Google accepts
+# Fetch a new access token this many seconds before the old one expires
+TOKEN_REFRESH_MARGIN = 60
+
+
+class ServiceAccount(NamedTuple):
+    """The fields of a service-account key file needed to get tokens."""
+
+    client_email: str
+    private_key: str
+    token_uri: str = DEFAULT_TOKEN_URI
+
+    @classmethod
+    def from_file(cls, path: str) -> ServiceAccount:
+        with open(path) as f:
+            info = json.load(f)
+        return cls(
+            client_email=info["client_email"],
+            private_key=info["private_key"],
+            token_uri=info.get("token_uri", DEFAULT_TOKEN_URI),
+        )
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def make_assertion(
+    account: ServiceAccount, scopes: list[str], now: float | None = None
+) -> str:
+    """Build the RS256-signed JWT exchanged for an access token."""
+    issued_at = int(time.time() if now is None else now)
+    header = {"alg": "RS256", "typ": "JWT"}
+    claims = {
+        "iss": account.client_email,
+        "scope": " ".join(scopes),
+        "aud": account.token_uri,
+        "iat": issued_at,
+        "exp": issued_at + ASSERTION_LIFETIME,
+    }
+    signing_input = ".".join(
+        _b64url(json.dumps(part, separators=(",", ":")).encode())
+        for part in (header, claims)
+    )
+    key = serialization.load_pem_private_key(account.private_key.encode(), None)
+    if not isinstance(key, rsa.RSAPrivateKey):
+        raise ValueError(
+            f"Service account key for {account.client_email} is not an RSA key"
+        )
+    signature = key.sign(signing_input.encode(), padding.PKCS1v15(), hashes.SHA256())
+    return f"{signing_input}.{_b64url(signature)}"
+
+
+class _AccessToken(NamedTuple):
+    value: str
+    expires_at: float
+
+    @classmethod
+    def from_response(cls, response: httpx.Response) -> _AccessToken:
+        response.raise_for_status()
+        body = response.json()
+        return cls(body["access_token"], time.time() + body.get("expires_in", 3600))
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at - TOKEN_REFRESH_MARGIN
+
+
+class _Call:
+    """A deferred call, standing in for a googleapiclient HttpRequest."""
+
+    def __init__(self, fn, *args) -> None:
+        self._fn = fn
+        self._args = args
+
+    def execute(self) -> dict[str, Any]:
+        return self._fn(*self._args)
+
+
+class _BaseClient:
+    def __init__(
+        self,
+        account: ServiceAccount,
+        scopes: list[str],
+        api_url: str = SHEETS_API_URL,
+    ) -> None:
+        self.account = account
+        self.scopes = scopes
+        self.api_url = api_url.rstrip("/")
+        self._token: _AccessToken | None = None
+
+    def _token_form(self) -> dict[str, str]:
+        return {
+            "grant_type": JWT_BEARER_GRANT,
+            "assertion": make_assertion(self.account, self.scopes),
+        }
+
+    def _batch_get_request(
+        self, spreadsheet_id: str, ranges: list[str]
+    ) -> tuple[str, list[tuple[str, str]]]:
+        url = f"{self.api_url}/spreadsheets/{spreadsheet_id}/values:batchGet"
+        return url, [("ranges", r) for r in ranges]
+
+    def _spreadsheet_request(
+        self, spreadsheet_id: str, fields: str | None
+    ) -> tuple[str, dict[str, str]]:
+        url = f"{self.api_url}/spreadsheets/{spreadsheet_id}"
+        return url, {"fields": fields} if fields else {}
+
+
+class SheetsHttpClient(_BaseClient):
+    """Synchronous Sheets reader. Reuses one HTTP connection pool and token."""
+
+    def __init__(
+        self,
+        account: ServiceAccount,
+        scopes: list[str],
+        api_url: str = SHEETS_API_URL,
+        http: httpx.Client | None = None,
+    ) -> None:
+        super().__init__(account, scopes, api_url)
+        self.http = http or httpx.Client(timeout=30.0)
+
+    def access_token(self) -> str:
+        if self._token is None or not self._token.fresh:
+            response = self.http.post(self.account.token_uri, data=self._token_form())
+            self._token = _AccessToken.from_response(response)
+        return self._token.value
+
+    def _get(self, url: str, params) -> dict[str, Any]:
+        headers = {"Authorization": f"Bearer {self.access_token()}"}
+        response = self.http.get(url, params=params, headers=headers)
+        response.raise_for_status()
+        return response.json()
+
+    def batch_get_values(self, spreadsheet_id: str, ranges: list[str]) -> dict:
+        """``spreadsheets.values.batchGet``: the cells of several ranges."""
+        return self._get(*self._batch_get_request(spreadsheet_id, ranges))
+
+    def get_spreadsheet(self, spreadsheet_id: str, fields: str | None = None) -> dict:
+        """``spreadsheets.get``: spreadsheet metadata, such as tab titles."""
+        return self._get(*self._spreadsheet_request(spreadsheet_id, fields))
+
+    def close(self) -> None:
+        self.http.close()
+
+    # googleapiclient-compatible interface
+
+    def spreadsheets(self) -> SheetsHttpClient:
+        return self
+
+    def values(self) -> SheetsHttpClient:
+        return self
+
+    def batchGet(self, spreadsheetId: str, ranges: list[str]) -> _Call:
+        return _Call(self.batch_get_values, spreadsheetId, ranges)
+
+    def get(self, spreadsheetId: str, fields: str | None = None) -> _Call:
+        return _Call(self.get_spreadsheet, spreadsheetId, fields)
+
+
+class AsyncSheetsHttpClient(_BaseClient):
+    """Async counterpart of SheetsHttpClient, for use on an event loop."""
+
+    def __init__(
+        self,
+        account: ServiceAccount,
+        scopes: list[str],
+        api_url: str = SHEETS_API_URL,
+        http: httpx.AsyncClient | None = None,
+    ) -> None:
+        super().__init__(account, scopes, api_url)
+        self.http = http or httpx.AsyncClient(timeout=30.0)
+
+    async def access_token(self) -> str:
+        if self._token is None or not self._token.fresh:
+            response = await self.http.post(
+                self.account.token_uri, data=self._token_form()
+            )
+            self._token = _AccessToken.from_response(response)
+        return self._token.value
+
+    async def _get(self, url: str, params) -> dict[str, Any]:
+        headers = {"Authorization": f"Bearer {await self.access_token()}"}
+        response = await self.http.get(url, params=params, headers=headers)
+        response.raise_for_status()
+        return response.json()
+
+    async def batch_get_values(self, spreadsheet_id: str, ranges: list[str]) -> dict:
+        """``spreadsheets.values.batchGet``: the cells of several ranges."""
+        return await self._get(*self._batch_get_request(spreadsheet_id, ranges))
+
+    async def get_spreadsheet(
+        self, spreadsheet_id: str, fields: str | None = None
+    ) -> dict:
+        """``spreadsheets.get``: spreadsheet metadata, such as tab titles."""
+        return await self._get(*self._spreadsheet_request(spreadsheet_id, fields))
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
@@ -0,0 +1,129 @@
+"""Lightweight wall-clock timing of named phases.
+
+Code marks its phases with ``with phase("name"):``. That is a no-op unless a
+caller is collecting, so instrumented functions need no extra arguments::
+
+    with collect() as timings:
+        fetch_and_save()
+    print(timings.format())
+
+Whole functions, sync or async, can be timed with ``@timed("name")``.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, TypeVar, cast
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class PhaseTimings:
+    """Total seconds spent in each phase, in the order phases first ran."""
+
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def milliseconds(self) -> dict[str, float]:
+        """Each phase's total, in milliseconds rounded to 0.1."""
+        return {name: round(seconds * 1000, 1) for name, seconds in self.phases.items()}
+
+    def format(self) -> str:
+        """One ``name  12.3 ms`` line per phase."""
+        width = max((len(name) for name in self.phases), default=0)
+        return "\n".join(
+            f"{name:<{width}}  {seconds * 1000:8.1f} ms"
+            for name, seconds in self.phases.items()
+        )
+
+
+_current: ContextVar[PhaseTimings | None] = ContextVar("phase_timings", default=None)
+
+
+@contextmanager
+def collect() -> Iterator[PhaseTimings]:
+    """Collect the phases timed inside this block."""
+    timings = PhaseTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time this block as ``name`` if a collector is active."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, perf_counter() - start)
+
+
+def instrument(
+    fn: F,
+    around: Callable[[], AbstractContextManager[Any] | None],
+    on_result: Callable[[Any], None] | None = None,
+) -> F:
+    """Wrap a sync or async function so each call runs inside ``around()``.
+
+    ``around`` may return None to call ``fn`` directly. ``on_result``, if
+    given, is passed each return value once the block has exited.
+    """
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            context = around()
+            if context is None:
+                result = await fn(*args, **kwargs)
+            else:
+                with context:
+                    result = await fn(*args, **kwargs)
+            if on_result is not None:
+                on_result(result)
+            return result
+
+        return cast(F, async_wrapper)
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        context = around()
+        if context is None:
+            result = fn(*args, **kwargs)
+        else:
+            with context:
+                result = fn(*args, **kwargs)
+        if on_result is not None:
+            on_result(result)
+        return result
+
+    return cast(F, wrapper)
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Decorator that times every call of a function as phase ``name``.
+
+    When nothing is collecting, the only cost is one context variable read.
+    """
+
+    def around() -> AbstractContextManager[None] | None:
+        return None if _current.get() is None else phase(name)
+
+    def decorate(fn: F) -> F:
+        return instrument(fn, around)
+
+    return decorate
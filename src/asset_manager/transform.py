@@ -0,0 +1,135 @@
+"""Chart-ready series from snapshot records, without Plotly.
+
+Shared by the HTML report and the web dashboard. Kept apart from
+:mod:`asset_manager.report` so the dashboard can build its data without
+importing Plotly, which only server-rendered charts need.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+
+from .frame import RecordFrame, from_cents
+from .models import Record, RecordType
+
+
+def _transform_data(
+    records: Iterable[Record] | RecordFrame,
+) -> tuple[
+    dict[str, list[tuple[date, Decimal]]],
+    dict[str, list[tuple[date, Decimal]]],
+    list[tuple[date, Decimal, Decimal, Decimal]],
+]:
+    """Transform records into data structures for charting.
+
+    ``records`` is consumed in a single pass, so it may be a stream such as
+    ``repository.iter_records()``; only the output structures are kept.
+
+    Returns:
+        - assets_by_item: {description: [(date, amount), ...]}
+        - liabilities_by_item: {description: [(date, amount), ...]}
+        - summary: [(date, total_assets, total_liabilities, net_worth), ...]
+    """
+    if isinstance(records, RecordFrame):
+        return _transform_frame(records)
+
+    assets_by_item: dict[str, list[tuple[date, Decimal]]] = defaultdict(list)
+    liabilities_by_item: dict[str, list[tuple[date, Decimal]]] = defaultdict(list)
+
+    # Group records by date for summary calculation
+    by_date: dict[date, dict[str, Decimal]] = defaultdict(
+        lambda: {"assets": Decimal("0"), "liabilities": Decimal("0")}
+    )
+
+    for record in records:
+        if record.type == RecordType.ASSET:
+            assets_by_item[record.description].append((record.date, record.amount))
+            by_date[record.date]["assets"] += record.amount
+        else:
+            liabilities_by_item[record.description].append((record.date, record.amount))
+            by_date[record.date]["liabilities"] += record.amount
+
+    # Sort each series by date
+    for series in assets_by_item.values():
+        series.sort(key=lambda x: x[0])
+    for series in liabilities_by_item.values():
+        series.sort(key=lambda x: x[0])
+
+    # Build summary data
+    summary = [
+        (
+            d,
+            totals["assets"],
+            totals["liabilities"],
+            totals["assets"] - totals["liabilities"],
+        )
+        for d, totals in sorted(by_date.items())
+    ]
+
+    return dict(assets_by_item), dict(liabilities_by_item), summary
+
+
+def _transform_frame(
+    frame: RecordFrame,
+) -> tuple[
+    dict[str, list[tuple[date, Decimal]]],
+    dict[str, list[tuple[date, Decimal]]],
+    list[tuple[date, Decimal, Decimal, Decimal]],
+]:
+    """_transform_data for a RecordFrame, vectorized over integer cents.
+
+    Dates are factorized to dense integer codes and summed per type with
+    ``np.add.at``; per-item series come from one stable sort on
+    (type, description). Only the final output points are converted
+    back to ``date`` and ``Decimal``.
+    """
+    if not frame:
+        return {}, {}, []
+
+    ordinals = np.frombuffer(frame.date_ordinals, dtype=np.intc)
+    type_codes = np.frombuffer(frame.type_codes, dtype=np.int8)
+    description_ids = np.frombuffer(frame.description_ids, dtype=np.intc)
+    cents = np.frombuffer(frame.amount_cents, dtype=np.int64)
+
+    unique_ordinals, date_codes = np.unique(ordinals, return_inverse=True)
+    dates = [date.fromordinal(ordinal) for ordinal in unique_ordinals.tolist()]
+
+    # Row i of totals holds the per-date sum for type code i
+    totals = np.zeros((2, len(unique_ordinals)), dtype=np.int64)
+    np.add.at(totals, (type_codes, date_codes), cents)
+    summary = [
+        (dates[i], from_cents(assets), from_cents(liabilities), from_cents(net))
+        for i, (assets, liabilities, net) in enumerate(
+            zip(*totals.tolist(), (totals[0] - totals[1]).tolist())
+        )
+    ]
+
+    # Group rows by (type, description) item. lexsort is stable, so
+    # same-date points keep their input order.
+    n_descriptions = len(frame.descriptions)
+    item_keys = type_codes.astype(np.int64) * n_descriptions + description_ids
+    order = np.lexsort((date_codes, item_keys))
+    sorted_keys = item_keys[order]
+    starts = np.flatnonzero(np.diff(sorted_keys, prepend=-1))
+    ends = np.append(starts[1:], len(order))
+    # Emit items in first-seen order, as the record list implementation does
+    first_rows = np.minimum.reduceat(order, starts)
+    point_dates = date_codes[order].tolist()
+    point_cents = cents[order].tolist()
+
+    by_type: tuple[dict[str, list[tuple[date, Decimal]]], ...] = ({}, {})
+    for group in np.argsort(first_rows).tolist():
+        start, end = int(starts[group]), int(ends[group])
+        type_code, description_id = divmod(int(sorted_keys[start]), n_descriptions)
+        by_type[type_code][frame.descriptions[description_id]] = [
+            (dates[point_dates[k]], from_cents(point_cents[k]))
+            for k in range(start, end)
+        ]
+
+    assets_by_item, liabilities_by_item = by_type
+    return assets_by_item, liabilities_by_item, summary
@@ -2,18 +2,33 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import importlib
+import json
 import logging
+import os
+from collections.abc import AsyncIterator, Awaitable
+from contextlib import AsyncExitStack, asynccontextmanager, suppress
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
 from importlib import resources
+from time import perf_counter
+from typing import Any, NamedTuple
 
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, Response
 from fastapi.templating import Jinja2Templates
+from psycopg import AsyncConnection
+from starlette.middleware.gzip import GZipMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
-from asset_manager.db import get_connection_context
-from asset_manager.models import RecordType
-from asset_manager.report import _transform_data
-from asset_manager.repository import get_all_records, get_latest_snapshot_records
+from asset_manager import __version__, async_repository, metrics, timing
+from asset_manager.cache import RenderCache
+from asset_manager.config import get_settings
+from asset_manager.db import create_async_pool
+from asset_manager.models import DailyTotals, DataVersion, RecordType
+from asset_manager.transform import _transform_data
 
 from .auth import (
     get_oauth,
@@ -23,10 +38,77 @@ from .auth import (
     handle_login,
     handle_logout,
 )
+from .request_metrics import RequestMetricsMiddleware
+from .server_timing import ServerTimingMiddleware
+from .static import IMMUTABLE_CACHE_CONTROL, plotly_bundle, static_assets
+from .workers import RenderWorkerPool, WorkerPoolSaturated
 
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Asset Dashboard", docs_url=None, redoc_url=None)
+
+class DashboardRender(NamedTuple):
+    """Everything the dashboard template needs that is derived from records."""
+
+    charts: dict[str, str]
+    series: dict[str, bytes]
+    totals: dict[str, float]
+    assets_breakdown: dict[str, float]
+    liabilities_breakdown: dict[str, float]
+    record_count: int
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Open the database connection pool for the lifetime of the app.
+
+    The startup warm-up runs in the background so /health answers at once;
+    /ready reports 503 until it has finished. With ``METRICS_PORT`` set,
+    metrics are served on that port for as long.
+    """
+    settings = get_settings()
+    app.state.render_cache = RenderCache[DataVersion, DashboardRender](
+        maxsize=settings.render_cache_size
+    )
+    app.state.render_workers = RenderWorkerPool(
+        max_workers=settings.render_workers,
+        queue_limit=settings.render_queue_limit,
+    )
+    app.state.renders_in_flight = {}
+    # Build the Plotly.js bundle (hashing and compressing a few MB) before
+    # serving, so the dashboard template never does it on the event loop
+    await asyncio.to_thread(plotly_bundle)
+    pool = create_async_pool()
+    # Don't wait for the pool to fill: the app should come up (and /health
+    # should answer) even if the database is briefly unreachable.
+    await pool.open(wait=False)
+    app.state.db_pool = pool
+    app.state.ready = False
+    app.state.startup_timings = timing.PhaseTimings()
+    metrics_server = None
+    if settings.metrics_port is not None:
+        metrics_server = metrics.start_http_server(settings.metrics_port)
+    app.state.metrics_server = metrics_server
+    warm_up_task = None
+    if settings.startup_warm_up:
+        warm_up_task = asyncio.create_task(warm_up(app))
+    else:
+        app.state.ready = True
+    try:
+        yield
+    finally:
+        if warm_up_task is not None:
+            warm_up_task.cancel()
+            # Let it unwind before the pool it may be using closes
+            with suppress(asyncio.CancelledError):
+                await warm_up_task
+        await pool.close()
+        app.state.render_workers.shutdown()
+        if metrics_server is not None:
+            await asyncio.to_thread(metrics_server.shutdown)
+            metrics_server.server_close()
+
+
+app = FastAPI(title="Asset Dashboard", docs_url=None, redoc_url=None, lifespan=lifespan)
 
 # Add session middleware for OAuth state
 app.add_middleware(
@@ -35,10 +117,30 @@ app.add_middleware(
     session_cookie="oauth_session",
     max_age=600,  # 10 minutes for OAuth flow
 )
+# Compress HTML and JSON on the fly; static assets arrive precompressed and
+# are passed through untouched
+app.add_middleware(GZipMiddleware, minimum_size=500)
+# Outermost, so their timings cover everything else
+app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(RequestMetricsMiddleware)
 
 # Set up templates
 templates_path = resources.files("asset_manager.web").joinpath("templates")
-templates = Jinja2Templates(directory=str(templates_path))
+
+
+def plotly_js_url() -> str:
+    """URL of the self-hosted Plotly.js bundle, for the dashboard template."""
+    return plotly_bundle().url
+
+
+def _template_helpers(request: Request) -> dict[str, Any]:
+    # The bundle is built in lifespan, so this is only a cache lookup
+    return {"plotly_js_url": plotly_js_url}
+
+
+templates = Jinja2Templates(
+    directory=str(templates_path), context_processors=[_template_helpers]
+)
 
 # OAuth client (lazy initialization)
 _oauth = None
@@ -52,54 +154,74 @@ def get_oauth_client():
     return _oauth
 
 
-def _build_chart_html(
-    records,
-) -> tuple[dict[str, str], dict[str, float], dict[str, float], dict[str, float]]:
-    """Build Plotly chart HTML snippets for embedding.
+@asynccontextmanager
+async def _connection(app: FastAPI) -> AsyncIterator[AsyncConnection]:
+    """Borrow a pooled connection, timing the wait for it as ``db.connect``."""
+    async with AsyncExitStack() as stack:
+        with timing.phase("db.connect"), metrics.DB_CONNECTION_ACQUIRE_SECONDS.time():
+            conn = await stack.enter_async_context(app.state.db_pool.connection())
+        yield conn
 
-    Returns:
-        Tuple of (charts dict, totals dict, assets_breakdown dict, liabilities_breakdown dict)
-        - charts: HTML snippets for each chart
-        - totals: current net_worth, assets, liabilities
-        - assets_breakdown: description -> latest amount for each asset
-        - liabilities_breakdown: description -> latest amount for each liability
-    """
-    import plotly.graph_objects as go
-
-    assets_data, liabilities_data, summary_data = _transform_data(records)
-
-    charts = {}
-    totals = {"net_worth": 0.0, "assets": 0.0, "liabilities": 0.0}
 
-    # Dark theme layout defaults
-    dark_layout = {
+def _chart_layout(title: str, height: int) -> dict[str, Any]:
+    """Dark-theme Plotly layout, in a form both plotly.py and Plotly.js accept."""
+    axis = {"gridcolor": "rgba(46,51,64,0.6)", "linecolor": "#2e3340"}
+    return {
         "paper_bgcolor": "rgba(0,0,0,0)",
         "plot_bgcolor": "rgba(0,0,0,0)",
         "font": {"color": "#918c86", "family": "DM Sans, sans-serif"},
-        "title_font": {
-            "color": "#e8e4df",
-            "family": "DM Serif Display, Georgia, serif",
-            "size": 16,
+        "title": {
+            "text": title,
+            "font": {
+                "color": "#e8e4df",
+                "family": "DM Serif Display, Georgia, serif",
+                "size": 16,
+            },
         },
         "xaxis": {
-            "gridcolor": "rgba(46,51,64,0.6)",
-            "linecolor": "#2e3340",
+            **axis,
             "tickfont": {"color": "#5f5b56"},
-            "title_font": {"color": "#918c86"},
+            "title": {"text": "Date", "font": {"color": "#918c86"}},
         },
         "yaxis": {
-            "gridcolor": "rgba(46,51,64,0.6)",
-            "linecolor": "#2e3340",
+            **axis,
             "tickfont": {"color": "#5f5b56", "family": "JetBrains Mono, monospace"},
-            "title_font": {"color": "#918c86"},
+            "title": {"text": "Amount ($)", "font": {"color": "#918c86"}},
+            "tickprefix": "$",
+            "tickformat": ",.0f",
         },
         "hoverlabel": {
             "bgcolor": "#22262e",
             "bordercolor": "#3a3f4a",
             "font": {"color": "#e8e4df", "family": "DM Sans, sans-serif"},
         },
+        "hovermode": "x unified",
+        "showlegend": False,
+        "height": height,
+        "margin": {"t": 40, "b": 40, "l": 60, "r": 20},
     }
 
+
+# Shared by the server-rendered charts and the client-side renderer
+CHART_LAYOUTS = {
+    "assets": _chart_layout("Assets over Time", 300),
+    "liabilities": _chart_layout("Liabilities over Time", 300),
+    "summary": _chart_layout("Net Worth over Time", 400),
+}
+SUMMARY_LINE_STYLES = {
+    "Total Assets": {"color": "rgba(106, 173, 122, 0.5)"},
+    "Total Liabilities": {"color": "rgba(199, 92, 92, 0.5)"},
+    "Net Worth": {"color": "#c9a55a", "width": 3},
+}
+SERIES_KINDS = tuple(CHART_LAYOUTS)
+
+
+def _latest_values(
+    assets_data, liabilities_data, summary_data
+) -> tuple[dict[str, float], dict[str, float], dict[str, float]]:
+    """Get the current totals and per-item breakdowns from transformed data."""
+    totals = {"net_worth": 0.0, "assets": 0.0, "liabilities": 0.0}
+
     # Extract latest value for each asset/liability for breakdown display
     assets_breakdown = {}
     for description, series in sorted(assets_data.items()):
@@ -112,107 +234,337 @@ def _build_chart_html(
         if series:
             liabilities_breakdown[description] = float(series[-1][1])
 
-    # Assets chart
-    fig_assets = go.Figure()
-    for description, series in sorted(assets_data.items()):
-        dates = [point[0] for point in series]
-        amounts = [float(point[1]) for point in series]
-        fig_assets.add_trace(
-            go.Scatter(x=dates, y=amounts, name=description, mode="lines")
-        )
-    fig_assets.update_layout(
-        **dark_layout,
-        title="Assets over Time",
-        xaxis_title="Date",
-        yaxis_title="Amount ($)",
-        yaxis_tickprefix="$",
-        yaxis_tickformat=",.0f",
-        hovermode="x unified",
-        showlegend=False,
-        height=300,
-        margin={"t": 40, "b": 40, "l": 60, "r": 20},
-    )
-    charts["assets"] = fig_assets.to_html(full_html=False, include_plotlyjs=False)
+    if summary_data:
+        _, total_assets, total_liabilities, net_worth = summary_data[-1]
+        totals["assets"] = float(total_assets)
+        totals["liabilities"] = float(total_liabilities)
+        totals["net_worth"] = float(net_worth)
 
-    # Liabilities chart
-    fig_liabilities = go.Figure()
-    for description, series in sorted(liabilities_data.items()):
-        dates = [point[0] for point in series]
-        amounts = [float(point[1]) for point in series]
-        fig_liabilities.add_trace(
-            go.Scatter(x=dates, y=amounts, name=description, mode="lines")
-        )
-    fig_liabilities.update_layout(
-        **dark_layout,
-        title="Liabilities over Time",
-        xaxis_title="Date",
-        yaxis_title="Amount ($)",
-        yaxis_tickprefix="$",
-        yaxis_tickformat=",.0f",
-        hovermode="x unified",
-        showlegend=False,
-        height=300,
-        margin={"t": 40, "b": 40, "l": 60, "r": 20},
-    )
-    charts["liabilities"] = fig_liabilities.to_html(
-        full_html=False, include_plotlyjs=False
+    return totals, assets_breakdown, liabilities_breakdown
+
+
+def _build_chart_html(
+    records,
+) -> tuple[dict[str, str], dict[str, float], dict[str, float], dict[str, float]]:
+    """Build Plotly chart HTML snippets for embedding.
+
+    Returns:
+        Tuple of (charts dict, totals dict, assets_breakdown dict, liabilities_breakdown dict)
+        - charts: HTML snippets for each chart
+        - totals: current net_worth, assets, liabilities
+        - assets_breakdown: description -> latest amount for each asset
+        - liabilities_breakdown: description -> latest amount for each liability
+    """
+    transformed = _transform_data(records)
+    return (_chart_html_from_data(*transformed), *_latest_values(*transformed))
+
+
+def _chart_html_from_data(
+    assets_data, liabilities_data, summary_data
+) -> dict[str, str]:
+    """Build the three Plotly chart HTML snippets from transformed data."""
+    import plotly.graph_objects as go
+
+    with timing.phase("charts.figures"):
+        figures = {}
+
+        # Assets chart
+        fig_assets = go.Figure()
+        for description, series in sorted(assets_data.items()):
+            dates = [point[0] for point in series]
+            amounts = [float(point[1]) for point in series]
+            fig_assets.add_trace(
+                go.Scatter(x=dates, y=amounts, name=description, mode="lines")
+            )
+        fig_assets.update_layout(CHART_LAYOUTS["assets"])
+        figures["assets"] = fig_assets
+
+        # Liabilities chart
+        fig_liabilities = go.Figure()
+        for description, series in sorted(liabilities_data.items()):
+            dates = [point[0] for point in series]
+            amounts = [float(point[1]) for point in series]
+            fig_liabilities.add_trace(
+                go.Scatter(x=dates, y=amounts, name=description, mode="lines")
+            )
+        fig_liabilities.update_layout(CHART_LAYOUTS["liabilities"])
+        figures["liabilities"] = fig_liabilities
+
+        # Summary chart (Net Worth over Time)
+        fig_summary = go.Figure()
+        if summary_data:
+            dates = [point[0] for point in summary_data]
+            columns = {
+                "Total Assets": [float(point[1]) for point in summary_data],
+                "Total Liabilities": [float(point[2]) for point in summary_data],
+                "Net Worth": [float(point[3]) for point in summary_data],
+            }
+            for name, values in columns.items():
+                fig_summary.add_trace(
+                    go.Scatter(
+                        x=dates,
+                        y=values,
+                        name=name,
+                        mode="lines",
+                        line=SUMMARY_LINE_STYLES[name],
+                    )
+                )
+        fig_summary.update_layout(CHART_LAYOUTS["summary"])
+        figures["summary"] = fig_summary
+
+    with timing.phase("charts.to_html"):
+        return {
+            kind: fig.to_html(full_html=False, include_plotlyjs=False)
+            for kind, fig in figures.items()
+        }
+
+
+def _columnar_series(by_item) -> dict[str, Any]:
+    """Align per-item series on one shared date axis.
+
+    Dates are stored once; each item gets one value per date, with ``None``
+    where the item has no snapshot on that date.
+    """
+    dates = sorted({point[0] for series in by_item.values() for point in series})
+    index = {d: i for i, d in enumerate(dates)}
+    columns = {}
+    for description, series in sorted(by_item.items()):
+        values: list[float | None] = [None] * len(dates)
+        for point_date, amount in series:
+            values[index[point_date]] = float(amount)
+        columns[description] = values
+    return {"dates": [d.isoformat() for d in dates], "series": columns}
+
+
+def _build_series_json(assets_data, liabilities_data, summary_data) -> dict[str, bytes]:
+    """Serialize each chart's data as compact columnar JSON."""
+    payloads = {
+        "assets": _columnar_series(assets_data),
+        "liabilities": _columnar_series(liabilities_data),
+        "summary": {
+            "dates": [point[0].isoformat() for point in summary_data],
+            "series": {
+                "Total Assets": [float(point[1]) for point in summary_data],
+                "Total Liabilities": [float(point[2]) for point in summary_data],
+                "Net Worth": [float(point[3]) for point in summary_data],
+            },
+        },
+    }
+    return {
+        kind: json.dumps(payload, separators=(",", ":")).encode()
+        for kind, payload in payloads.items()
+    }
+
+
+def _render_dashboard(
+    records, daily_totals: list[DailyTotals], chart_mode: str = "client"
+) -> DashboardRender:
+    """Build the cacheable part of the dashboard from all records.
+
+    The net-worth summary comes straight from the daily_totals rollup rather
+    than being re-aggregated from records. Series JSON is always built (it
+    backs the /api/series endpoints). Chart HTML is only built server-side
+    when ``chart_mode`` is ``"server"``; otherwise the browser renders the
+    series with Plotly.js.
+    """
+    start = perf_counter()
+    with timing.phase("transform"):
+        assets_data, liabilities_data, _ = _transform_data(records)
+    summary_data = [
+        (t.date, t.total_assets, t.total_liabilities, t.net_worth) for t in daily_totals
+    ]
+    transformed = (assets_data, liabilities_data, summary_data)
+    totals, assets_breakdown, liabilities_breakdown = _latest_values(*transformed)
+    charts = _chart_html_from_data(*transformed) if chart_mode == "server" else {}
+    with timing.phase("series_json"):
+        series = _build_series_json(*transformed)
+    metrics.CHART_BUILD_SECONDS.observe(perf_counter() - start, mode=chart_mode)
+    return DashboardRender(
+        charts=charts,
+        series=series,
+        totals=totals,
+        assets_breakdown=assets_breakdown,
+        liabilities_breakdown=liabilities_breakdown,
+        record_count=len(records),
     )
 
-    # Summary chart (Net Worth over Time)
-    fig_summary = go.Figure()
-    if summary_data:
-        dates = [point[0] for point in summary_data]
-        total_assets = [float(point[1]) for point in summary_data]
-        total_liabilities = [float(point[2]) for point in summary_data]
-        net_worth = [float(point[3]) for point in summary_data]
-
-        # Get latest totals for summary cards
-        totals["assets"] = total_assets[-1] if total_assets else 0.0
-        totals["liabilities"] = total_liabilities[-1] if total_liabilities else 0.0
-        totals["net_worth"] = net_worth[-1] if net_worth else 0.0
-
-        fig_summary.add_trace(
-            go.Scatter(
-                x=dates,
-                y=total_assets,
-                name="Total Assets",
-                mode="lines",
-                line={"color": "rgba(106, 173, 122, 0.5)"},
+
+async def _load_dashboard_render(
+    app: FastAPI, version: DataVersion | None = None
+) -> tuple[DataVersion, DashboardRender]:
+    """Get the rendered dashboard data for the current data version.
+
+    Pass ``version`` if the caller already has it. Then a cached render
+    needs no connection at all; otherwise only the cheap version query runs.
+    Concurrent misses for one version share a single render. Raises
+    WorkerPoolSaturated if a render is needed but the pool is full.
+    """
+    if version is None:
+        async with _connection(app) as conn:
+            version = await async_repository.get_data_version(conn)
+    render = app.state.render_cache.get(version)
+    if render is not None:
+        return version, render
+
+    in_flight = app.state.renders_in_flight
+    task = in_flight.get(version)
+    if task is None:
+        task = asyncio.create_task(_render_version(app, version))
+        in_flight[version] = task
+        task.add_done_callback(lambda _: in_flight.pop(version, None))
+    # Shielded: one waiter going away mustn't cancel the render for the rest
+    return version, await asyncio.shield(task)
+
+
+async def _render_version(app: FastAPI, version: DataVersion) -> DashboardRender:
+    """Load the data at ``version``, render it and cache the result."""
+    cache = app.state.render_cache
+    generation = cache.generation
+    # Claim a worker before borrowing a connection, so a saturated pool
+    # turns requests away without running the record queries first
+    with app.state.render_workers.reserve() as slot:
+        async with _connection(app) as conn:
+            records = await async_repository.get_record_frame(
+                conn, itersize=get_settings().db_itersize
             )
-        )
-        fig_summary.add_trace(
-            go.Scatter(
-                x=dates,
-                y=total_liabilities,
-                name="Total Liabilities",
-                mode="lines",
-                line={"color": "rgba(199, 92, 92, 0.5)"},
+            daily_totals = await async_repository.get_daily_totals(conn)
+
+        # Chart building is CPU-bound; keep it off the event loop so other
+        # requests (including /health) are served while it runs.
+        chart_mode = get_settings().dashboard_charts
+        with timing.phase("render"):
+            render = await slot.run(
+                _render_dashboard, records, daily_totals, chart_mode
             )
-        )
-        fig_summary.add_trace(
-            go.Scatter(
-                x=dates,
-                y=net_worth,
-                name="Net Worth",
-                mode="lines",
-                line={"color": "#c9a55a", "width": 3},
+    cache.put(version, render, generation=generation)
+    return render
+
+
+def _import_chart_libraries(chart_mode: str) -> None:
+    # Plotly takes seconds to import; only server-rendered charts need it
+    if chart_mode == "server":
+        importlib.import_module("plotly.graph_objects")
+
+
+def _compile_templates() -> None:
+    # Jinja caches each template the first time it is loaded
+    for name in templates.env.list_templates():
+        templates.env.get_template(name)
+
+
+async def _warm_phase(name: str, step: Awaitable[object]) -> None:
+    with timing.phase(name):
+        try:
+            await step
+        except Exception:
+            logger.exception("Startup phase %r failed", name)
+
+
+async def warm_up(app: FastAPI) -> None:
+    """Do the slow first-use work up front, then mark the app ready.
+
+    Imports chart libraries, compiles templates, fills the connection pool,
+    renders the dashboard for the current data into the render cache and
+    loads the IdP metadata. Each phase is timed into
+    ``app.state.startup_timings``. A failing phase is logged and skipped
+    rather than holding readiness back: an unreachable database or IdP
+    affects every replica, and keeping them all unready would only turn
+    errors into an outage.
+    """
+    settings = get_settings()
+    with timing.collect() as timings:
+        with timing.phase("total"):
+            await _warm_phase(
+                "imports",
+                asyncio.to_thread(_import_chart_libraries, settings.dashboard_charts),
             )
-        )
-    fig_summary.update_layout(
-        **dark_layout,
-        title="Net Worth over Time",
-        xaxis_title="Date",
-        yaxis_title="Amount ($)",
-        yaxis_tickprefix="$",
-        yaxis_tickformat=",.0f",
-        hovermode="x unified",
-        showlegend=False,
-        height=400,
-        margin={"t": 40, "b": 40, "l": 60, "r": 20},
+            await _warm_phase("templates", asyncio.to_thread(_compile_templates))
+            await _warm_phase(
+                "pool", app.state.db_pool.wait(timeout=settings.db_pool_timeout)
+            )
+            await _warm_phase("render_cache", _load_dashboard_render(app))
+            if os.environ.get("IDP_URL"):
+                await _warm_phase("oauth", asyncio.to_thread(get_oauth_client))
+    app.state.startup_timings = timings
+    app.state.ready = True
+    logger.info("Startup warm-up finished:\n%s", timings.format())
+
+
+def _etag(*parts: str) -> str:
+    """Strong ETag hashed from ``parts`` and the app version."""
+    key = ":".join([*parts, __version__])
+    return f'"{hashlib.sha256(key.encode()).hexdigest()[:32]}"'
+
+
+def _page_etag(page: str, version: DataVersion, user: dict[str, Any]) -> str:
+    """Strong ETag for a page of ``user``'s view of the data at ``version``.
+
+    The app version and chart mode are included because they change the
+    HTML without changing the data.
+    """
+    return _etag(
+        page,
+        str(user.get("sub", "")),
+        version.model_dump_json(),
+        get_settings().dashboard_charts,
     )
-    charts["summary"] = fig_summary.to_html(full_html=False, include_plotlyjs=False)
 
-    return charts, totals, assets_breakdown, liabilities_breakdown
+
+def _last_modified(version: DataVersion) -> datetime | None:
+    """When the data was last written, as far as the version can tell."""
+    stamps = [t for t in (version.latest_created_at, version.totals_updated_at) if t]
+    return max(stamps).astimezone(timezone.utc) if stamps else None
+
+
+def _validator_headers(etag: str, last_modified: datetime | None) -> dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    return headers
+
+
+def _not_modified(
+    request: Request, etag: str, last_modified: datetime | None = None
+) -> bool:
+    """Whether the client's cached copy is current (RFC 9110 section 13.1).
+
+    If-None-Match takes precedence; If-Modified-Since is only consulted
+    when it is absent, and compares at whole-second precision.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    return last_modified.replace(microsecond=0) <= since
+
+
+def _page_validators(
+    page: str, version: DataVersion, user: dict[str, Any]
+) -> tuple[str, datetime | None]:
+    """ETag and Last-Modified for a page showing data at ``version``."""
+    return _page_etag(page, version, user), _last_modified(version)
+
+
+async def _current_version(app: FastAPI) -> DataVersion | None:
+    """The data version, or None if the database can't be reached."""
+    try:
+        async with _connection(app) as conn:
+            return await async_repository.get_data_version(conn)
+    except Exception:
+        # Let the page's own error handling deal with the database
+        return None
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -222,10 +574,31 @@ async def dashboard(request: Request):
     if not user:
         return RedirectResponse(url="/login", status_code=302)
 
-    # Fetch data and build charts
+    # Answer a revalidation from the cheap version query alone, before
+    # anything is loaded or rendered. The version is reused below, so a
+    # cached render costs one connection checkout and one query.
+    version = await _current_version(request.app)
+    if version is not None:
+        validators = _page_validators("dashboard", version, user)
+        if _not_modified(request, *validators):
+            return Response(status_code=304, headers=_validator_headers(*validators))
+
     try:
-        with get_connection_context() as conn:
-            records = get_all_records(conn)
+        version, render = await _load_dashboard_render(request.app, version)
+    except WorkerPoolSaturated:
+        logger.warning("Render workers saturated; serving busy dashboard")
+        return templates.TemplateResponse(
+            request,
+            "dashboard.html",
+            {
+                "user": user,
+                "active_tab": "dashboard",
+                "error": "The dashboard is busy right now. Please try again shortly.",
+                "charts": {},
+            },
+            status_code=503,
+            headers={"Retry-After": "5"},
+        )
     except Exception as e:
         logger.exception("Database error in dashboard: %s", e)
         return templates.TemplateResponse(
@@ -239,26 +612,57 @@ async def dashboard(request: Request):
             },
         )
 
-    if records:
-        charts, totals, assets_breakdown, liabilities_breakdown = _build_chart_html(
-            records
+    with timing.phase("template"):
+        return templates.TemplateResponse(
+            request,
+            "dashboard.html",
+            {
+                "user": user,
+                "active_tab": "dashboard",
+                "charts": render.charts,
+                "chart_layouts": CHART_LAYOUTS,
+                "summary_line_styles": SUMMARY_LINE_STYLES,
+                "totals": render.totals,
+                "assets_breakdown": render.assets_breakdown,
+                "liabilities_breakdown": render.liabilities_breakdown,
+                "record_count": render.record_count,
+            },
+            headers=_validator_headers(*_page_validators("dashboard", version, user)),
         )
-    else:
-        charts, totals = {}, {"net_worth": 0.0, "assets": 0.0, "liabilities": 0.0}
-        assets_breakdown, liabilities_breakdown = {}, {}
-
-    return templates.TemplateResponse(
-        request,
-        "dashboard.html",
-        {
-            "user": user,
-            "active_tab": "dashboard",
-            "charts": charts,
-            "totals": totals,
-            "assets_breakdown": assets_breakdown,
-            "liabilities_breakdown": liabilities_breakdown,
-            "record_count": len(records),
-        },
+
+
+@app.get("/api/series/{kind}")
+async def series(request: Request, kind: str):
+    """Return one chart's data as compact columnar JSON.
+
+    The payload is ``{"dates": [...], "series": {name: [value, ...]}}`` with
+    one value per date for every series.
+    """
+    user = get_session_user(request)
+    if not user:
+        return JSONResponse({"detail": "Not authenticated"}, status_code=401)
+    if kind not in SERIES_KINDS:
+        return JSONResponse({"detail": f"Unknown series {kind!r}"}, status_code=404)
+
+    try:
+        version, render = await _load_dashboard_render(request.app)
+    except WorkerPoolSaturated:
+        return JSONResponse(
+            {"detail": "Busy, try again shortly"},
+            status_code=503,
+            headers={"Retry-After": "5"},
+        )
+    except Exception as e:
+        logger.exception("Database error in series: %s", e)
+        return JSONResponse({"detail": "Could not load data"}, status_code=500)
+
+    # The app version is included as a release may change the JSON layout
+    etag = _etag(f"series/{kind}", version.model_dump_json())
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=render.series[kind], media_type="application/json", headers=headers
     )
 
 
@@ -270,8 +674,14 @@ async def accounts(request: Request):
         return RedirectResponse(url="/login", status_code=302)
 
     try:
-        with get_connection_context() as conn:
-            records = get_latest_snapshot_records(conn)
+        async with _connection(request.app) as conn:
+            version = await async_repository.get_data_version(conn)
+            validators = _page_validators("accounts", version, user)
+            if _not_modified(request, *validators):
+                return Response(
+                    status_code=304, headers=_validator_headers(*validators)
+                )
+            records = await async_repository.get_latest_snapshot_records(conn)
     except Exception as e:
         logger.exception("Database error in accounts: %s", e)
         return templates.TemplateResponse(
@@ -295,20 +705,42 @@ async def accounts(request: Request):
         snapshot_date = None
         assets_total = liabilities_total = 0
 
-    return templates.TemplateResponse(
-        request,
-        "accounts.html",
-        {
-            "user": user,
-            "active_tab": "accounts",
-            "assets": assets,
-            "liabilities": liabilities,
-            "snapshot_date": snapshot_date,
-            "assets_total": assets_total,
-            "liabilities_total": liabilities_total,
-            "net_worth": assets_total - liabilities_total,
-        },
-    )
+    with timing.phase("template"):
+        return templates.TemplateResponse(
+            request,
+            "accounts.html",
+            {
+                "user": user,
+                "active_tab": "accounts",
+                "assets": assets,
+                "liabilities": liabilities,
+                "snapshot_date": snapshot_date,
+                "assets_total": assets_total,
+                "liabilities_total": liabilities_total,
+                "net_worth": assets_total - liabilities_total,
+            },
+            headers=_validator_headers(*validators),
+        )
+
+
+@app.get("/static/{name}")
+async def static(request: Request, name: str):
+    """Serve a content-hashed static asset, precompressed and cacheable forever."""
+    asset = static_assets().get(name)
+    if asset is None:
+        return Response(status_code=404)
+
+    headers = {
+        "ETag": asset.etag,
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+    }
+    if _not_modified(request, asset.etag):
+        return Response(status_code=304, headers=headers)
+    encoding, body = asset.negotiate(request.headers.get("accept-encoding", ""))
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=asset.media_type, headers=headers)
 
 
 @app.get("/login", response_class=HTMLResponse)
@@ -344,9 +776,23 @@ async def logout():
 @app.get("/health")
 async def health():
     """Health check endpoint."""
-    from fastapi.responses import JSONResponse
-
     return JSONResponse(
         content={"status": "ok"},
         headers={"Access-Control-Allow-Origin": "*"},
     )
+
+
+@app.get("/ready")
+async def ready(request: Request):
+    """Readiness check: 503 until the startup warm-up has finished.
+
+    The body includes how long each warm-up phase took, in milliseconds.
+    """
+    is_ready = request.app.state.ready
+    return JSONResponse(
+        content={
+            "status": "ready" if is_ready else "starting",
+            "startup_ms": request.app.state.startup_timings.milliseconds(),
+        },
+        status_code=200 if is_ready else 503,
+    )
@@ -0,0 +1,84 @@
+"""Content-hashed static assets, compressed once and cached forever.
+
+The Plotly.js bundle comes from the installed plotly package, so it always
+matches the version that builds the server-rendered chart fragments and
+never depends on a CDN. Its URL contains a hash of its contents; a new
+bundle gets a new URL, so clients may cache each one indefinitely.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+from functools import lru_cache
+from importlib import resources
+from typing import NamedTuple
+
+STATIC_PREFIX = "/static"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class StaticAsset(NamedTuple):
+    """A static file with its precompressed encodings."""
+
+    name: str
+    media_type: str
+    etag: str
+    # Content-Encoding -> body; "identity" is the uncompressed file
+    encodings: dict[str, bytes]
+
+    @property
+    def url(self) -> str:
+        return f"{STATIC_PREFIX}/{self.name}"
+
+    def negotiate(self, accept_encoding: str) -> tuple[str, bytes]:
+        """Gzip if the client accepts it, else the uncompressed file."""
+        accepted = _accepted_encodings(accept_encoding)
+        if "gzip" in accepted or "*" in accepted:
+            return "gzip", self.encodings["gzip"]
+        return "identity", self.encodings["identity"]
+
+
+def _accepted_encodings(accept_encoding: str) -> set[str]:
+    """Codings in an Accept-Encoding header, minus any refused with q=0."""
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding.strip() and quality > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def build_asset(stem: str, suffix: str, media_type: str, body: bytes) -> StaticAsset:
+    """Hash and precompress ``body`` as ``<stem>-<hash><suffix>``."""
+    digest = hashlib.sha256(body).hexdigest()
+    encodings = {"identity": body, "gzip": gzip.compress(body, compresslevel=9)}
+    return StaticAsset(
+        name=f"{stem}-{digest[:12]}{suffix}",
+        media_type=media_type,
+        etag=f'"{digest[:32]}"',
+        encodings=encodings,
+    )
+
+
+@lru_cache(maxsize=1)
+def plotly_bundle() -> StaticAsset:
+    """The Plotly.js bundle shipped with the plotly package."""
+    body = resources.files("plotly").joinpath("package_data/plotly.min.js")
+    return build_asset(
+        "plotly", ".min.js", "text/javascript; charset=utf-8", body.read_bytes()
+    )
+
+
+def static_assets() -> dict[str, StaticAsset]:
+    """Every servable asset, by file name."""
+    asset = plotly_bundle()
+    return {asset.name: asset}
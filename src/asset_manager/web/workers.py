@@ -0,0 +1,113 @@
+"""Bounded worker pool for CPU-bound rendering off the event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class WorkerPoolSaturated(RuntimeError):
+    """Raised when a job is submitted while the pool's queue is full."""
+
+
+class RenderWorkerPool:
+    """Run blocking functions in a thread pool with a cap on queued work.
+
+    At most ``queue_limit`` jobs may be running or waiting at once; further
+    submissions fail immediately with WorkerPoolSaturated so callers can
+    return a degraded response instead of piling up latency.
+    """
+
+    def __init__(self, max_workers: int, queue_limit: int) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if queue_limit < max_workers:
+            raise ValueError("queue_limit must be at least max_workers")
+        self.max_workers = max_workers
+        self.queue_limit = queue_limit
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="render-worker"
+        )
+        # Only touched from the event loop thread, so no lock is needed.
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs currently running or waiting for a worker."""
+        return self._pending
+
+    def reserve(self) -> Reservation:
+        """Claim a slot now for a job submitted later with ``Reservation.run``.
+
+        Raises WorkerPoolSaturated straight away if the pool is full, so a
+        caller can check before doing the work that prepares the job. Use
+        the reservation as a context manager: the slot is given back on
+        exit unless a job took it over.
+        """
+        if self._pending >= self.queue_limit:
+            raise WorkerPoolSaturated(
+                f"{self._pending} render jobs already pending "
+                f"(limit {self.queue_limit})"
+            )
+        self._pending += 1
+        return Reservation(self)
+
+    async def run(self, fn: Callable[..., T], *args: object) -> T:
+        with self.reserve() as slot:
+            return await slot.run(fn, *args)
+
+    def _submit(self, fn: Callable[..., T], *args: object) -> Future[T]:
+        loop = asyncio.get_running_loop()
+        # Run in a copy of the caller's context, as asyncio.to_thread
+        # does, so request-scoped state such as phase timings carries over
+        context = contextvars.copy_context()
+        future = self._executor.submit(functools.partial(context.run, fn, *args))
+
+        # Released when the job itself finishes (or is cancelled before it
+        # starts), not when the caller stops waiting: a request cancelled by
+        # a client disconnect leaves its job running in the worker.
+        def release(_: Future[T]) -> None:
+            try:
+                loop.call_soon_threadsafe(self._release)
+            except RuntimeError:
+                pass  # the loop has closed; nothing is left to count for
+
+        future.add_done_callback(release)
+        return future
+
+    def _release(self) -> None:
+        self._pending -= 1
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class Reservation:
+    """A slot claimed with :meth:`RenderWorkerPool.reserve`."""
+
+    def __init__(self, pool: RenderWorkerPool) -> None:
+        self._pool = pool
+        self._held = True
+
+    def __enter__(self) -> Reservation:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self._held:
+            self._held = False
+            self._pool._release()
+
+    async def run(self, fn: Callable[..., T], *args: object) -> T:
+        """Run ``fn(*args)`` in the pool, handing it this reservation's slot."""
+        if not self._held:
+            raise RuntimeError("Reservation has already been used or released")
+        future = self._pool._submit(fn, *args)
+        # The job releases the slot when it finishes
+        self._held = False
+        return await asyncio.wrap_future(future)
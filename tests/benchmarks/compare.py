@@ -0,0 +1,57 @@
+"""Compare two benchmark result files.
+
+    python -m tests.benchmarks.compare .benchmarks/OLD.json .benchmarks/NEW.json
+
+Prints the time and peak-memory ratio (new / old) of every benchmark in
+both files, marking changes beyond the threshold. Exits with status 1 if
+any benchmark got slower by more than the threshold.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from .harness import load_results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("old", type=Path)
+    parser.add_argument("new", type=Path)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="relative change to flag (default 0.10, i.e. 10%%)",
+    )
+    args = parser.parse_args(argv)
+
+    old = load_results(args.old)
+    new = load_results(args.new)
+    regressed = False
+    print(f"{'benchmark':<40} {'size':>12} {'time':>9} {'memory':>9}")
+    for key in sorted(old.keys() & new.keys()):
+        name, accounts, days = key
+        time_ratio = new[key].seconds / old[key].seconds
+        memory_ratio = new[key].peak_bytes / max(old[key].peak_bytes, 1)
+        flag = ""
+        if time_ratio > 1 + args.threshold:
+            flag = "  slower"
+            regressed = True
+        elif time_ratio < 1 - args.threshold:
+            flag = "  faster"
+        if memory_ratio > 1 + args.threshold:
+            flag += "  more memory"
+        print(
+            f"{name:<40} {f'{accounts}x{days}':>12} "
+            f"{time_ratio:>8.2f}x {memory_ratio:>8.2f}x{flag}"
+        )
+    for key in sorted(old.keys() ^ new.keys()):
+        print(f"{key[0]:<40} {f'{key[1]}x{key[2]}':>12}  only in one file")
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+from pathlib import Path
+
+import psycopg
+import pytest
+
+from asset_manager.frame import RecordFrame
+from asset_manager.repository import bulk_upsert_records
+
+from .harness import Result, save_results
+from .synthetic import synthetic_records
+
+RESULTS: list[Result] = []
+
+
+def _parse_sizes(value: str) -> list[tuple[int, int]]:
+    sizes = []
+    for size in value.split(","):
+        accounts, days = size.lower().split("x")
+        sizes.append((int(accounts), int(days)))
+    return sizes
+
+
+def pytest_generate_tests(metafunc):
+    if "size" in metafunc.fixturenames:
+        sizes = _parse_sizes(metafunc.config.getoption("--benchmark-sizes"))
+        metafunc.parametrize(
+            "size", sizes, ids=[f"{a}x{d}" for a, d in sizes], scope="module"
+        )
+
+
+@pytest.fixture(scope="module")
+def records(size):
+    accounts, days = size
+    return synthetic_records(accounts, days)
+
+
+@pytest.fixture(scope="module")
+def frame(records):
+    return RecordFrame.from_records(records)
+
+
+@pytest.fixture(scope="module")
+def loaded_db(db_url, _run_migrations, records):
+    """A connection to a database holding ``records``, emptied afterwards."""
+    conn = psycopg.connect(db_url)
+    bulk_upsert_records(conn, records)
+    yield conn
+    with conn.cursor() as cur:
+        cur.execute("TRUNCATE TABLE snapshots, daily_totals RESTART IDENTITY")
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def record_result():
+    """Keep a benchmark Result for the summary and the results file."""
+    return RESULTS.append
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not RESULTS:
+        return
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(
+        f"{'benchmark':<40} {'size':>12} {'records':>9} {'ms':>10} "
+        f"{'records/s':>12} {'peak MiB':>9}"
+    )
+    for r in RESULTS:
+        terminalreporter.write_line(
+            f"{r.name:<40} {f'{r.accounts}x{r.days}':>12} {r.records:>9} "
+            f"{r.seconds * 1000:>10.1f} {r.records_per_second:>12,.0f} "
+            f"{r.peak_bytes / 2**20:>9.1f}"
+        )
+    path = save_results(
+        RESULTS, Path(terminalreporter.config.getoption("--benchmark-save"))
+    )
+    terminalreporter.write_line(f"\nSaved to {path}")
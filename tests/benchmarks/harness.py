@@ -0,0 +1,113 @@
+"""Timing, peak-memory measurement and result files for the benchmarks.
+
+Results are written as one JSON document per run::
+
+    {"commit": "1a2b3c4", "dirty": false, "python": "3.13.1",
+     "created": "2026-10-17T09:30:00+00:00",
+     "results": [{"name": "transform.frame", "accounts": 50, "days": 1825,
+                  "records": 91250, "seconds": 0.0213, "seconds_median": 0.0219,
+                  "records_per_second": 4284037.6, "peak_bytes": 5242880}]}
+
+and compared with ``python -m tests.benchmarks.compare OLD.json NEW.json``.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import subprocess
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Any, NamedTuple
+
+
+class Result(NamedTuple):
+    name: str
+    accounts: int
+    days: int
+    records: int
+    seconds: float  # fastest of the timed runs
+    seconds_median: float
+    records_per_second: float
+    peak_bytes: int  # peak traced allocation during one extra run
+
+    @property
+    def key(self) -> tuple[str, int, int]:
+        return (self.name, self.accounts, self.days)
+
+
+def measure(
+    name: str,
+    fn: Callable[[], Any],
+    accounts: int,
+    days: int,
+    records: int,
+    repeat: int = 3,
+) -> Result:
+    """Time ``fn`` ``repeat`` times, then trace its peak memory once.
+
+    Memory is traced separately because tracemalloc slows allocation-heavy
+    code down several-fold. It sees allocations made through Python's
+    allocators, which includes NumPy arrays.
+    """
+    fn()  # warm-up: imports, caches, first-call costs
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        fn()
+        times.append(perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    fastest = min(times)
+    return Result(
+        name=name,
+        accounts=accounts,
+        days=days,
+        records=records,
+        seconds=fastest,
+        seconds_median=statistics.median(times),
+        records_per_second=records / fastest if fastest else float("inf"),
+        peak_bytes=peak,
+    )
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def save_results(results: list[Result], directory: Path) -> Path:
+    """Write a run's results to ``<directory>/<commit>.json``."""
+    commit = _git("rev-parse", "--short", "HEAD") or "unknown"
+    dirty = bool(_git("status", "--porcelain", "--untracked-files=no"))
+    document = {
+        "commit": commit,
+        "dirty": dirty,
+        "python": platform.python_version(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "results": [r._asdict() for r in results],
+    }
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{commit}{'-dirty' if dirty else ''}.json"
+    path.write_text(json.dumps(document, indent=2) + "\n")
+    return path
+
+
+def load_results(path: Path) -> dict[tuple[str, int, int], Result]:
+    document = json.loads(Path(path).read_text())
+    results = (Result(**r) for r in document["results"])
+    return {r.key: r for r in results}
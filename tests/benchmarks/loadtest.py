@@ -0,0 +1,315 @@
+"""End-to-end HTTP load test of the web dashboard.
+
+Starts the app under uvicorn once per combination of settings, logs in by
+minting a session cookie with the app's own serializer (so no identity
+provider is needed), drives concurrent traffic at the given paths and
+reports latency percentiles and throughput::
+
+    python -m tests.benchmarks.loadtest --database-url postgresql://... \\
+        --seed 50x1825 --pool-max-size 2,4 --render-workers 1,2 \\
+        --concurrency 16 --duration 20
+
+``--seed`` loads synthetic records into the database first; point it at a
+scratch database. Pass ``--output results.json`` to keep the numbers.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections.abc import Sequence
+from typing import NamedTuple
+
+import httpx
+import psycopg
+from itsdangerous import URLSafeTimedSerializer
+
+from asset_manager.repository import bulk_upsert_records
+from asset_manager.web.auth import SESSION_COOKIE_NAME
+
+from .synthetic import synthetic_records
+
+SECRET_KEY = "load-test-secret"
+USER = {"sub": "load-test", "email": "load-test@example.com", "name": "Load Test"}
+DEFAULT_PATHS = ("/", "/accounts", "/health")
+
+
+class PathStats(NamedTuple):
+    path: str
+    requests: int
+    errors: int  # responses other than 200 and 304, and failed requests
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    rps: float
+
+
+class RunResult(NamedTuple):
+    settings: dict[str, str]
+    concurrency: int
+    seconds: float
+    paths: list[PathStats]
+
+    @property
+    def rps(self) -> float:
+        return sum(p.rps for p in self.paths)
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted values (0 if empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def session_cookie(secret_key: str = SECRET_KEY) -> str:
+    """A session cookie the app accepts, as ``handle_callback`` would set."""
+    return URLSafeTimedSerializer(secret_key).dumps(USER)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(
+    database_url: str, settings: dict[str, str], port: int
+) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        **settings,
+        "DATABASE_URL": database_url,
+        "SECRET_KEY": SECRET_KEY,
+        "ENV": "dev",
+    }
+    # Without an IdP configured the warm-up skips its OAuth phase
+    env.pop("IDP_URL", None)
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "asset_manager.web.app:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        env=env,
+    )
+
+
+def wait_until_ready(base_url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/ready").status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    raise TimeoutError(f"{base_url} was not ready after {timeout:.0f}s")
+
+
+async def drive(
+    base_url: str, paths: Sequence[str], concurrency: int, duration: float
+) -> tuple[dict[str, list[float]], dict[str, int], float]:
+    """Send requests from ``concurrency`` clients for ``duration`` seconds.
+
+    Each client cycles through ``paths`` and waits for each response before
+    sending the next request (a closed-loop test).
+    """
+    latencies: dict[str, list[float]] = {path: [] for path in paths}
+    errors = dict.fromkeys(paths, 0)
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        cookies={SESSION_COOKIE_NAME: session_cookie()},
+        limits=limits,
+        timeout=30.0,
+    ) as client:
+        start = time.perf_counter()
+        deadline = start + duration
+
+        async def worker(offset: int) -> None:
+            ordered = list(paths[offset % len(paths) :]) + list(
+                paths[: offset % len(paths)]
+            )
+            for path in itertools.cycle(ordered):
+                if time.perf_counter() >= deadline:
+                    return
+                sent = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    ok = response.status_code in (200, 304)
+                except httpx.HTTPError:
+                    ok = False
+                latencies[path].append(time.perf_counter() - sent)
+                if not ok:
+                    errors[path] += 1
+
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+
+def summarize(
+    latencies: dict[str, list[float]], errors: dict[str, int], elapsed: float
+) -> list[PathStats]:
+    stats = []
+    for path, values in latencies.items():
+        ordered = sorted(v * 1000 for v in values)
+        stats.append(
+            PathStats(
+                path=path,
+                requests=len(ordered),
+                errors=errors[path],
+                p50_ms=percentile(ordered, 50),
+                p95_ms=percentile(ordered, 95),
+                p99_ms=percentile(ordered, 99),
+                rps=len(ordered) / elapsed if elapsed else 0.0,
+            )
+        )
+    return stats
+
+
+def run(
+    database_url: str,
+    settings: dict[str, str],
+    paths: Sequence[str] = DEFAULT_PATHS,
+    concurrency: int = 8,
+    duration: float = 10.0,
+    warmup: float = 2.0,
+) -> RunResult:
+    """Start the app with ``settings`` as environment variables and load it."""
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = start_server(database_url, settings, port)
+    try:
+        wait_until_ready(base_url)
+        if warmup:
+            asyncio.run(drive(base_url, paths, concurrency, warmup))
+        latencies, errors, elapsed = asyncio.run(
+            drive(base_url, paths, concurrency, duration)
+        )
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    return RunResult(
+        settings, concurrency, elapsed, summarize(latencies, errors, elapsed)
+    )
+
+
+def format_result(result: RunResult) -> str:
+    settings = " ".join(f"{k}={v}" for k, v in result.settings.items()) or "defaults"
+    lines = [
+        f"{settings}  concurrency={result.concurrency}  "
+        f"{result.rps:,.1f} req/s over {result.seconds:.1f}s",
+        f"  {'path':<12} {'requests':>9} {'errors':>7} {'p50 ms':>8} "
+        f"{'p95 ms':>8} {'p99 ms':>8} {'req/s':>8}",
+    ]
+    for p in result.paths:
+        lines.append(
+            f"  {p.path:<12} {p.requests:>9} {p.errors:>7} {p.p50_ms:>8.1f} "
+            f"{p.p95_ms:>8.1f} {p.p99_ms:>8.1f} {p.rps:>8.1f}"
+        )
+    return "\n".join(lines)
+
+
+def seed_database(database_url: str, size: str) -> int:
+    accounts, days = (int(part) for part in size.lower().split("x"))
+    records = synthetic_records(accounts, days)
+    with psycopg.connect(database_url) as conn:
+        bulk_upsert_records(conn, records)
+    return len(records)
+
+
+def _settings_matrix(args: argparse.Namespace) -> list[dict[str, str]]:
+    axes = {
+        "DB_POOL_MAX_SIZE": args.pool_max_size,
+        "RENDER_WORKERS": args.render_workers,
+        "DASHBOARD_CHARTS": args.dashboard_charts,
+    }
+    axes = {name: values.split(",") for name, values in axes.items() if values}
+    combinations = []
+    for values in itertools.product(*axes.values()):
+        settings = dict(zip(axes, values))
+        if "DB_POOL_MAX_SIZE" in settings:
+            # The pool's minimum may not exceed its maximum
+            settings["DB_POOL_MIN_SIZE"] = "1"
+        if "RENDER_WORKERS" in settings:
+            workers = int(settings["RENDER_WORKERS"])
+            settings["RENDER_QUEUE_LIMIT"] = str(max(workers, args.concurrency))
+        combinations.append(settings)
+    return combinations
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--database-url",
+        default=os.environ.get("DATABASE_URL"),
+        help="database the app under test reads (default: $DATABASE_URL)",
+    )
+    parser.add_argument(
+        "--seed",
+        metavar="ACCOUNTSxDAYS",
+        help="first load this much synthetic data into the database",
+    )
+    parser.add_argument("--paths", default=",".join(DEFAULT_PATHS))
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per run")
+    parser.add_argument(
+        "--warmup", type=float, default=2.0, help="unmeasured seconds before each run"
+    )
+    parser.add_argument(
+        "--pool-max-size", help="comma-separated DB_POOL_MAX_SIZE values"
+    )
+    parser.add_argument(
+        "--render-workers", help="comma-separated RENDER_WORKERS values"
+    )
+    parser.add_argument(
+        "--dashboard-charts",
+        help='comma-separated DASHBOARD_CHARTS values ("client,server")',
+    )
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+
+    if args.seed:
+        print(f"Seeded {seed_database(args.database_url, args.seed)} records")
+
+    results = []
+    for settings in _settings_matrix(args):
+        result = run(
+            args.database_url,
+            settings,
+            paths=args.paths.split(","),
+            concurrency=args.concurrency,
+            duration=args.duration,
+            warmup=args.warmup,
+        )
+        print(format_result(result), end="\n\n", flush=True)
+        results.append(result)
+
+    if args.output:
+        document = [
+            {**r._asdict(), "paths": [p._asdict() for p in r.paths]} for r in results
+        ]
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
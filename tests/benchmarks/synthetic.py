@@ -0,0 +1,53 @@
+"""Deterministic synthetic snapshot data for benchmarks.
+
+``synthetic_records(accounts, days)`` returns one record per account per
+day. Balances follow a seeded random walk, so the same arguments always
+give the same records on every machine and every run.
+"""
+
+from __future__ import annotations
+
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from asset_manager.models import Record, RecordType
+
+START_DATE = date(2015, 1, 1)
+# One account in LIABILITY_EVERY is a liability; the rest are assets
+LIABILITY_EVERY = 4
+
+
+def account_names(accounts: int) -> list[tuple[RecordType, str]]:
+    """The type and description of each synthetic account."""
+    return [
+        (
+            RecordType.LIABILITY if i % LIABILITY_EVERY == 0 else RecordType.ASSET,
+            f"Account {i:04d}",
+        )
+        for i in range(accounts)
+    ]
+
+
+def synthetic_records(
+    accounts: int, days: int, seed: int = 0, start: date = START_DATE
+) -> list[Record]:
+    """``accounts`` x ``days`` records, ordered by date then account."""
+    rng = random.Random(seed)
+    names = account_names(accounts)
+    balances = [rng.randint(1_000_00, 100_000_00) for _ in names]
+    records = []
+    for day in range(days):
+        record_date = start + timedelta(days=day)
+        for i, (record_type, description) in enumerate(names):
+            # Daily moves of up to +/-2%, never going negative
+            balances[i] = max(0, balances[i] + rng.randint(-2, 2) * balances[i] // 100)
+            records.append(
+                Record(
+                    date=record_date,
+                    type=record_type,
+                    description=description,
+                    amount=Decimal(balances[i]) / 100,
+                )
+            )
+    return records
@@ -0,0 +1,36 @@
+"""Tests for the benchmark tooling itself (these always run)."""
+
+import json
+
+from asset_manager.models import RecordType
+
+from .compare import main as compare
+from .harness import load_results, measure, save_results
+from .synthetic import synthetic_records
+
+
+def test_synthetic_records_are_deterministic():
+    records = synthetic_records(accounts=8, days=3)
+
+    assert records == synthetic_records(accounts=8, days=3)
+    assert records != synthetic_records(accounts=8, days=3, seed=1)
+    assert len(records) == 24
+    assert len({r.description for r in records}) == 8
+    assert {r.type for r in records} == {RecordType.ASSET, RecordType.LIABILITY}
+    assert all(r.amount >= 0 for r in records)
+
+
+def test_results_round_trip_and_compare(tmp_path, capsys):
+    fast = measure("sum", lambda: sum(range(1000)), 1, 1, 1000, repeat=1)
+    old_path = save_results([fast], tmp_path / "old")
+    assert load_results(old_path)[fast.key] == fast
+
+    slow = fast._replace(seconds=fast.seconds * 2)
+    new_path = tmp_path / "new.json"
+    document = json.loads(old_path.read_text())
+    document["results"] = [slow._asdict()]
+    new_path.write_text(json.dumps(document))
+
+    assert compare([str(old_path), str(new_path)]) == 1
+    assert "slower" in capsys.readouterr().out
+    assert compare([str(old_path), str(old_path)]) == 0
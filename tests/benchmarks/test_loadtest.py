@@ -0,0 +1,58 @@
+"""Tests for the HTTP load-test harness."""
+
+import argparse
+
+import pytest
+from itsdangerous import URLSafeTimedSerializer
+
+from asset_manager.repository import bulk_upsert_records
+
+from .loadtest import (
+    SECRET_KEY,
+    USER,
+    _settings_matrix,
+    format_result,
+    percentile,
+    run,
+    session_cookie,
+)
+from .synthetic import synthetic_records
+
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([7.0], 95) == 7.0
+    assert percentile([], 50) == 0.0
+
+
+def test_session_cookie_is_accepted_by_the_app_serializer():
+    assert URLSafeTimedSerializer(SECRET_KEY).loads(session_cookie()) == USER
+
+
+def test_settings_matrix_crosses_every_axis():
+    args = argparse.Namespace(
+        pool_max_size="2,4", render_workers="1,2", dashboard_charts=None, concurrency=8
+    )
+    matrix = _settings_matrix(args)
+
+    assert len(matrix) == 4
+    assert {"DB_POOL_MAX_SIZE": "4", "DB_POOL_MIN_SIZE": "1"}.items() <= matrix[
+        2
+    ].items()
+    assert all(m["RENDER_QUEUE_LIMIT"] == "8" for m in matrix)
+
+
+@pytest.mark.benchmark
+@pytest.mark.db
+def test_load_test_run(db_url, db_connection):
+    bulk_upsert_records(db_connection, synthetic_records(accounts=5, days=30))
+
+    result = run(
+        db_url, {"RENDER_WORKERS": "1"}, concurrency=4, duration=1.0, warmup=0.5
+    )
+
+    assert [p.path for p in result.paths] == ["/", "/accounts", "/health"]
+    assert all(p.requests > 0 and p.errors == 0 for p in result.paths)
+    assert "RENDER_WORKERS=1" in format_result(result)
@@ -0,0 +1,89 @@
+"""Benchmarks of the read and render pipeline on synthetic data.
+
+Run with ``pytest tests/benchmarks --benchmark --no-cov``; see the README.
+"""
+
+import pytest
+
+from asset_manager import repository
+from asset_manager.report import generate_report
+from asset_manager.transform import _transform_data
+
+from .harness import measure
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.fixture(scope="module")
+def build_chart_html():
+    with pytest.MonkeyPatch.context() as mp:
+        # Importing the web app needs a session secret, though nothing is served
+        mp.setenv("SECRET_KEY", "benchmark")
+        from asset_manager.web.app import _build_chart_html
+
+    return _build_chart_html
+
+
+def _measure(name, fn, size, records, record_result, repeat=3):
+    accounts, days = size
+    result = measure(name, fn, accounts, days, len(records), repeat=repeat)
+    record_result(result)
+    return result
+
+
+def test_transform_records(size, records, record_result):
+    _measure(
+        "transform.records",
+        lambda: _transform_data(records),
+        size,
+        records,
+        record_result,
+    )
+
+
+def test_transform_frame(size, records, frame, record_result):
+    _measure(
+        "transform.frame", lambda: _transform_data(frame), size, records, record_result
+    )
+
+
+def test_build_chart_html(size, records, frame, build_chart_html, record_result):
+    _measure(
+        "web.build_chart_html",
+        lambda: build_chart_html(frame),
+        size,
+        records,
+        record_result,
+        repeat=1,
+    )
+
+
+def test_generate_report(size, records, frame, tmp_path, record_result):
+    output = tmp_path / "report.html"
+    _measure(
+        "report.generate_report",
+        lambda: generate_report(frame, output_path=output, open_browser=False),
+        size,
+        records,
+        record_result,
+        repeat=1,
+    )
+
+
+@pytest.mark.db
+@pytest.mark.parametrize(
+    "function",
+    [
+        "get_all_records",
+        "get_record_frame",
+        "get_daily_totals",
+        "get_summary_by_date",
+        "get_latest_snapshot_records",
+        "get_data_version",
+    ],
+)
+def test_repository_reads(size, records, loaded_db, function, record_result):
+    read = getattr(repository, function)
+    _measure(
+        f"repository.{function}", lambda: read(loaded_db), size, records, record_result
+    )
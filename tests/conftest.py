@@ -7,6 +7,26 @@ import pytest
 from testcontainers.postgres import PostgresContainer
 
 
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmark", "synthetic-data benchmarks")
+    group.addoption(
+        "--benchmark",
+        action="store_true",
+        help="Run the benchmarks in tests/benchmarks (skipped otherwise)",
+    )
+    group.addoption(
+        "--benchmark-sizes",
+        default="10x365,50x1825",
+        help="Comma-separated ACCOUNTSxDAYS data sizes (default: %(default)s)",
+    )
+    group.addoption(
+        "--benchmark-save",
+        default=".benchmarks",
+        help="Directory for the results file, named after the commit "
+        "(default: %(default)s)",
+    )
+
+
 @pytest.fixture(scope="session")
 def postgres_container():
     """Start a PostgreSQL container for the test session."""
@@ -52,7 +72,10 @@ def db_connection(db_url, _run_migrations):
 
     # Clean up: truncate tables after each test
     with conn.cursor() as cur:
-        cur.execute("TRUNCATE TABLE snapshots RESTART IDENTITY")
+        cur.execute(
+            "TRUNCATE TABLE snapshots, daily_totals, ingest_state, backfill_progress "
+            "RESTART IDENTITY"
+        )
     conn.commit()
     conn.close()
 
@@ -63,3 +86,17 @@ def skip_db_tests_in_ci(request):
     if request.node.get_closest_marker("db"):
         if os.getenv("CI") == "true" and os.getenv("SKIP_DB_TESTS") == "true":
             pytest.skip("Skipping DB tests in CI (Docker not available)")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Benchmarks are slow; only run them with --benchmark.
+
+    Skipping at collection, rather than in a fixture, means their
+    module-scoped data fixtures are never built.
+    """
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="Benchmark (run with --benchmark)")
+    for item in items:
+        if item.get_closest_marker("benchmark"):
+            item.add_marker(skip)
@@ -0,0 +1,53 @@
+"""An in-memory stand-in for the googleapiclient Sheets service."""
+
+from __future__ import annotations
+
+
+class _Request:
+    def __init__(self, response):
+        self._response = response
+
+    def execute(self):
+        return self._response
+
+
+class FakeSheetsService:
+    """Serves ``tabs`` ({title: table of strings}) like the Sheets v4 API.
+
+    Supports ``spreadsheets().get`` (tab titles) and
+    ``spreadsheets().values().batchGet`` (whole tabs, by title or quoted
+    title), and records every call so tests can assert on round trips.
+    """
+
+    def __init__(self, tabs: dict[str, list[list[str]]]):
+        self.tabs = tabs
+        self.get_calls: list[dict] = []
+        self.batch_get_calls: list[list[str]] = []
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def get(self, spreadsheetId, fields=None):
+        self.get_calls.append({"spreadsheetId": spreadsheetId, "fields": fields})
+        sheets = [{"properties": {"title": title}} for title in self.tabs]
+        return _Request({"spreadsheetId": spreadsheetId, "sheets": sheets})
+
+    def batchGet(self, spreadsheetId, ranges):
+        self.batch_get_calls.append(list(ranges))
+        value_ranges = []
+        for name in ranges:
+            value_range = {"range": name}
+            values = self.tabs.get(self._title(name))
+            if values:
+                value_range["values"] = values
+            value_ranges.append(value_range)
+        return _Request({"spreadsheetId": spreadsheetId, "valueRanges": value_ranges})
+
+    @staticmethod
+    def _title(range_name: str) -> str:
+        if range_name.startswith("'") and range_name.endswith("'"):
+            return range_name[1:-1].replace("''", "'")
+        return range_name
@@ -0,0 +1,122 @@
+import asyncio
+from datetime import date
+from decimal import Decimal
+
+import psycopg
+import pytest
+
+from asset_manager import async_repository, repository
+from asset_manager.models import Record, RecordType, UpsertResult
+
+
+def _run(db_url, fn, *args):
+    """Run an async repository function on a fresh AsyncConnection."""
+
+    async def _main():
+        async with await psycopg.AsyncConnection.connect(db_url) as conn:
+            return await fn(conn, *args)
+
+    return asyncio.run(_main())
+
+
+RECORDS = [
+    Record(
+        date=date(2024, 1, 10),
+        type=RecordType.ASSET,
+        description="Savings Account",
+        amount=Decimal("10000.00"),
+    ),
+    Record(
+        date=date(2024, 1, 10),
+        type=RecordType.LIABILITY,
+        description="Credit Card",
+        amount=Decimal("500.00"),
+    ),
+    Record(
+        date=date(2024, 1, 20),
+        type=RecordType.ASSET,
+        description="Savings Account",
+        amount=Decimal("12000.00"),
+    ),
+]
+
+
+@pytest.mark.db
+class TestAsyncRepository:
+    def test_insert_and_fetch_records(self, db_url, db_connection):
+        inserted = _run(db_url, async_repository.insert_records, RECORDS)
+        assert inserted == 3
+
+        fetched = _run(db_url, async_repository.get_all_records)
+        assert fetched == repository.get_all_records(db_connection)
+        assert [r.description for r in fetched] == [
+            "Savings Account",
+            "Credit Card",
+            "Savings Account",
+        ]
+
+    def test_insert_records_upsert(self, db_url, db_connection):
+        _run(db_url, async_repository.insert_records, RECORDS[:1])
+        updated = RECORDS[0].model_copy(update={"amount": Decimal("15000.00")})
+        _run(db_url, async_repository.insert_records, [updated])
+
+        fetched = _run(db_url, async_repository.get_all_records)
+        assert len(fetched) == 1
+        assert fetched[0].amount == Decimal("15000.00")
+
+    def test_get_records_by_date_range(self, db_url, db_connection):
+        repository.insert_records(db_connection, RECORDS)
+
+        fetched = _run(
+            db_url,
+            async_repository.get_records_by_date_range,
+            date(2024, 1, 15),
+            date(2024, 1, 31),
+        )
+        assert len(fetched) == 1
+        assert fetched[0].amount == Decimal("12000.00")
+
+    def test_get_latest_snapshot_records(self, db_url, db_connection):
+        repository.insert_records(db_connection, RECORDS)
+
+        fetched = _run(db_url, async_repository.get_latest_snapshot_records)
+        assert [r.date for r in fetched] == [date(2024, 1, 20)]
+        assert fetched == repository.get_latest_snapshot_records(db_connection)
+
+    def test_get_summary_by_date(self, db_url, db_connection):
+        repository.insert_records(db_connection, RECORDS)
+
+        summaries = _run(db_url, async_repository.get_summary_by_date)
+        assert summaries == repository.get_summary_by_date(db_connection)
+        assert len(summaries) == 3
+
+    def test_get_record_frame(self, db_url, db_connection):
+        repository.insert_records(db_connection, RECORDS)
+
+        frame = _run(db_url, async_repository.get_record_frame)
+        sync_frame = repository.get_record_frame(db_connection)
+        assert list(frame.iter_rows()) == list(sync_frame.iter_rows())
+        assert len(frame) == 3
+
+    def test_iter_records(self, db_url, db_connection):
+        repository.insert_records(db_connection, RECORDS)
+
+        async def _collect(conn):
+            return [r async for r in async_repository.iter_records(conn, itersize=2)]
+
+        assert _run(db_url, _collect) == repository.get_all_records(db_connection)
+
+    def test_bulk_upsert_records(self, db_url, db_connection):
+        result = _run(db_url, async_repository.bulk_upsert_records, RECORDS)
+        assert result == UpsertResult(inserted=3, updated=0)
+
+        updated = RECORDS[0].model_copy(update={"amount": Decimal("15000.00")})
+        result = _run(db_url, async_repository.bulk_upsert_records, [updated])
+        assert result == UpsertResult(inserted=0, updated=1)
+        assert repository.get_daily_totals(db_connection)[0].total_assets == Decimal(
+            "15000.00"
+        )
+
+    def test_insert_empty_list(self, db_url, db_connection):
+        assert _run(db_url, async_repository.insert_records, []) == 0
+        assert _run(db_url, async_repository.get_all_records) == []
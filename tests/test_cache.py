@@ -0,0 +1,55 @@
+"""Tests for the cache module."""
+
+import pytest
+
+from asset_manager.cache import RenderCache, invalidate_caches
+
+
+def test_get_and_put():
+    cache = RenderCache(maxsize=2)
+    assert cache.get("a") is None
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_evicts_least_recently_used():
+    cache = RenderCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")  # "b" is now least recently used
+    cache.put("c", 3)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_invalidate_caches_clears_all_caches():
+    first, second = RenderCache(), RenderCache()
+    first.put("a", 1)
+    second.put("b", 2)
+
+    invalidate_caches()
+
+    assert len(first) == 0
+    assert len(second) == 0
+
+
+def test_put_with_stale_generation_is_dropped():
+    cache = RenderCache()
+    generation = cache.generation
+    invalidate_caches()
+
+    cache.put("a", 1, generation=generation)
+    assert cache.get("a") is None
+
+    cache.put("a", 1, generation=cache.generation)
+    assert cache.get("a") == 1
+
+
+def test_maxsize_must_be_positive():
+    with pytest.raises(ValueError):
+        RenderCache(maxsize=0)
@@ -1,5 +1,10 @@
 """Tests for the CLI module."""
 
+import json
+import subprocess
+import sys
+
+import pytest
 from typer.testing import CliRunner
 
 from asset_manager import __version__
@@ -25,3 +30,77 @@ def test_fetch_help():
     result = runner.invoke(app, ["fetch", "--help"])
     assert result.exit_code == 0
     assert "Fetch data from Google Sheets" in result.stdout
+
+
+def test_fetch_backfill_rejects_dry_run():
+    result = runner.invoke(app, ["fetch", "--backfill", "--dry-run"])
+    assert result.exit_code == 2
+
+
+def test_fetch_verbose_prints_timings(monkeypatch):
+    from asset_manager import sheets, timing
+    from asset_manager.models import IngestResult
+
+    def fake_fetch_and_save(force):
+        with timing.phase("sheets.pull"):
+            pass
+        return IngestResult(skipped=True)
+
+    monkeypatch.setattr(sheets, "fetch_and_save", fake_fetch_and_save)
+    result = runner.invoke(app, ["fetch", "--verbose"])
+
+    assert result.exit_code == 0
+    assert "sheets.pull" in result.stderr
+    assert "total" in result.stderr
+
+
+# Modules that only the commands doing real work should import
+HEAVY_MODULES = (
+    "asset_manager.config",
+    "asset_manager.db",
+    "asset_manager.report",
+    "asset_manager.sheets",
+    "googleapiclient",
+    "numpy",
+    "plotly",
+    "psycopg",
+    "pydantic_settings",
+)
+# Generous, to stay reliable on slow CI machines; eager imports took ~0.6s
+STARTUP_BUDGET = 1.0  # seconds
+
+STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from typer.main import get_command
+from asset_manager.cli import app
+try:
+    get_command(app).main(sys.argv[1:], standalone_mode=False)
+except SystemExit:
+    pass
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+@pytest.mark.parametrize("args", [["version"], ["--help"]])
+def test_startup_is_fast(args):
+    # A fresh interpreter, so modules imported by other tests don't count
+    proc = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT, *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    stats = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    loaded = set(stats["modules"])
+    assert [m for m in HEAVY_MODULES if m in loaded] == []
+    assert stats["elapsed"] < STARTUP_BUDGET
+
+
+def test_explain_rejects_unknown_query():
+    result = runner.invoke(app, ["explain", "--query", "get_everything"])
+    assert result.exit_code == 2
+    assert "Unknown query: get_everything" in result.stderr
+    assert "get_latest_snapshot_records" in result.stderr
@@ -0,0 +1,60 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from asset_manager.explain import QUERIES, explain_queries, sample
+from asset_manager.models import Record, RecordType
+from asset_manager.repository import get_all_records, insert_records
+
+RECORDS = [
+    Record(
+        date=date(2024, 1, 10),
+        type=RecordType.ASSET,
+        description="Savings Account",
+        amount=Decimal("10000.00"),
+    ),
+    Record(
+        date=date(2024, 1, 20),
+        type=RecordType.LIABILITY,
+        description="Credit Card",
+        amount=Decimal("500.00"),
+    ),
+]
+
+
+@pytest.mark.db
+class TestExplain:
+    def test_sample_uses_latest_record(self, db_connection):
+        insert_records(db_connection, RECORDS)
+
+        params = sample(db_connection)
+
+        assert params.date == date(2024, 1, 20)
+        assert params.description == "Credit Card"
+
+    def test_analyzes_every_query_and_rolls_back(self, db_connection):
+        insert_records(db_connection, RECORDS)
+
+        plans = dict(explain_queries(db_connection))
+
+        assert list(plans) == [q.name for q in QUERIES]
+        assert all("actual time=" in plan for plan in plans.values())
+        assert "Buffers:" in plans["get_latest_snapshot_records"]
+        # The explained UPDATE and DELETE didn't stick
+        assert [r.amount for r in get_all_records(db_connection)] == [
+            Decimal("10000.00"),
+            Decimal("500.00"),
+        ]
+
+    def test_estimates_only_on_an_empty_database(self, db_connection):
+        plans = dict(
+            explain_queries(db_connection, analyze=False, names=["sync_records"])
+        )
+
+        assert list(plans) == [
+            "sync_records",
+            "sync_records (update)",
+            "sync_records (delete)",
+        ]
+        assert not any("actual time=" in plan for plan in plans.values())
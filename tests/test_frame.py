@@ -0,0 +1,67 @@
+"""Tests for the columnar record frame."""
+
+from datetime import date
+from decimal import Decimal
+
+from asset_manager.frame import RecordFrame, from_cents, to_cents
+from asset_manager.models import Record, RecordType
+
+
+def _records() -> list[Record]:
+    return [
+        Record(
+            date=date(2024, 1, 1),
+            type=RecordType.ASSET,
+            description="Savings",
+            amount=Decimal("1000.50"),
+        ),
+        Record(
+            date=date(2024, 1, 1),
+            type=RecordType.LIABILITY,
+            description="Credit Card",
+            amount=Decimal("-12.34"),
+        ),
+        Record(
+            date=date(2024, 1, 15),
+            type=RecordType.ASSET,
+            description="Savings",
+            amount=Decimal("1200"),
+        ),
+    ]
+
+
+def test_cents_round_trip():
+    for amount in (Decimal("0"), Decimal("1000.5"), Decimal("-12.34")):
+        assert from_cents(to_cents(amount)) == amount
+    assert to_cents(Decimal("1200")) == 120000
+
+
+def test_from_records_round_trip():
+    records = _records()
+    frame = RecordFrame.from_records(records)
+
+    assert len(frame) == 3
+    assert frame.to_records() == records
+
+
+def test_descriptions_are_interned():
+    frame = RecordFrame.from_records(_records())
+
+    assert frame.descriptions == ["Savings", "Credit Card"]
+    assert list(frame.description_ids) == [0, 1, 0]
+
+
+def test_iter_rows():
+    rows = list(RecordFrame.from_records(_records()).iter_rows())
+
+    assert rows[1] == (
+        date(2024, 1, 1),
+        RecordType.LIABILITY,
+        "Credit Card",
+        Decimal("-12.34"),
+    )
+
+
+def test_empty_frame_is_falsy():
+    assert not RecordFrame()
+    assert RecordFrame().to_records() == []
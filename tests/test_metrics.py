@@ -0,0 +1,91 @@
+"""Tests for the in-process metrics registry."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from asset_manager import metrics
+from asset_manager.metrics import Counter, Histogram, Registry
+
+
+def test_counter_exposition():
+    registry = Registry()
+    requests = Counter("requests_total", "Requests.", ["path"], registry=registry)
+
+    requests.inc(path="/")
+    requests.inc(2, path='/a"b')
+
+    assert registry.exposition() == (
+        "# HELP requests_total Requests.\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{path="/"} 1\n'
+        'requests_total{path="/a\\"b"} 2\n'
+    )
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    latency = Histogram(
+        "latency_seconds", "Latency.", buckets=(0.1, 1), registry=registry
+    )
+
+    for value in (0.05, 0.5, 0.5, 3):
+        latency.observe(value)
+
+    assert registry.exposition().splitlines()[2:] == [
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1"} 3',
+        'latency_seconds_bucket{le="+Inf"} 4',
+        "latency_seconds_sum 4.05",
+        "latency_seconds_count 4",
+    ]
+
+
+def test_labels_must_match():
+    counter = Counter("things_total", "Things.", ["kind"], registry=None)
+    with pytest.raises(ValueError):
+        counter.inc(other="x")
+    with pytest.raises(ValueError):
+        counter.inc(-1, kind="x")
+
+
+def test_duplicate_names_are_rejected():
+    registry = Registry()
+    Counter("dupe_total", "First.", registry=registry)
+    with pytest.raises(ValueError):
+        Counter("dupe_total", "Second.", registry=registry)
+
+
+def test_observe_query_records_latency_and_rows():
+    @metrics.observe_query("test_sync_query")
+    def sync_query():
+        return [1, 2, 3]
+
+    @metrics.observe_query("test_async_query")
+    async def async_query():
+        return object()
+
+    sync_query()
+    asyncio.run(async_query())
+
+    assert metrics.DB_QUERY_SECONDS.count(function="test_sync_query") == 1
+    assert metrics.DB_QUERY_ROWS.value(function="test_sync_query") == 3
+    assert metrics.DB_QUERY_ROWS.value(function="test_async_query") == 1
+    assert 'function="test_sync_query"' in metrics.exposition()
+
+
+def test_http_server_serves_only_metrics():
+    server = metrics.start_http_server(0, addr="127.0.0.1")
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        response = httpx.get(f"{base}/metrics")
+        missing = httpx.get(f"{base}/")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == metrics.CONTENT_TYPE
+    assert "asset_manager_http_request_duration_seconds" in response.text
+    assert missing.status_code == 404
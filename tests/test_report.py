@@ -4,8 +4,13 @@ from datetime import date
 from decimal import Decimal
 from pathlib import Path
 
+from hypothesis import given
+from hypothesis import strategies as st
+
+from asset_manager.frame import RecordFrame
 from asset_manager.models import Record, RecordType
-from asset_manager.report import _transform_data, generate_report
+from asset_manager.report import generate_report
+from asset_manager.transform import _transform_data
 
 
 def _make_record(
@@ -95,6 +100,15 @@ def test_transform_data_sorts_by_date():
     assert assets["Savings"][1][0] == date(2024, 1, 15)
 
 
+def test_transform_data_consumes_a_stream():
+    records = [
+        _make_record(date(2024, 1, 15), RecordType.ASSET, "Savings", Decimal("1200")),
+        _make_record(date(2024, 1, 1), RecordType.ASSET, "Savings", Decimal("1000")),
+    ]
+
+    assert _transform_data(iter(records)) == _transform_data(records)
+
+
 def test_generate_report_creates_file(tmp_path: Path):
     records = [
         _make_record(date(2024, 1, 1), RecordType.ASSET, "Savings", Decimal("1000")),
@@ -119,3 +133,62 @@ def test_generate_report_empty_records(tmp_path: Path):
 
     assert result == output_path
     assert output_path.exists()
+
+
+def test_transform_data_frame_matches_records():
+    records = [
+        _make_record(date(2024, 1, 15), RecordType.ASSET, "Savings", Decimal("1200")),
+        _make_record(date(2024, 1, 1), RecordType.ASSET, "Savings", Decimal("1000.25")),
+        _make_record(date(2024, 1, 1), RecordType.ASSET, "401k", Decimal("5000")),
+        _make_record(
+            date(2024, 1, 1), RecordType.LIABILITY, "Credit Card", Decimal("500.10")
+        ),
+        _make_record(
+            date(2024, 1, 15), RecordType.LIABILITY, "Credit Card", Decimal("600")
+        ),
+    ]
+
+    assert _transform_data(RecordFrame.from_records(records)) == _transform_data(
+        records
+    )
+
+
+def test_generate_report_accepts_frame(tmp_path: Path):
+    records = [
+        _make_record(date(2024, 1, 1), RecordType.ASSET, "Savings", Decimal("1000")),
+    ]
+    output_path = tmp_path / "report.html"
+
+    generate_report(
+        RecordFrame.from_records(records), output_path=output_path, open_browser=False
+    )
+
+    assert "Savings" in output_path.read_text()
+
+
+_records_strategy = st.lists(
+    st.builds(
+        Record,
+        date=st.dates(min_value=date(2020, 1, 1), max_value=date(2020, 3, 1)),
+        type=st.sampled_from(RecordType),
+        description=st.sampled_from(["Savings", "401k", "Credit Card", "Car"]),
+        amount=st.decimals(
+            min_value=Decimal("-1000000"),
+            max_value=Decimal("1000000"),
+            places=2,
+            allow_nan=False,
+            allow_infinity=False,
+        ),
+    ),
+    max_size=60,
+)
+
+
+@given(_records_strategy)
+def test_vectorized_transform_matches_record_implementation(records):
+    expected = _transform_data(records)
+    actual = _transform_data(RecordFrame.from_records(records))
+
+    assert actual == expected
+    # Item order drives trace order in the charts
+    assert [list(actual[0]), list(actual[1])] == [list(expected[0]), list(expected[1])]
@@ -3,15 +3,52 @@ from decimal import Decimal
 
 import pytest
 
-from asset_manager.models import Record, RecordType
+from asset_manager.cache import RenderCache
+from asset_manager.models import Record, RecordType, UpsertResult
 from asset_manager.repository import (
+    bulk_upsert_records,
+    diff_records,
     get_all_records,
+    get_daily_totals,
+    get_data_version,
+    get_record_frame,
     get_records_by_date_range,
     get_summary_by_date,
     insert_records,
+    iter_records,
+    sync_records,
 )
 
 
+def _asset(day: int, description: str, amount: str) -> Record:
+    return Record(
+        date=date(2024, 1, day),
+        type=RecordType.ASSET,
+        description=description,
+        amount=Decimal(amount),
+    )
+
+
+def test_diff_records():
+    existing = [
+        _asset(1, "Savings", "100.00"),
+        _asset(1, "401k", "200.00"),
+        _asset(1, "Car", "5000.00"),
+    ]
+    incoming = [
+        _asset(1, "Savings", "100"),
+        _asset(1, "401k", "250"),
+        _asset(1, "Brokerage", "10"),
+    ]
+
+    diff = diff_records(existing, incoming)
+
+    assert diff.new == [incoming[2]]
+    assert diff.changed == [incoming[1]]
+    assert diff.removed == [existing[2]]
+    assert diff.unchanged == 1
+
+
 @pytest.mark.db
 class TestRepository:
     def test_insert_and_fetch_records(self, db_connection):
@@ -131,3 +168,281 @@ class TestRepository:
         inserted = insert_records(db_connection, [])
         assert inserted == 0
         assert get_all_records(db_connection) == []
+
+    def test_get_record_frame_matches_records(self, db_connection):
+        records = [
+            Record(
+                date=date(2024, 1, 15),
+                type=RecordType.LIABILITY,
+                description="Credit Card",
+                amount=Decimal("-500.25"),
+            ),
+            Record(
+                date=date(2024, 1, 15),
+                type=RecordType.ASSET,
+                description="Savings Account",
+                amount=Decimal("10000.10"),
+            ),
+        ]
+        insert_records(db_connection, records)
+
+        frame = get_record_frame(db_connection)
+        expected = [
+            (r.date, r.type, r.description, r.amount)
+            for r in get_all_records(db_connection)
+        ]
+        assert list(frame.iter_rows()) == expected
+        assert frame.descriptions == ["Savings Account", "Credit Card"]
+
+    def test_iter_records_streams_in_batches(self, db_connection):
+        records = [
+            Record(
+                date=date(2024, 1, day),
+                type=RecordType.ASSET,
+                description="Savings Account",
+                amount=Decimal(day),
+            )
+            for day in range(1, 6)
+        ]
+        insert_records(db_connection, records)
+
+        stream = iter_records(db_connection, itersize=2)
+        assert next(stream).amount == Decimal("1")
+        assert list(stream) == get_all_records(db_connection)[1:]
+
+        frame = get_record_frame(db_connection, itersize=2)
+        assert len(frame) == 5
+
+    def test_bulk_upsert_records_counts(self, db_connection):
+        def record(day: int, description: str, amount: str) -> Record:
+            return Record(
+                date=date(2024, 1, day),
+                type=RecordType.ASSET,
+                description=description,
+                amount=Decimal(amount),
+            )
+
+        result = bulk_upsert_records(
+            db_connection, [record(1, "Savings", "100"), record(1, "401k", "200")]
+        )
+        assert result == UpsertResult(inserted=2, updated=0)
+
+        result = bulk_upsert_records(
+            db_connection,
+            [
+                record(1, "Savings", "100"),  # unchanged
+                record(1, "401k", "250"),
+                record(2, "Savings", "110"),
+            ],
+        )
+        assert result == UpsertResult(inserted=1, updated=1)
+
+        amounts = {
+            (r.date.day, r.description): r.amount
+            for r in get_all_records(db_connection)
+        }
+        assert amounts == {
+            (1, "401k"): Decimal("250.00"),
+            (1, "Savings"): Decimal("100.00"),
+            (2, "Savings"): Decimal("110.00"),
+        }
+        totals = get_daily_totals(db_connection)
+        assert [t.total_assets for t in totals] == [Decimal("350"), Decimal("110")]
+
+    def test_bulk_upsert_records_last_duplicate_wins(self, db_connection):
+        records = [
+            Record(
+                date=date(2024, 1, 1),
+                type=RecordType.ASSET,
+                description="Savings",
+                amount=Decimal(amount),
+            )
+            for amount in ("1", "2", "3")
+        ]
+
+        assert bulk_upsert_records(db_connection, records) == UpsertResult(inserted=1)
+        assert get_all_records(db_connection)[0].amount == Decimal("3.00")
+
+    def test_bulk_upsert_records_empty(self, db_connection):
+        assert bulk_upsert_records(db_connection, []) == UpsertResult()
+
+    def test_sync_records_writes_only_differences(self, db_connection):
+        insert_records(
+            db_connection,
+            [
+                _asset(1, "Savings", "100"),
+                _asset(1, "401k", "200"),
+                _asset(1, "Car", "5000"),
+                _asset(2, "Savings", "90"),
+            ],
+        )
+        savings_id = get_all_records(db_connection)[2].id
+
+        diff = sync_records(
+            db_connection,
+            [
+                _asset(2, "Savings", "90"),
+                _asset(2, "401k", "250"),
+            ],
+        )
+        assert (len(diff.new), len(diff.changed), len(diff.removed)) == (1, 0, 0)
+        assert diff.unchanged == 1
+
+        diff = sync_records(
+            db_connection,
+            [_asset(1, "Savings", "100"), _asset(1, "401k", "210")],
+        )
+        assert [r.description for r in diff.changed] == ["401k"]
+        assert [r.description for r in diff.removed] == ["Car"]
+        assert diff.unchanged == 1
+
+        day_one = [r for r in get_all_records(db_connection) if r.date.day == 1]
+        assert {r.description: r.amount for r in day_one} == {
+            "401k": Decimal("210.00"),
+            "Savings": Decimal("100.00"),
+        }
+        # Unchanged rows are left alone rather than rewritten
+        assert day_one[1].id == savings_id
+        totals = get_daily_totals(db_connection)
+        assert [t.total_assets for t in totals] == [Decimal("310"), Decimal("340")]
+
+    def test_sync_records_without_changes_keeps_data_version(self, db_connection):
+        records = [_asset(1, "Savings", "100")]
+        insert_records(db_connection, records)
+        version = get_data_version(db_connection)
+
+        diff = sync_records(db_connection, records)
+
+        assert diff.unchanged == 1
+        assert get_data_version(db_connection) == version
+
+    def test_get_data_version(self, db_connection):
+        empty = get_data_version(db_connection)
+        assert empty.latest_date is None
+        assert empty.day_count == 0
+
+        records = [
+            Record(
+                date=date(2024, 1, 15),
+                type=RecordType.ASSET,
+                description="Savings Account",
+                amount=Decimal("10000.00"),
+            ),
+        ]
+        insert_records(db_connection, records)
+
+        version = get_data_version(db_connection)
+        assert version.latest_date == date(2024, 1, 15)
+        assert version.latest_created_at is not None
+        assert version.day_count == 1
+        assert version != empty
+        # Unchanged data gives an equal (and equally hashed) token
+        assert get_data_version(db_connection) == version
+        assert hash(get_data_version(db_connection)) == hash(version)
+
+    def test_insert_records_invalidates_caches(self, db_connection):
+        cache = RenderCache()
+        cache.put("key", "value")
+
+        insert_records(
+            db_connection,
+            [
+                Record(
+                    date=date(2024, 1, 15),
+                    type=RecordType.ASSET,
+                    description="Savings Account",
+                    amount=Decimal("10000.00"),
+                ),
+            ],
+        )
+
+        assert cache.get("key") is None
+
+    def test_insert_records_maintains_daily_totals(self, db_connection):
+        insert_records(
+            db_connection,
+            [
+                Record(
+                    date=date(2024, 1, 15),
+                    type=RecordType.ASSET,
+                    description="Savings Account",
+                    amount=Decimal("10000.00"),
+                ),
+                Record(
+                    date=date(2024, 1, 15),
+                    type=RecordType.LIABILITY,
+                    description="Credit Card",
+                    amount=Decimal("500.00"),
+                ),
+                Record(
+                    date=date(2024, 1, 16),
+                    type=RecordType.ASSET,
+                    description="Savings Account",
+                    amount=Decimal("11000.00"),
+                ),
+            ],
+        )
+        # Only the affected date is recomputed
+        insert_records(
+            db_connection,
+            [
+                Record(
+                    date=date(2024, 1, 16),
+                    type=RecordType.LIABILITY,
+                    description="Credit Card",
+                    amount=Decimal("700.00"),
+                ),
+            ],
+        )
+
+        totals = get_daily_totals(db_connection)
+        assert [
+            (t.date, t.total_assets, t.total_liabilities, t.net_worth) for t in totals
+        ] == [
+            (
+                date(2024, 1, 15),
+                Decimal("10000.00"),
+                Decimal("500.00"),
+                Decimal("9500.00"),
+            ),
+            (
+                date(2024, 1, 16),
+                Decimal("11000.00"),
+                Decimal("700.00"),
+                Decimal("10300.00"),
+            ),
+        ]
+
+    def test_summary_omits_types_without_records(self, db_connection):
+        insert_records(
+            db_connection,
+            [
+                Record(
+                    date=date(2024, 1, 15),
+                    type=RecordType.ASSET,
+                    description="Savings Account",
+                    amount=Decimal("10000.00"),
+                ),
+            ],
+        )
+
+        summaries = get_summary_by_date(db_connection)
+        assert [(s.date, s.type) for s in summaries] == [
+            (date(2024, 1, 15), RecordType.ASSET)
+        ]
+
+    def test_amount_update_changes_data_version(self, db_connection):
+        record = Record(
+            date=date(2024, 1, 15),
+            type=RecordType.ASSET,
+            description="Savings Account",
+            amount=Decimal("10000.00"),
+        )
+        insert_records(db_connection, [record])
+        before = get_data_version(db_connection)
+
+        insert_records(
+            db_connection, [record.model_copy(update={"amount": Decimal("1.00")})]
+        )
+
+        assert get_data_version(db_connection) != before
@@ -3,13 +3,36 @@ from datetime import date
 from decimal import Decimal
 
 import pytest
+from google.oauth2 import service_account
+from googleapiclient import discovery
 
+from asset_manager import metrics, sheets
+from asset_manager.config import get_settings
+from asset_manager.models import RecordType
+from asset_manager.repository import get_all_records
 from asset_manager.sheets import (
+    DatedTab,
+    SheetRange,
+    backfill,
     dollars_to_decimal,
+    fetch_and_save,
+    fetch_raw_tables,
+    find_dated_tabs,
     get_service,
+    parse_raw_table,
+    parse_raw_tables,
     parse_records_from_table,
+    tab_date,
+    tables_fingerprint,
 )
-from asset_manager.models import RecordType
+
+from .fake_sheets import FakeSheetsService
+
+SHEET = [
+    ["Assets", "", "", "", "Liabilities"],
+    ["Description", "Amount", "Accessible", "Liquidity", "Description", "Amount"],
+    ["Savings", "$1,000.00", "Y", "$500.00", "Credit Card", "$250.00"],
+]
 
 
 @pytest.mark.skipif(
@@ -20,6 +43,33 @@ def test_get_service_runs_without_error():
     _ = get_service()
 
 
+def test_get_service_reuses_client(monkeypatch):
+    built = []
+
+    def fake_build(*args, **kwargs):
+        built.append(kwargs)
+        return object()
+
+    monkeypatch.setenv("GOOGLE_APPLICATION_CREDENTIALS", "/creds.json")
+    monkeypatch.setenv("DATABASE_URL", "postgresql://unused")
+    monkeypatch.setattr(
+        service_account.Credentials,
+        "from_service_account_file",
+        lambda *a, **kw: object(),
+    )
+    monkeypatch.setattr(discovery, "build", fake_build)
+    get_settings.cache_clear()
+    sheets._service_for.cache_clear()
+    try:
+        assert sheets.get_service() is sheets.get_service()
+    finally:
+        sheets._service_for.cache_clear()
+        get_settings.cache_clear()
+
+    assert len(built) == 1
+    assert built[0]["static_discovery"] is True
+
+
 def test_dollars_to_decimal():
     assert dollars_to_decimal("$1,234.56") == Decimal("1234.56")
     assert dollars_to_decimal("$100.00") == Decimal("100.00")
@@ -104,3 +154,169 @@ def test_parse_records_from_table_empty():
     )
 
     assert len(records) == 0
+
+
+def test_parse_raw_table():
+    records = parse_raw_table(SHEET, date(2024, 1, 15))
+
+    assert [(r.type, r.description, r.amount) for r in records] == [
+        (RecordType.ASSET, "Savings", Decimal("1000.00")),
+        (RecordType.LIABILITY, "Credit Card", Decimal("250.00")),
+    ]
+
+
+def test_tables_fingerprint_ignores_padding():
+    padded = [[f" {cell} " for cell in row] + [""] for row in SHEET] + [[], [""]]
+
+    assert tables_fingerprint({"Summary": padded}) == tables_fingerprint(
+        {"Summary": SHEET}
+    )
+
+
+def test_tables_fingerprint_changes_with_values():
+    changed = [row[:] for row in SHEET]
+    changed[2][1] = "$1,000.01"
+
+    assert tables_fingerprint({"Summary": changed}) != tables_fingerprint(
+        {"Summary": SHEET}
+    )
+
+
+RANGES = [
+    SheetRange("Summary", slice(0, 4), slice(4, 7)),
+    SheetRange("Brokerage", slice(0, 2), None),
+]
+BROKERAGE = [
+    ["Brokerage"],
+    ["Description", "Amount"],
+    ["Index Fund", "$2,000.00"],
+]
+
+
+def test_fetch_raw_tables_uses_one_batch_get(monkeypatch):
+    service = FakeSheetsService({"Summary": SHEET, "Brokerage": BROKERAGE})
+    monkeypatch.setattr(sheets, "get_service", lambda: service)
+
+    tables = fetch_raw_tables(RANGES)
+
+    assert service.batch_get_calls == [["Summary", "Brokerage"]]
+    assert tables == {"Summary": SHEET, "Brokerage": BROKERAGE}
+
+
+def test_parse_raw_tables_uses_each_range_layout():
+    tables = {"Summary": SHEET, "Brokerage": BROKERAGE}
+
+    records = parse_raw_tables(tables, date(2024, 1, 15), RANGES)
+
+    assert [(r.type, r.description) for r in records] == [
+        (RecordType.ASSET, "Savings"),
+        (RecordType.LIABILITY, "Credit Card"),
+        (RecordType.ASSET, "Index Fund"),
+    ]
+
+
+@pytest.mark.db
+def test_fetch_and_save_skips_unchanged_sheet(monkeypatch, db_url, db_connection):
+    monkeypatch.setenv("DATABASE_URL", db_url)
+    get_settings.cache_clear()
+    table = [row[:] for row in SHEET]
+    monkeypatch.setattr(sheets, "fetch_raw_tables", lambda: {"Summary": table})
+    skipped_runs = metrics.INGEST_SECONDS.count(outcome="skipped")
+    inserted = metrics.INGEST_RECORDS.value(change="inserted")
+    try:
+        first = fetch_and_save()
+        assert first.records == 2
+        assert first.inserted == 2
+        assert not first.skipped
+        assert metrics.INGEST_RECORDS.value(change="inserted") == inserted + 2
+
+        assert fetch_and_save().skipped
+        assert metrics.INGEST_SECONDS.count(outcome="skipped") == skipped_runs + 1
+
+        forced = fetch_and_save(force=True)
+        assert not forced.skipped
+        assert forced.records == 2
+
+        table[2][1] = "$1,100.00"
+        changed = fetch_and_save()
+        assert not changed.skipped
+        assert changed.updated == 1
+    finally:
+        get_settings.cache_clear()
+
+
+def test_tab_date():
+    assert tab_date("2024-03-15") == date(2024, 3, 15)
+    assert tab_date("2024-02") == date(2024, 2, 29)
+    assert tab_date("Jan 2023") == date(2023, 1, 31)
+    assert tab_date(" September 2023 ") == date(2023, 9, 30)
+    assert tab_date("Summary") is None
+
+
+def test_find_dated_tabs_skips_future_tabs():
+    service = FakeSheetsService(
+        {
+            "Summary": SHEET,
+            "Sep 2026": SHEET,
+            "Oct 2026": SHEET,
+            "2026-10-17": SHEET,
+            "2026-10-18": SHEET,
+        }
+    )
+
+    tabs = find_dated_tabs(service, today=date(2026, 10, 17))
+
+    assert tabs == [
+        DatedTab(date(2026, 9, 30), "Sep 2026"),
+        DatedTab(date(2026, 10, 17), "2026-10-17"),
+    ]
+
+
+def _dated_sheet(savings: str) -> list[list[str]]:
+    table = [row[:] for row in SHEET]
+    table[2][1] = savings
+    return table
+
+
+@pytest.mark.db
+def test_backfill_resumes_after_last_completed_tab(monkeypatch, db_url, db_connection):
+    monkeypatch.setenv("DATABASE_URL", db_url)
+    get_settings.cache_clear()
+    service = FakeSheetsService(
+        {
+            "Summary": SHEET,
+            "Feb 2024": _dated_sheet("$2.00"),
+            "Jan 2024": _dated_sheet("$1.00"),
+            "Mar 2024": _dated_sheet("$3.00"),
+        }
+    )
+    monkeypatch.setattr(sheets, "get_service", lambda: service)
+    try:
+        first = backfill(chunk_size=2, max_workers=2)
+        assert (first.tabs, first.records, first.inserted) == (3, 6, 6)
+        assert first.resumed_after is None
+        assert service.batch_get_calls == [
+            ["'Jan 2024'", "'Feb 2024'"],
+            ["'Mar 2024'"],
+        ]
+        savings = {
+            r.date: r.amount
+            for r in get_all_records(db_connection)
+            if r.description == "Savings"
+        }
+        assert savings == {
+            date(2024, 1, 31): Decimal("1.00"),
+            date(2024, 2, 29): Decimal("2.00"),
+            date(2024, 3, 31): Decimal("3.00"),
+        }
+
+        service.tabs["Apr 2024"] = _dated_sheet("$4.00")
+        resumed = backfill(chunk_size=2, max_workers=2)
+        assert resumed.resumed_after == date(2024, 3, 31)
+        assert resumed.tabs == 1
+        assert service.batch_get_calls[-1] == ["'Apr 2024'"]
+
+        assert backfill().tabs == 0
+        assert backfill(force=True).tabs == 4
+    finally:
+        get_settings.cache_clear()
@@ -0,0 +1,203 @@
+"""Tests for the httpx Sheets backend, against a local mock server."""
+
+import asyncio
+import base64
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec, padding, rsa
+
+from asset_manager import sheets
+from asset_manager.config import get_settings
+from asset_manager.sheets import SheetRange, fetch_raw_tables
+from asset_manager.sheets_http import (
+    JWT_BEARER_GRANT,
+    AsyncSheetsHttpClient,
+    ServiceAccount,
+    SheetsHttpClient,
+    make_assertion,
+)
+
+SCOPES = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
+TABS = {
+    "Summary": [["Assets"], ["Description", "Amount"], ["Savings", "$1.00"]],
+    "Jan 2024": [["Assets"]],
+}
+
+
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+class MockSheetsServer(ThreadingHTTPServer):
+    """Serves the token endpoint and the Sheets endpoints the backend uses."""
+
+    def __init__(self, public_key):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.public_key = public_key
+        self.token_requests = 0
+        self.api_requests: list[str] = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: MockSheetsServer
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, body: dict) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        form = parse_qs(self.rfile.read(length).decode())
+        assert form["grant_type"] == [JWT_BEARER_GRANT]
+        header, claims, signature = form["assertion"][0].split(".")
+        self.server.public_key.verify(
+            _b64decode(signature),
+            f"{header}.{claims}".encode(),
+            padding.PKCS1v15(),
+            hashes.SHA256(),
+        )
+        assert json.loads(_b64decode(claims))["scope"] == " ".join(SCOPES)
+        self.server.token_requests += 1
+        self._send(200, {"access_token": "test-token", "expires_in": 3600})
+
+    def do_GET(self):
+        if self.headers.get("Authorization") != "Bearer test-token":
+            self._send(401, {"error": "unauthorized"})
+            return
+        url = urlparse(self.path)
+        self.server.api_requests.append(url.path)
+        query = parse_qs(url.query)
+        if url.path.endswith("/values:batchGet"):
+            value_ranges = [
+                {"range": r, "values": TABS[r.strip("'")]} for r in query["ranges"]
+            ]
+            self._send(200, {"valueRanges": value_ranges})
+        else:
+            sheets_ = [{"properties": {"title": title}} for title in TABS]
+            self._send(200, {"sheets": sheets_})
+
+
+@pytest.fixture(scope="module")
+def private_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture
+def server(private_key):
+    server = MockSheetsServer(private_key.public_key())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def account(server, private_key):
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    return ServiceAccount(
+        client_email="reader@example.iam.gserviceaccount.com",
+        private_key=pem,
+        token_uri=f"{server.url}/token",
+    )
+
+
+def test_make_assertion_rejects_non_rsa_keys():
+    pem = (
+        ec.generate_private_key(ec.SECP256R1())
+        .private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        .decode()
+    )
+    account = ServiceAccount(client_email="reader@example.com", private_key=pem)
+
+    with pytest.raises(ValueError, match="not an RSA key"):
+        make_assertion(account, SCOPES)
+
+
+def test_batch_get_reuses_token(server, account):
+    client = SheetsHttpClient(account, SCOPES, api_url=f"{server.url}/v4")
+    try:
+        first = client.batch_get_values("sheet-id", ["Summary", "'Jan 2024'"])
+        client.get_spreadsheet("sheet-id", fields="sheets.properties.title")
+    finally:
+        client.close()
+
+    assert [r["values"] for r in first["valueRanges"]] == [
+        TABS["Summary"],
+        TABS["Jan 2024"],
+    ]
+    assert server.token_requests == 1
+    assert server.api_requests == [
+        "/v4/spreadsheets/sheet-id/values:batchGet",
+        "/v4/spreadsheets/sheet-id",
+    ]
+
+
+def test_client_works_as_fetch_service(server, account):
+    client = SheetsHttpClient(account, SCOPES, api_url=f"{server.url}/v4")
+    ranges = [SheetRange("Summary", slice(0, 2), None)]
+    try:
+        tables = fetch_raw_tables(ranges, service=client)
+    finally:
+        client.close()
+
+    assert tables == {"Summary": TABS["Summary"]}
+
+
+def test_async_client(server, account):
+    async def _main():
+        client = AsyncSheetsHttpClient(account, SCOPES, api_url=f"{server.url}/v4")
+        try:
+            values = await client.batch_get_values("sheet-id", ["Summary"])
+            spreadsheet = await client.get_spreadsheet("sheet-id")
+        finally:
+            await client.aclose()
+        return values, spreadsheet
+
+    values, spreadsheet = asyncio.run(_main())
+
+    assert values["valueRanges"][0]["values"] == TABS["Summary"]
+    assert [s["properties"]["title"] for s in spreadsheet["sheets"]] == list(TABS)
+    assert server.token_requests == 1
+
+
+def test_get_service_uses_configured_backend(monkeypatch, tmp_path, account):
+    key_file = tmp_path / "credentials.json"
+    key_file.write_text(json.dumps(account._asdict()))
+    monkeypatch.setenv("GOOGLE_APPLICATION_CREDENTIALS", str(key_file))
+    monkeypatch.setenv("DATABASE_URL", "postgresql://unused")
+    monkeypatch.setenv("SHEETS_BACKEND", "httpx")
+    get_settings.cache_clear()
+    sheets._http_service_for.cache_clear()
+    try:
+        service = sheets.get_service()
+        assert isinstance(service, SheetsHttpClient)
+        assert service.account == account
+        assert sheets.get_service() is service
+    finally:
+        sheets._http_service_for.cache_clear()
+        get_settings.cache_clear()
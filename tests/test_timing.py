@@ -0,0 +1,77 @@
+"""Tests for phase timing."""
+
+import asyncio
+from contextlib import contextmanager
+
+from asset_manager.timing import collect, instrument, phase, timed
+
+
+def test_phase_without_collector_is_a_no_op():
+    with phase("ignored"):
+        pass
+
+
+def test_collect_accumulates_phases_in_order():
+    with collect() as timings:
+        with phase("pull"):
+            pass
+        with phase("parse"):
+            pass
+        with phase("pull"):
+            pass
+
+    assert list(timings.phases) == ["pull", "parse"]
+    assert all(seconds >= 0 for seconds in timings.phases.values())
+    assert timings.format().splitlines()[1].startswith("parse ")
+
+
+def test_collectors_nest():
+    with collect() as outer:
+        with collect() as inner:
+            with phase("inner"):
+                pass
+        with phase("outer"):
+            pass
+
+    assert list(inner.phases) == ["inner"]
+    assert list(outer.phases) == ["outer"]
+
+
+def test_timed_sync_and_async_functions():
+    @timed("double")
+    def double(x):
+        return 2 * x
+
+    @timed("triple")
+    async def triple(x):
+        return 3 * x
+
+    assert double(1) == 2
+    with collect() as timings:
+        assert double(2) == 4
+        assert asyncio.run(triple(2)) == 6
+
+    assert list(timings.phases) == ["double", "triple"]
+    assert list(timings.milliseconds()) == ["double", "triple"]
+
+
+def test_instrument_passes_results_after_the_block():
+    events = []
+
+    @contextmanager
+    def around():
+        events.append("enter")
+        yield
+        events.append("exit")
+
+    def double(x):
+        return 2 * x
+
+    async def triple(x):
+        return 3 * x
+
+    assert instrument(double, around, events.append)(2) == 4
+    assert asyncio.run(instrument(triple, around, events.append)(2)) == 6
+    assert instrument(double, lambda: None, events.append)(5) == 10
+
+    assert events == ["enter", "exit", 4, "enter", "exit", 6, 10]
@@ -0,0 +1,507 @@
+"""Tests for the web dashboard."""
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import date
+from decimal import Decimal
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from itsdangerous import URLSafeTimedSerializer
+
+from asset_manager import async_repository, metrics
+from asset_manager.config import get_settings
+from asset_manager.models import Record, RecordType
+from asset_manager.repository import insert_records
+from asset_manager.web.static import plotly_bundle
+
+SECRET_KEY = "test-secret-key"
+USER = {"sub": "user-1", "email": "user@example.com", "name": "Test User"}
+
+
+@pytest.fixture
+def web_env(monkeypatch, db_url):
+    monkeypatch.setenv("SECRET_KEY", SECRET_KEY)
+    monkeypatch.setenv("DATABASE_URL", db_url)
+    # Warm-up renders in the background; most tests want exact cache counts
+    monkeypatch.setenv("STARTUP_WARM_UP", "false")
+    get_settings.cache_clear()
+    yield monkeypatch
+    get_settings.cache_clear()
+
+
+@contextmanager
+def _signed_in_client():
+    from asset_manager.web.app import app
+
+    with TestClient(app) as client:
+        serializer = URLSafeTimedSerializer(SECRET_KEY)
+        client.cookies.set("session", serializer.dumps(USER))
+        yield client
+
+
+@pytest.fixture
+def client(web_env, db_connection):
+    with _signed_in_client() as client:
+        yield client
+
+
+@pytest.fixture
+def metrics_client(web_env, db_connection):
+    web_env.setenv("METRICS_PORT", "0")  # any free port
+    get_settings.cache_clear()
+    with _signed_in_client() as client:
+        yield client
+
+
+def _scrape(client) -> httpx.Response:
+    _, port = client.app.state.metrics_server.server_address
+    return httpx.get(f"http://127.0.0.1:{port}/metrics")
+
+
+def _records(day: date, savings: str) -> list[Record]:
+    return [
+        Record(
+            date=day,
+            type=RecordType.ASSET,
+            description="Savings",
+            amount=Decimal(savings),
+        ),
+        Record(
+            date=day,
+            type=RecordType.LIABILITY,
+            description="Credit Card",
+            amount=Decimal("500.00"),
+        ),
+    ]
+
+
+@pytest.mark.db
+class TestDashboard:
+    def test_redirects_without_session(self, client):
+        client.cookies.clear()
+        response = client.get("/", follow_redirects=False)
+        assert response.status_code == 302
+        assert response.headers["location"] == "/login"
+
+    def test_renders_charts(self, client, db_connection):
+        insert_records(db_connection, _records(date(2024, 1, 1), "1000.00"))
+
+        response = client.get("/")
+
+        assert response.status_code == 200
+        assert "Net Worth" in response.text
+        assert "$500" in response.text
+
+    def test_reuses_render_for_unchanged_data(self, client, db_connection):
+        insert_records(db_connection, _records(date(2024, 1, 1), "1000.00"))
+        cache = client.app.state.render_cache
+
+        client.get("/")
+        client.get("/")
+
+        assert cache.misses == 1
+        assert cache.hits == 1
+
+    def test_cached_render_costs_one_checkout_and_query(self, client, db_connection):
+        insert_records(db_connection, _records(date(2024, 1, 1), "1000.00"))
+        client.get("/")
+        checkouts = metrics.DB_CONNECTION_ACQUIRE_SECONDS.count()
+        version_queries = metrics.DB_QUERY_SECONDS.count(function="get_data_version")
+
+        assert client.get("/").status_code == 200
+
+        assert metrics.DB_CONNECTION_ACQUIRE_SECONDS.count() == checkouts + 1
+        assert (
+            metrics.DB_QUERY_SECONDS.count(function="get_data_version")
+            == version_queries + 1
+        )
+
+    def test_new_data_is_rendered(self, client, db_connection):
+        insert_records(db_connection, _records(date(2024, 1, 1), "1000.00"))
+        client.get("/")
+
+        insert_records(db_connection, _records(date(2024, 1, 1), "2345.00"))
+        response = client.get("/")
+
+        assert "$2,345" in response.text
+
+    def test_busy_when_render_workers_saturated(
+        self, client, db_connection, monkeypatch
+    ):
+        insert_records(db_connection, _records(date(2024, 1, 1), "1000.00"))
+        monkeypatch.setattr(client.app.state.render_workers, "queue_limit", 0)
+
+        response = client.get("/")
+
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "5"
+        assert "busy" in response.text
+
+    def test_saturated_pool_skips_record_queries(
+        self, client, db_connection, monkeypatch
+    ):
+        insert_records(db_connection, _records(date(2024, 1, 1), "1000.00"))
+        monkeypatch.setattr(client.app.state.render_workers, "queue_limit", 0)
+        calls = []
+
+        async def get_record_frame(*args, **kwargs):
+            calls.append(args)
+
+        monkeypatch.setattr(async_repository, "get_record_frame", get_record_frame)
+
+        assert client.get("/").status_code == 503
+        assert calls == []
+        assert client.app.state.render_workers.pending == 0
+
+    def test_concurrent_misses_share_one_render(
+        self, client, db_connection, monkeypatch
+    ):
+        from asset_manager.web import app as app_module
+
+        insert_records(db_connection, _records(date(2024, 1, 1), "1000.00"))
+        renders = []
+        render_dashboard = app_module._render_dashboard
+
+        def counting_render(*args):
+            renders.append(args)
+            return render_dashboard(*args)
+
+        monkeypatch.setattr(app_module, "_render_dashboard", counting_render)
+
+        async def load_concurrently():
+            return await asyncio.gather(
+                *(app_module._load_dashboard_render(client.app) for _ in range(3))
+            )
+
+        results = client.portal.call(load_concurrently)
+
+        assert len(renders) == 1
+        assert len({id(render) for _, render in results}) == 1
+        assert client.app.state.renders_in_flight == {}
+
+    def test_server_rendered_charts(self, client, db_connection, web_env):
+        web_env.setenv("DASHBOARD_CHARTS", "server")
+        get_settings.cache_clear()
+        insert_records(db_connection, _records(date(2024, 1, 1), "1000.00"))
+
+        response = client.get("/")
+
+        assert "Assets over Time" in response.text
+        assert "data-series=" not in response.text
+
+    def test_client_rendered_charts(self, client, db_connection):
+        insert_records(db_connection, _records(date(2024, 1, 1), "1000.00"))
+
+        response = client.get("/")
+
+        assert 'data-series="summary"' in response.text
+        assert "Plotly.newPlot" in response.text
+
+    def test_health(self, client):
+        response = client.get("/health")
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok"}
+
+
+@pytest.mark.db
+class TestConditionalGet:
+    @pytest.mark.parametrize("path", ["/", "/accounts"])
+    def test_if_none_match(self, client, db_connection, path):
+        insert_records(db_connection, _records(date(2024, 1, 1), "1000.00"))
+
+        first = client.get(path)
+        assert first.status_code == 200
+        assert first.headers["cache-control"] == "private, no-cache"
+        second = client.get(path, headers={"If-None-Match": first.headers["etag"]})
+
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == first.headers["etag"]
+
+    @pytest.mark.parametrize("path", ["/", "/accounts"])
+    def test_if_modified_since(self, client, db_connection, path):
+        insert_records(db_connection, _records(date(2024, 1, 1), "1000.00"))
+
+        first = client.get(path)
+        last_modified = first.headers["last-modified"]
+        second = client.get(path, headers={"If-Modified-Since": last_modified})
+
+        assert second.status_code == 304
+
+    def test_not_modified_skips_render(self, client, db_connection):
+        insert_records(db_connection, _records(date(2024, 1, 1), "1000.00"))
+        cache = client.app.state.render_cache
+        etag = client.get("/").headers["etag"]
+
+        client.get("/", headers={"If-None-Match": etag})
+
+        assert (cache.hits, cache.misses) == (0, 1)
+
+    def test_new_data_changes_etag(self, client, db_connection):
+        insert_records(db_connection, _records(date(2024, 1, 1), "1000.00"))
+        etag = client.get("/").headers["etag"]
+
+        insert_records(db_connection, _records(date(2024, 1, 2), "2345.00"))
+        response = client.get("/", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    def test_etag_is_per_user(self, client, db_connection):
+        insert_records(db_connection, _records(date(2024, 1, 1), "1000.00"))
+        etag = client.get("/").headers["etag"]
+
+        other = {**USER, "sub": "user-2"}
+        client.cookies.set("session", URLSafeTimedSerializer(SECRET_KEY).dumps(other))
+        response = client.get("/", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+
+
+@pytest.mark.db
+class TestStaticAssets:
+    def test_dashboard_uses_self_hosted_plotly(self, client, db_connection):
+        insert_records(db_connection, _records(date(2024, 1, 1), "1000.00"))
+
+        response = client.get("/")
+
+        assert plotly_bundle().url in response.text
+        assert "cdn.plot.ly" not in response.text
+
+    def test_serves_precompressed_bundle(self, client):
+        asset = plotly_bundle()
+
+        response = client.get(asset.url, headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["cache-control"].endswith("immutable")
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.content == asset.encodings["identity"]
+        assert len(asset.encodings["gzip"]) < len(asset.encodings["identity"]) / 3
+
+    def test_identity_when_compression_refused(self, client):
+        asset = plotly_bundle()
+
+        response = client.get(asset.url, headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+        assert response.content == asset.encodings["identity"]
+
+    def test_unknown_asset(self, client):
+        assert client.get("/static/plotly-000000000000.min.js").status_code == 404
+
+    def test_html_is_compressed(self, client, db_connection):
+        insert_records(db_connection, _records(date(2024, 1, 1), "1000.00"))
+
+        response = client.get("/", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Net Worth" in response.text
+
+
+def _server_timing(response) -> dict[str, float]:
+    entries = (
+        part.split(";dur=") for part in response.headers["server-timing"].split(", ")
+    )
+    return {name: float(ms) for name, ms in entries}
+
+
+@pytest.mark.db
+class TestServerTiming:
+    def test_off_by_default(self, client):
+        assert "server-timing" not in client.get("/health").headers
+
+    def test_dashboard_stages(self, client, db_connection, web_env, caplog):
+        web_env.setenv("SERVER_TIMING", "true")
+        web_env.setenv("DASHBOARD_CHARTS", "server")
+        get_settings.cache_clear()
+        insert_records(db_connection, _records(date(2024, 1, 1), "1000.00"))
+
+        with caplog.at_level("INFO", logger="asset_manager.web.server_timing"):
+            response = client.get("/")
+
+        stages = _server_timing(response)
+        assert {
+            "db.connect",
+            "db.data_version",
+            "db.record_frame",
+            "db.daily_totals",
+            "render",
+            "transform",
+            "charts.figures",
+            "charts.to_html",
+            "series_json",
+            "template",
+            "total",
+        } <= set(stages)
+        assert stages["render"] >= stages["charts.to_html"]
+
+        (log,) = [r for r in caplog.records if getattr(r, "path", None) == "/"]
+        assert log.status == 200
+        assert log.timings_ms == stages
+
+
+@pytest.mark.db
+class TestMetrics:
+    def test_exposes_request_and_query_metrics(self, metrics_client, db_connection):
+        client = metrics_client
+        insert_records(db_connection, _records(date(2024, 1, 1), "1000.00"))
+        client.get("/")
+        client.get("/")
+        client.get("/api/series/assets")
+
+        response = _scrape(client)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        text = response.text
+        assert (
+            'asset_manager_http_request_duration_seconds_count{method="GET",'
+            'route="/api/series/{kind}",status="200"}'
+        ) in text
+        assert 'asset_manager_db_query_rows_total{function="get_record_frame"}' in text
+        assert "asset_manager_db_connection_acquire_duration_seconds_count" in text
+        assert 'asset_manager_render_cache_lookups_total{result="hit"}' in text
+        assert 'asset_manager_chart_build_duration_seconds_count{mode="client"}' in text
+
+    def test_unmatched_routes_share_a_label(self, metrics_client):
+        metrics_client.get("/no/such/page")
+        assert 'route="unmatched",status="404"' in _scrape(metrics_client).text
+
+    def test_not_served_by_the_app(self, metrics_client):
+        assert metrics_client.get("/metrics").status_code == 404
+
+    def test_off_by_default(self, client):
+        assert client.app.state.metrics_server is None
+
+
+@pytest.mark.db
+class TestStartup:
+    def test_ready_without_warm_up(self, client):
+        response = client.get("/ready")
+        assert response.status_code == 200
+        assert response.json() == {"status": "ready", "startup_ms": {}}
+
+    def test_warm_up_fills_render_cache(self, web_env, db_connection):
+        from asset_manager.web.app import app
+
+        web_env.setenv("STARTUP_WARM_UP", "true")
+        web_env.setenv("DASHBOARD_CHARTS", "server")
+        get_settings.cache_clear()
+        insert_records(db_connection, _records(date(2024, 1, 1), "1000.00"))
+
+        with TestClient(app) as client:
+            deadline = time.monotonic() + 30
+            response = client.get("/ready")
+            while response.status_code == 503 and time.monotonic() < deadline:
+                time.sleep(0.05)
+                response = client.get("/ready")
+
+            assert response.status_code == 200
+            phases = response.json()["startup_ms"]
+            # Nested phases (db.connect, db.record_frame, ...) are included too
+            warm_up_phases = {"imports", "templates", "pool", "render_cache"}
+            assert warm_up_phases <= set(phases)
+            assert list(phases)[-1] == "total"
+            assert len(app.state.render_cache) == 1
+
+    def test_shutdown_waits_for_cancelled_warm_up(self, web_env, monkeypatch):
+        from asset_manager.web import app as app_module
+
+        pool_closed_at_exit = []
+
+        async def stuck_warm_up(app):
+            try:
+                await asyncio.Event().wait()
+            finally:
+                pool_closed_at_exit.append(app.state.db_pool.closed)
+
+        monkeypatch.setattr(app_module, "warm_up", stuck_warm_up)
+        web_env.setenv("STARTUP_WARM_UP", "true")
+        get_settings.cache_clear()
+
+        with TestClient(app_module.app):
+            pass
+
+        assert pool_closed_at_exit == [False]
+
+
+def test_app_import_defers_plotly():
+    # A fresh interpreter, so modules imported by other tests don't count
+    script = (
+        "import sys, asset_manager.web.app; "
+        "print(sorted(m for m in sys.modules if m.split('.')[0] == 'plotly'))"
+    )
+    env = {**os.environ, "SECRET_KEY": SECRET_KEY, "DATABASE_URL": "postgresql://"}
+    proc = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", script],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    # The warm-up's "imports" phase is what loads it in server mode
+    assert proc.stdout.strip() == "[]"
+
+
+@pytest.mark.db
+class TestSeriesApi:
+    def test_requires_session(self, client):
+        client.cookies.clear()
+        assert client.get("/api/series/assets").status_code == 401
+
+    def test_unknown_kind(self, client):
+        assert client.get("/api/series/bogus").status_code == 404
+
+    def test_columnar_series(self, client, db_connection):
+        insert_records(db_connection, _records(date(2024, 1, 1), "1000.00"))
+        insert_records(
+            db_connection,
+            [
+                Record(
+                    date=date(2024, 1, 2),
+                    type=RecordType.ASSET,
+                    description="Brokerage",
+                    amount=Decimal("250.50"),
+                ),
+            ],
+        )
+
+        assets = client.get("/api/series/assets").json()
+        assert assets == {
+            "dates": ["2024-01-01", "2024-01-02"],
+            "series": {"Brokerage": [None, 250.5], "Savings": [1000.0, None]},
+        }
+
+        summary = client.get("/api/series/summary").json()
+        assert summary["dates"] == ["2024-01-01", "2024-01-02"]
+        assert summary["series"]["Net Worth"] == [500.0, 250.5]
+
+    def test_conditional_get(self, client, db_connection):
+        insert_records(db_connection, _records(date(2024, 1, 1), "1000.00"))
+
+        first = client.get("/api/series/liabilities")
+        etag = first.headers["etag"]
+        second = client.get("/api/series/liabilities", headers={"If-None-Match": etag})
+
+        assert second.status_code == 304
+        assert second.content == b""
+
+    def test_new_release_changes_etag(self, client, db_connection, monkeypatch):
+        from asset_manager.web import app as app_module
+
+        insert_records(db_connection, _records(date(2024, 1, 1), "1000.00"))
+        etag = client.get("/api/series/assets").headers["etag"]
+
+        monkeypatch.setattr(app_module, "__version__", "99.0.0")
+        response = client.get("/api/series/assets", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
@@ -0,0 +1,107 @@
+"""Tests for the web render worker pool."""
+
+import asyncio
+import threading
+
+import pytest
+
+from asset_manager.web.workers import RenderWorkerPool, WorkerPoolSaturated
+
+
+def test_run_returns_result_from_worker_thread():
+    pool = RenderWorkerPool(max_workers=1, queue_limit=1)
+
+    async def main():
+        return await pool.run(lambda x: (x * 2, threading.current_thread().name), 21)
+
+    try:
+        result, thread_name = asyncio.run(main())
+    finally:
+        pool.shutdown()
+
+    assert result == 42
+    assert thread_name.startswith("render-worker")
+
+
+def test_run_rejects_when_saturated():
+    pool = RenderWorkerPool(max_workers=1, queue_limit=2)
+    release = threading.Event()
+
+    async def main():
+        blocked = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert pool.pending == 2
+        with pytest.raises(WorkerPoolSaturated):
+            await pool.run(lambda: None)
+        release.set()
+        await asyncio.gather(*blocked)
+        assert pool.pending == 0
+
+    try:
+        asyncio.run(main())
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_cancelled_caller_keeps_its_slot_until_the_job_ends():
+    pool = RenderWorkerPool(max_workers=1, queue_limit=1)
+    release = threading.Event()
+    finished = threading.Event()
+
+    def job():
+        release.wait()
+        finished.set()
+
+    async def main():
+        waiter = asyncio.ensure_future(pool.run(job))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        # The job is still running, so it still counts against the limit
+        assert pool.pending == 1
+        with pytest.raises(WorkerPoolSaturated):
+            await pool.run(lambda: None)
+
+        release.set()
+        while pool.pending:
+            await asyncio.sleep(0.01)
+        assert finished.is_set()
+        assert await pool.run(lambda: 7) == 7
+
+    try:
+        asyncio.run(main())
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_reservation_holds_a_slot_until_used_or_released():
+    pool = RenderWorkerPool(max_workers=1, queue_limit=1)
+
+    async def main():
+        with pool.reserve():
+            assert pool.pending == 1
+            with pytest.raises(WorkerPoolSaturated):
+                pool.reserve()
+        # Given back unused
+        assert pool.pending == 0
+
+        with pool.reserve() as slot:
+            assert await slot.run(lambda: 7) == 7
+            with pytest.raises(RuntimeError):
+                await slot.run(lambda: 8)
+        while pool.pending:
+            await asyncio.sleep(0.01)
+
+    try:
+        asyncio.run(main())
+    finally:
+        pool.shutdown()
+
+
+def test_queue_limit_must_cover_workers():
+    with pytest.raises(ValueError):
+        RenderWorkerPool(max_workers=4, queue_limit=2)